@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Admission Control
+렌더링 요청의 메모리 예산 기반 입장 제어와 대기열 제한 (백프레셔)
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+
+class AdmissionRejected(Exception):
+    """입장 거부 (status: 429 대기열 가득 참 / 503 대기 시간 초과)"""
+
+    def __init__(self, status, retry_after, message):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.message = message
+
+
+class AdmissionController:
+    """메모리 예산(바이트)을 나눠 쓰는 세마포어 + 길이가 제한된 FIFO 대기열
+
+    - 사용 중인 예산 + 요청 비용이 memory_budget 이하이고 동시 실행 수가
+      max_concurrent 미만이면 바로 입장
+    - 아니면 대기열에서 기다리되, 대기열이 max_queue만큼 차 있으면 즉시 429
+    - queue_timeout 동안 입장하지 못하면 503
+    """
+
+    BUSY_MESSAGE = '요청이 너무 많습니다. 잠시 후 다시 시도해주세요'
+    TIMEOUT_MESSAGE = '서버가 혼잡합니다. 잠시 후 다시 시도해주세요'
+
+    def __init__(self, memory_budget, max_concurrent=4, max_queue=8, queue_timeout=30.0):
+        self.memory_budget = memory_budget
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._cond = threading.Condition()
+        self._waiting = deque()
+        self._in_use = 0
+        self._active = 0
+        self._avg_hold = 1.0  # 평균 처리 시간 (초, 지수 이동 평균)
+
+        self.admitted = 0
+        self.rejected = 0
+
+    @staticmethod
+    def estimate_render_cost(source_sizes, target_size, layers=3, bytes_per_pixel=4):
+        """렌더링 한 번에 필요한 메모리 추정 (바이트)
+
+        원본 디코딩 버퍼 + 타겟 크기 RGBA 작업 레이어 수만큼. 여러 장은 순차로
+        렌더링되므로 가장 큰 한 장 기준으로 계산한다.
+        """
+        target_bytes = target_size[0] * target_size[1] * bytes_per_pixel * layers
+        largest_source = max((w * h for w, h in source_sizes), default=0)
+        return largest_source * bytes_per_pixel + target_bytes
+
+    @property
+    def queue_depth(self):
+        return len(self._waiting)
+
+    @property
+    def in_use(self):
+        return self._in_use
+
+    @property
+    def active(self):
+        return self._active
+
+    def check_capacity(self):
+        """대기열이 가득 차 있으면 바로 AdmissionRejected(429) (요청 본문을 읽기 전에 사용)"""
+        with self._cond:
+            if len(self._waiting) >= self.max_queue and not self._has_room(0):
+                self.rejected += 1
+                raise AdmissionRejected(429, self.retry_after(), self.BUSY_MESSAGE)
+
+    def acquire(self, cost):
+        """예산 확보. 성공하면 release()에 넘길 티켓 반환, 실패하면 AdmissionRejected"""
+        # 예산보다 큰 요청은 단독으로라도 실행될 수 있게 예산 크기로 제한
+        cost = min(cost, self.memory_budget)
+        ticket = object()  # 대기열 순서 확인용 식별자
+
+        with self._cond:
+            if not self._waiting and self._has_room(cost):
+                return self._admit(cost)
+
+            if len(self._waiting) >= self.max_queue:
+                self.rejected += 1
+                raise AdmissionRejected(429, self.retry_after(), self.BUSY_MESSAGE)
+
+            self._waiting.append(ticket)
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while not (self._waiting[0] is ticket and self._has_room(cost)):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        raise AdmissionRejected(503, self.retry_after(), self.TIMEOUT_MESSAGE)
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting.remove(ticket)
+                # 앞사람이 빠졌으므로 다음 대기자가 확인할 수 있게 깨움
+                self._cond.notify_all()
+            return self._admit(cost)
+
+    def release(self, ticket):
+        cost, started = ticket
+        with self._cond:
+            self._in_use -= cost
+            self._active -= 1
+            held = time.monotonic() - started
+            self._avg_hold = self._avg_hold * 0.8 + held * 0.2
+            self._cond.notify_all()
+
+    def _has_room(self, cost):
+        return self._active < self.max_concurrent and self._in_use + cost <= self.memory_budget
+
+    def _admit(self, cost):
+        self._in_use += cost
+        self._active += 1
+        self.admitted += 1
+        return (cost, time.monotonic())
+
+    def retry_after(self):
+        """현재 대기열이 빠지는 데 걸릴 예상 시간 (초, 최소 1)"""
+        rounds = (len(self._waiting) + 1) / max(1, self.max_concurrent)
+        return max(1, math.ceil(self._avg_hold * rounds))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Streaming ZIP
+생성된 이미지를 메모리/디스크에 아카이브 전체를 만들지 않고 ZIP으로 스트리밍
+"""
+
+import os
+import zipfile
+
+
+class _ChunkBuffer:
+    """zipfile이 쓰는 바이트를 모아두었다가 청크 단위로 꺼내는 쓰기 전용 버퍼
+
+    tell()/seek()를 제공하지 않으므로 zipfile은 비탐색(non-seekable) 모드로
+    동작하며, 각 항목 뒤에 data descriptor를 붙여 한 번에 순차적으로 기록한다.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        if data:
+            self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+
+def iter_zip(entries, chunk_size=64 * 1024):
+    """(파일 경로, 압축 내 이름) 목록을 받아 ZIP 바이트 청크를 순서대로 생성
+
+    entries는 이터레이터여도 되며, 항목이 만들어지는 즉시 ZIP에 추가된다.
+    PNG는 이미 deflate 압축되어 있으므로 ZIP_STORED(무압축)로 저장한다.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for path, arcname in entries:
+            if not os.path.isfile(path):
+                continue
+            zinfo = zipfile.ZipInfo.from_file(path, arcname)
+            zinfo.compress_type = zipfile.ZIP_STORED
+            with open(path, 'rb') as src, archive.open(zinfo, 'w') as dest:
+                while True:
+                    block = src.read(chunk_size)
+                    if not block:
+                        break
+                    dest.write(block)
+                    yield from buffer.drain()
+            yield from buffer.drain()
+    # 중앙 디렉토리(central directory)는 close 시점에 기록됨
+    yield from buffer.drain()
@@ -4,13 +4,13 @@ iOS Marketing Image Generator - Batch Processing
 진행률 표시와 함께 대량 이미지 처리
 """
 
+import itertools
 import os
 import sys
 from pathlib import Path
-from tqdm import tqdm
 import argparse
-from generator import MarketingImageGenerator
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# tqdm, 생성기(PIL), 스레드 풀은 실제 처리를 시작할 때만 불러옴 (--help, --dry-run은 가볍게)
 
 def process_single_image(args):
     """단일 이미지 처리 (멀티스레딩용)"""
@@ -23,80 +23,305 @@ def process_single_image(args):
     except Exception as e:
         return (input_path, False, str(e))
 
+def process_decoded(args):
+    """먼저 디코딩하는 단일 이미지 처리 (중복 제거 또는 프로세스 풀 모드)
+
+    index: 중복 제거 인덱스 — 같은 픽셀의 입력이 이미 렌더링되었으면 그 출력을 링크/복사
+    renderer: ProcessRenderer — 렌더링을 워커 프로세스에서 실행 (없으면 이 스레드에서)
+    """
+    generator, input_path, output_path, add_frame, background, index, renderer = args
+    try:
+        from PIL import Image
+        screenshot = Image.open(input_path)
+        screenshot.load()
+        render = renderer.render if renderer is not None else generator.generate_marketing_image
+        if index is None:
+            return (input_path, render(screenshot, output_path, add_frame, background), None)
+        key = index.register(screenshot, input_path)
+        while True:
+            if index.claim(key, input_path, output_path):
+                success = False
+                try:
+                    success = render(screenshot, output_path, add_frame, background)
+                finally:
+                    index.finish(key, success)
+                return (input_path, success, None)
+            if index.reuse(key, input_path, output_path):
+                return (input_path, True, None)
+    except Exception as e:
+        return (input_path, False, str(e))
+
+# 워커 프로세스마다 하나씩 만드는 생성기 (ProcessRenderer의 initializer가 설정)
+_process_generator = None
+
+def _init_render_process(options, backgrounds):
+    """워커 프로세스 초기화: 생성기를 만들고 공유 메모리의 배경을 캐시에 붙여 둠"""
+    global _process_generator
+    from generator import MarketingImageGenerator
+    from shared_frames import attach
+    _process_generator = MarketingImageGenerator(**options)
+    for style, handle in backgrounds.items():
+        _process_generator.set_background(style, attach(handle))
+
+def _render_attached(screenshot, output_path, add_frame, background):
+    return _process_generator.generate_marketing_image(screenshot, output_path, add_frame, background)
+
+def _render_shared(handle, output_path, add_frame, background):
+    """워커 프로세스에서 실행: 공유 메모리의 스크린샷을 복사 없이 감싸 렌더링"""
+    from shared_frames import call_attached
+    return call_attached(handle, _render_attached, output_path, add_frame, background)
+
+class ProcessRenderer:
+    """렌더링을 프로세스 풀에서 실행 (GIL 없이 CPU 코어를 모두 사용)
+
+    디코딩한 스크린샷과 그라디언트 배경은 공유 메모리로 넘기므로 이미지를 피클하지 않으며,
+    배경은 부모가 한 번만 만들고 모든 워커가 같은 메모리를 매핑한다.
+    출력 색 프로파일 변환도 부모에서 하므로 ICC 변환은 머신당 한 번만 만들어진다.
+    기본 생성기는 iPhone 프레임 이미지를 쓰지 않고 그림자를 직접 그리므로 공유할 프레임 오버레이는 없다
+    (프레임 PNG를 쓰는 것은 고급 GUI뿐이며 GUI는 프로세스 풀을 쓰지 않음).
+    """
+
+    def __init__(self, generator, background, workers):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from shared_frames import SharedImagePool
+        
+        self.output_profile = generator.output_profile
+        self.shared = SharedImagePool()
+        backgrounds = {}
+        if generator.BACKGROUND_COLORS.get(background, ()) is None:
+            image = generator.get_background(background, generator.TARGET_WIDTH, generator.TARGET_HEIGHT)
+            backgrounds[background] = self.shared.share(image)
+        options = {
+            'supersample': generator.supersample,
+            'output_profile': generator.output_profile,
+            'crop': generator.crop,
+            'clean_status_bar': generator.clean_status_bar,
+        }
+        # spawn: 스레드가 있는 부모를 fork하지 않음
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_render_process, initargs=(options, backgrounds)
+        )
+
+    def render(self, screenshot, output_path, add_frame, background):
+        """스크린샷을 공유 메모리에 올려 워커 프로세스에서 렌더링하고 끝날 때까지 기다림"""
+        from color_profiles import convert_to_profile
+        handle = self.shared.share(convert_to_profile(screenshot, self.output_profile))
+        try:
+            return self.executor.submit(_render_shared, handle, output_path, add_frame, background).result()
+        finally:
+            self.shared.release(handle)
+
+    def close(self):
+        self.executor.shutdown()
+        self.shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def find_input_files(input_dir, recursive=False, include=None, exclude=None):
+    """입력 파일 찾기 (탐색하면서 하나씩 반환)"""
+    from discovery import iter_images
+    return iter_images(input_dir, recursive, include, exclude)
+
+def output_path_for(input_path, output_dir, input_root=None):
+    """출력 경로 (재귀 탐색 시 입력 폴더 구조를 그대로 유지해 이름 충돌 방지)"""
+    subdir = ''
+    if input_root and os.path.isdir(input_root):
+        subdir = os.path.relpath(os.path.dirname(input_path), input_root)
+    return os.path.normpath(os.path.join(output_dir, subdir, f"marketing_{Path(input_path).stem}.png"))
+
 def batch_process_parallel(input_dir, output_dir, background='white', 
-                          add_frame=True, workers=4):
+                          add_frame=True, workers=4, dry_run=False,
+                          plan=False, calibrate=False, resume=False,
+                          recursive=False, include=None, exclude=None, strict=False,
+                          supersample=1, output_profile='srgb', crop=None, clean_status_bar=False,
+                          dedup=False, processes=False):
     """병렬 처리로 여러 이미지 일괄 변환"""
     
-    # 출력 디렉토리 생성
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # 입력 파일 찾기
-    supported_formats = ('.png', '.jpg', '.jpeg')
-    input_files = []
+    input_files = find_input_files(input_dir, recursive, include, exclude)
+    first = next(input_files, None)
     
-    if os.path.isdir(input_dir):
-        for ext in supported_formats:
-            input_files.extend(Path(input_dir).glob(f'*{ext}'))
-            input_files.extend(Path(input_dir).glob(f'*{ext.upper()}'))
-    else:
-        input_files = [Path(input_dir)]
-    
-    if not input_files:
+    if first is None:
         print("❌ 처리할 이미지를 찾을 수 없습니다.")
         return
+    input_files = itertools.chain([first], input_files)
     
     print(f"\n{'='*60}")
-    print(f"📁 입력 폴더: {input_dir}")
+    print(f"📁 입력 폴더: {input_dir}{' (하위 폴더 포함)' if recursive else ''}")
     print(f"📁 출력 폴더: {output_dir}")
     print(f"🎨 배경 스타일: {background}")
     print(f"✨ 프레임 효과: {'예' if add_frame else '아니오'}")
-    print(f"📊 총 파일 수: {len(input_files)}")
     print(f"⚡ 워커 수: {workers}")
     print(f"{'='*60}\n")
     
-    # 작업 준비
-    generator = MarketingImageGenerator()
-    tasks = []
+    # 드라이런: 생성할 목록만 출력 (PIL을 불러오지 않음)
+    if dry_run:
+        count = 0
+        for input_path in input_files:
+            print(f"  {input_path} → {output_path_for(input_path, output_dir, input_dir)}")
+            count += 1
+        print(f"\n📊 총 파일 수: {count}")
+        return
+    
+    # 저널 항목에 기록하는 렌더링 설정 (설정이 바뀐 항목은 --resume에서도 다시 처리)
+    settings = {'background': background, 'add_frame': add_frame}
+    if supersample > 1:
+        settings['supersample'] = supersample
+    if output_profile != 'srgb':
+        settings['output_profile'] = output_profile
+    if crop:
+        settings['crop'] = crop
+    if clean_status_bar:
+        settings['clean_status_bar'] = True
+    
+    # 계획: 헤더만 읽어 작업량과 예상 소요 시간 계산 (렌더링하지 않음)
+    if plan:
+        import planner
+        stage_costs = planner.DEFAULT_STAGE_COSTS
+        if calibrate:
+            print(f"⏱️  보정 중: {first}")
+            stage_costs = planner.calibrate(first, add_frame, background)
+        from generator import MarketingImageGenerator
+        target_size = (MarketingImageGenerator.TARGET_WIDTH, MarketingImageGenerator.TARGET_HEIGHT)
+        tasks = [(path, output_path_for(path, output_dir, input_dir)) for path in input_files]
+        # --resume이면 실제 실행과 같은 저널 기준으로 건너뛸 항목을 예상 시간에서 제외
+        is_done = None
+        if resume:
+            from checkpoint import CheckpointJournal
+            is_done = CheckpointJournal(output_dir, settings=settings, read_only=True).is_done
+        planner.print_plan(planner.plan_batch(tasks, target_size, stage_costs, workers, strict, is_done),
+                           stage_costs)
+        return
+    
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from contextlib import nullcontext
+    from tqdm import tqdm
+    from generator import MarketingImageGenerator
+    from checkpoint import CheckpointJournal, remove_stale_temp_files
+    from probe import probe_image
     
-    for input_path in input_files:
-        output_filename = f"marketing_{input_path.stem}.png"
-        output_path = os.path.join(output_dir, output_filename)
-        tasks.append((generator, str(input_path), output_path, add_frame, background))
+    # 출력 디렉토리 생성 (중단된 이전 실행의 임시 파일 정리)
+    os.makedirs(output_dir, exist_ok=True)
+    remove_stale_temp_files(output_dir)
+    
+    # 완료 기록 저널 (--resume이면 이어서 기록, 아니면 새로 시작)
+    journal = CheckpointJournal(output_dir, settings=settings, resume=resume)
+    
+    from color_profiles import parse_output_profile
+    generator = MarketingImageGenerator(supersample=supersample,
+                                        output_profile=parse_output_profile(output_profile),
+                                        crop=crop, clean_status_bar=clean_status_bar)
+    created_dirs = {output_dir}
     
-    # 병렬 처리
+    # 중복 제거: 픽셀이 같은 입력은 한 번만 렌더링 (키에 설정 포함)
+    dedup_index = None
+    if dedup:
+        from dedup import DedupIndex
+        dedup_index = DedupIndex(dict(settings, add_frame=add_frame, background=background))
+    
+    # 프로세스 풀: 스레드는 디코딩/중복 확인 후 렌더링을 워커 프로세스에 맡기고 기다림
+    renderer = ProcessRenderer(generator, background, workers) if processes else None
+    
+    # 병렬 처리: 탐색과 동시에 제출하고, 실행 중인 작업 수는 워커 수의 2배로 제한
     success_count = 0
     failed_files = []
+    warned_files = []
+    submitted = 0
+    rejected = 0
+    skipped = 0
+    pending = {}
     
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        # 작업 제출
-        futures = {executor.submit(process_single_image, task): task for task in tasks}
+    with journal, renderer or nullcontext(), ThreadPoolExecutor(max_workers=workers) as executor, \
+            tqdm(total=0, desc="이미지 처리 중", unit="개") as pbar:
         
-        # 진행률 표시
-        with tqdm(total=len(tasks), desc="이미지 처리 중", unit="개") as pbar:
-            for future in as_completed(futures):
+        def collect(done):
+            nonlocal success_count
+            for future in done:
+                output_path = pending.pop(future)
                 input_path, success, error = future.result()
                 
                 if success:
                     success_count += 1
+                    journal.record(input_path, output_path)
                     pbar.set_postfix({"성공": success_count, "실패": len(failed_files)})
                 else:
                     failed_files.append((input_path, error))
                 
                 pbar.update(1)
+        
+        for input_path in input_files:
+            output_path = output_path_for(input_path, output_dir, input_dir)
+            if resume and journal.is_done(input_path, output_path):
+                skipped += 1
+                continue
+            
+            # 헤더만 읽어 문제 있는 입력은 렌더링 전에 실패 처리
+            probe = probe_image(input_path, strict=strict)
+            if not probe.ok:
+                failed_files.append((input_path, '; '.join(probe.errors)))
+                rejected += 1
+                continue
+            if probe.warnings:
+                warned_files.append(probe)
+            
+            output_subdir = os.path.dirname(output_path)
+            if output_subdir not in created_dirs:
+                os.makedirs(output_subdir, exist_ok=True)
+                remove_stale_temp_files(output_subdir)
+                created_dirs.add(output_subdir)
+            
+            task = (generator, input_path, output_path, add_frame, background)
+            if dedup_index is not None or renderer is not None:
+                task += (dedup_index, renderer)
+                pending[executor.submit(process_decoded, task)] = output_path
+            else:
+                pending[executor.submit(process_single_image, task)] = output_path
+            submitted += 1
+            pbar.total = submitted
+            pbar.refresh()
+            
+            if len(pending) >= workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
     
     # 결과 출력
     print(f"\n{'='*60}")
-    print(f"✅ 완료: {success_count}/{len(tasks)}개 성공")
+    if resume:
+        print(f"⏭️  저널 기준 완료된 {skipped}개 건너뜀")
+    print(f"✅ 완료: {success_count}/{submitted + rejected}개 성공")
+    
+    if warned_files:
+        print(f"\n⚠️  경고:")
+        for probe in warned_files:
+            print(f"   - {probe.describe()}")
     
     if failed_files:
         print(f"\n❌ 실패한 파일:")
         for path, error in failed_files:
             print(f"   - {os.path.basename(path)}: {error}")
     
+    if dedup_index is not None:
+        report_path = dedup_index.write_report(output_dir)
+        print(f"\n♻️  중복 제거: {dedup_index.renders}개 렌더링, "
+              f"{len(dedup_index.duplicates)}개 재사용, "
+              f"거의 같은 입력 {len(dedup_index.near_duplicates)}개 → {report_path}")
+    
     print(f"{'='*60}\n")
     print(f"💾 출력 폴더: {output_dir}")
 
 def main():
+    # 인자 정의/검증만 (PIL은 생성기를 만들 때 불러옴)
+    from generator import MarketingImageGenerator, supersample_factor
+    
     parser = argparse.ArgumentParser(
         description='iOS 마케팅 이미지 대량 생성기',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -110,22 +335,73 @@ def main():
   
   # 프레임 없이 생성
   python batch_processor.py screenshots/ -o output/ --no-frame
+  
+  # 처리할 목록만 확인 (생성하지 않음)
+  python batch_processor.py screenshots/ -o output/ --dry-run
+  
+  # 헤더만 읽어 용량과 예상 소요 시간 계산 (--calibrate: 첫 이미지로 단계별 비용 측정)
+  python batch_processor.py screenshots/ -o output/ --plan -w 8 --calibrate
+  
+  # 중단된 작업 이어서 처리 (출력 폴더의 저널 기준)
+  python batch_processor.py screenshots/ -o output/ --resume
+  
+  # 하위 폴더까지, 영어 스크린샷만, drafts 폴더 제외
+  python batch_processor.py screenshots/ -o output/ -r --include '*_en.png' --exclude drafts
+  
+  # 로케일 폴더 간에 똑같은 스크린샷은 한 번만 렌더링
+  python batch_processor.py locales/ -o output/ -r --dedup
+  
+  # 렌더링을 8개 프로세스에서 (디코딩한 이미지는 공유 메모리로 전달)
+  python batch_processor.py screenshots/ -o output/ -w 8 --processes
         '''
     )
     
     parser.add_argument('input', help='입력 스크린샷 파일 또는 디렉토리')
     parser.add_argument('-o', '--output', required=True, help='출력 디렉토리')
     parser.add_argument('-b', '--background', 
-                       choices=['white', 'black', 'gradient_blue', 'app_store_gray'],
+                       choices=MarketingImageGenerator.BACKGROUND_STYLES,
                        default='white',
-                       help='배경 스타일 (기본값: white)')
+                       help='배경 스타일 (기본값: white, auto: 스크린샷의 대표 색으로 그라디언트)')
     parser.add_argument('--no-frame', action='store_true', 
                        help='프레임/그림자 효과 제거')
     parser.add_argument('-w', '--workers', type=int, default=4,
                        help='병렬 처리 워커 수 (기본값: 4)')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='이미지를 생성하지 않고 처리할 목록만 출력')
+    parser.add_argument('--plan', action='store_true',
+                       help='이미지 헤더만 읽어 작업량, 용량, 예상 소요 시간 출력')
+    parser.add_argument('--calibrate', action='store_true',
+                       help='--plan과 함께: 첫 이미지를 실제로 렌더링해 단계별 비용 측정')
+    parser.add_argument('-r', '--recursive', action='store_true',
+                       help='하위 폴더까지 탐색 (출력은 같은 폴더 구조로 저장)')
+    parser.add_argument('--include', action='append', metavar='PATTERN',
+                       help='이 glob 패턴과 일치하는 파일만 처리 (여러 번 지정 가능)')
+    parser.add_argument('--exclude', action='append', metavar='PATTERN',
+                       help='이 glob 패턴과 일치하는 파일/폴더 제외 (여러 번 지정 가능)')
+    parser.add_argument('--strict', action='store_true',
+                       help='iPhone 스크린샷 비율/해상도가 아닌 입력도 오류로 처리 (렌더링 전에 거부)')
+    parser.add_argument('--resume', action='store_true',
+                       help='출력 폴더의 저널을 읽어 완료된 이미지는 건너뛰고 이어서 처리')
+    parser.add_argument('--supersample', type=supersample_factor, default=1, metavar='K',
+                       help='둥근 모서리를 K배로 그려 부드럽게 (예: 4, 기본값 1 = 끔)')
+    parser.add_argument('--output-profile', default='srgb', metavar='PROFILE',
+                       help="출력 색 프로파일: srgb, .icc 파일 경로, none (기본값 srgb, PNG에 포함)")
+    parser.add_argument('--crop', choices=['status_bar', 'safe_area'],
+                       help='리사이즈 전에 상태 표시줄(status_bar) 또는 상하단 세이프 에어리어(safe_area)를 잘라냄')
+    parser.add_argument('--clean-status-bar', action='store_true',
+                       help='상태 표시줄 영역을 바로 아래 색으로 칠해 지움')
+    parser.add_argument('--processes', action='store_true',
+                       help='렌더링을 워커 수만큼의 프로세스에서 실행 (스크린샷/배경은 공유 메모리로 전달)')
+    parser.add_argument('--dedup', action='store_true',
+                       help='픽셀이 같은 입력은 한 번만 렌더링하고 나머지는 하드 링크/복사 (dedup_report.json 작성)')
     
     args = parser.parse_args()
     
+    if args.workers < 1:
+        parser.error('워커 수는 1 이상이어야 합니다')
+    if args.calibrate and not args.plan:
+        parser.error('--calibrate는 --plan과 함께 사용해야 합니다')
+    
     # 입력 경로 확인
     if not os.path.exists(args.input):
         print(f"❌ 오류: '{args.input}' 경로를 찾을 수 없습니다.")
@@ -137,7 +413,21 @@ def main():
         args.output,
         background=args.background,
         add_frame=not args.no_frame,
-        workers=args.workers
+        workers=args.workers,
+        dry_run=args.dry_run,
+        plan=args.plan,
+        calibrate=args.calibrate,
+        resume=args.resume,
+        recursive=args.recursive,
+        include=args.include,
+        exclude=args.exclude,
+        supersample=args.supersample,
+        output_profile=args.output_profile,
+        crop=args.crop,
+        clean_status_bar=args.clean_status_bar,
+        dedup=args.dedup,
+        processes=args.processes,
+        strict=args.strict
     )
 
 if __name__ == '__main__':
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Startup Benchmark
+CLI 진입점의 시작 시간을 측정하고, --help/드라이런에서 무거운 모듈(PIL, tqdm, tkinter)을
+불러오지 않는지 확인 (CI에서 실행: 위반 시 종료 코드 1)
+
+  python bench_startup.py
+  python bench_startup.py -n 20 --budget-ms 150
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# 가벼운 경로에서 불러오면 안 되는 모듈
+FORBIDDEN_MODULES = ('PIL', 'tqdm', 'tkinter', 'tkinterdnd2', 'flask')
+
+
+def entry_points(sample_dir):
+    """(이름, 인자 목록) — 모두 PIL 없이 끝나야 하는 호출"""
+    return [
+        ('generator --help', ['generator.py', '--help']),
+        ('generator_advanced --help', ['generator_advanced.py', '--help']),
+        ('batch_processor --help', ['batch_processor.py', '--help']),
+        ('batch_processor --dry-run', ['batch_processor.py', sample_dir, '-o', os.path.join(sample_dir, 'out'), '--dry-run']),
+        ('batch_processor (잘못된 인자)', ['batch_processor.py', sample_dir, '-o', 'out', '-w', '0']),
+        ('campaign --help', ['campaign.py', '--help']),
+        ('render_daemon --help', ['render_daemon.py', '--help']),
+    ]
+
+
+def imported_modules(args):
+    """-X importtime 출력에서 불러온 최상위 모듈 이름 목록"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + args,
+        cwd=HERE, capture_output=True, text=True
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            name = line.rsplit('|', 1)[1].strip()
+            modules.add(name.split('.')[0])
+    return modules
+
+
+def time_run(args, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=HERE,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI 시작 시간 벤치마크')
+    parser.add_argument('-n', '--runs', type=int, default=10, help='항목당 실행 횟수 (기본값: 10)')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help='중앙값 시작 시간 상한 (ms). 넘으면 실패 처리')
+    args = parser.parse_args()
+
+    # 인터프리터 자체 시작 시간 (기준선)
+    baseline = time_run(['-c', 'pass'], args.runs)
+
+    failures = []
+    with tempfile.TemporaryDirectory() as sample_dir:
+        for name in ('a.png', 'b.jpg'):
+            open(os.path.join(sample_dir, name), 'wb').close()
+
+        print(f"{'항목':<34}{'중앙값(ms)':>12}{'기준 대비':>12}  무거운 모듈")
+        print(f"{'python -c pass':<34}{baseline:>12.1f}{'':>12}")
+        for name, entry_args in entry_points(sample_dir):
+            median = time_run(entry_args, args.runs)
+            heavy = sorted(imported_modules(entry_args) & set(FORBIDDEN_MODULES))
+            print(f"{name:<34}{median:>12.1f}{median - baseline:>+12.1f}  {', '.join(heavy) or '-'}")
+            if heavy:
+                failures.append(f"{name}: {', '.join(heavy)} 로딩됨")
+            if args.budget_ms is not None and median > args.budget_ms:
+                failures.append(f"{name}: {median:.1f}ms > {args.budget_ms:.1f}ms")
+
+    if failures:
+        print("\n❌ 실패:")
+        for failure in failures:
+            print(f"   - {failure}")
+        sys.exit(1)
+    print("\n✅ 모든 진입점이 무거운 모듈 없이 시작됩니다")
+
+
+if __name__ == '__main__':
+    main()
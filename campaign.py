@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Campaign Runner
+매니페스트(JSON/YAML) 하나로 화면 × 언어 × 디바이스 크기 전체를 한 번에 생성
+
+매니페스트 예:
+
+{
+  "output": "campaign_output",
+  "locales": ["en", "ko"],
+  "sizes": ["6.7", "6.5"],
+  "defaults": {
+    "layout": "single",
+    "background": "gradient",
+    "gradient_colors": ["74,144,226", "155,89,182"],
+    "text_position": "top",
+    "font": "helvetica"
+  },
+  "screens": [
+    {
+      "id": "checkout",
+      "screenshots": ["shots/{locale}/checkout.png"],
+      "title": {"en": "Save time", "ko": "시간을 아끼세요"},
+      "subtitle": {"en": "Zip through checkout.", "ko": "빠른 결제"}
+    },
+    {
+      "id": "deals",
+      "layout": "triple",
+      "screenshots": ["shots/{locale}/a.png", "shots/{locale}/b.png", "shots/{locale}/c.png"],
+      "title": "Treat yourself"
+    }
+  ]
+}
+
+결과: <output>/<locale>/<size>/<screen id>.png
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+
+# App Store 스크린샷 크기 프리셋 (세로 방향)
+DEVICE_SIZES = {
+    '6.9': (1320, 2868),
+    '6.7': (1290, 2796),
+    '6.5': (1242, 2688),
+    '6.1': (1179, 2556),
+    '5.5': (1242, 2208),
+    'ipad_13': (2064, 2752),
+    'ipad_12.9': (2048, 2732),
+}
+
+# 기준 해상도 (글자 크기는 이 너비 대비 비율로 조정)
+BASE_WIDTH = 1290
+
+# 화면별로 지정할 수 있는 설정과 기본값
+SCREEN_DEFAULTS = {
+    'layout': 'single',
+    'tilt': None,
+    'background': 'gradient',
+    'gradient_colors': None,
+    'text_position': 'top',
+    'font': 'helvetica',
+    'title_color': (60, 120, 255),
+    'subtitle_color': (80, 80, 80),
+    'title_size': 90,
+    'subtitle_size': 45,
+}
+
+
+def load_manifest(path):
+    """매니페스트 파일 읽기 (.json 또는 .yaml/.yml)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError("YAML 매니페스트를 사용하려면 'pip install pyyaml'을 실행하세요.")
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+
+    if not manifest.get('screens'):
+        raise ValueError("매니페스트에 'screens' 항목이 없습니다.")
+
+    # 상대 경로는 매니페스트 파일 위치 기준
+    manifest.setdefault('base_dir', os.path.dirname(os.path.abspath(path)))
+    return manifest
+
+
+def parse_color(value):
+    """'R,G,B' 문자열 또는 [R, G, B] 목록을 튜플로 변환"""
+    if isinstance(value, str):
+        return tuple(map(int, value.split(',')))
+    return tuple(value)
+
+
+def parse_size(value):
+    """'6.7' 같은 프리셋 이름, 'WxH' 문자열 또는 [W, H] 목록을 (이름, (W, H))로 변환"""
+    if isinstance(value, str):
+        if value in DEVICE_SIZES:
+            return value, DEVICE_SIZES[value]
+        if 'x' in value:
+            width, height = value.lower().split('x')
+            return value, (int(width), int(height))
+        raise ValueError(f"알 수 없는 디바이스 크기: {value}")
+    width, height = value
+    return f"{width}x{height}", (int(width), int(height))
+
+
+def localized(value, locale):
+    """언어별 값 선택 ({"en": ..., "ko": ...} 또는 단일 문자열)"""
+    if isinstance(value, dict):
+        if locale in value:
+            return value[locale]
+        return value.get('default', next(iter(value.values()), None))
+    return value
+
+
+def plan_campaign(manifest):
+    """매니페스트를 (화면, 언어, 크기) 단위 작업 목록으로 펼치기"""
+    base_dir = manifest.get('base_dir', '.')
+    output_dir = os.path.join(base_dir, manifest.get('output', 'campaign_output'))
+    locales = manifest.get('locales') or ['default']
+    sizes = [parse_size(size) for size in manifest.get('sizes') or ['6.7']]
+    defaults = dict(SCREEN_DEFAULTS, **manifest.get('defaults', {}))
+
+    jobs = []
+    for screen in manifest['screens']:
+        settings = dict(defaults, **{k: v for k, v in screen.items() if k in SCREEN_DEFAULTS})
+        screen_id = screen.get('id') or f"screen{len(jobs) + 1}"
+
+        for locale in locales:
+            screenshots = [
+                os.path.join(base_dir, path.format(locale=locale))
+                for path in screen['screenshots']
+            ]
+            title = localized(screen.get('title'), locale)
+            subtitle = localized(screen.get('subtitle'), locale)
+
+            for size_name, size in sizes:
+                jobs.append({
+                    'screen': screen_id,
+                    'locale': locale,
+                    'size_name': size_name,
+                    'size': size,
+                    'screenshots': screenshots,
+                    'title': title,
+                    'subtitle': subtitle,
+                    'settings': settings,
+                    'output': os.path.join(output_dir, locale, size_name, f"{screen_id}.png"),
+                })
+    return jobs
+
+
+class CampaignRunner:
+    """캠페인 작업 실행기
+
+    - 같은 입력 스크린샷은 한 번만 디코딩해 모든 작업이 공유하고, run()에서는 그 입력을 쓰는
+      마지막 작업이 끝나면 놓음 (작업이 화면 → 언어 → 크기 순이라 동시에 메모리에 있는 입력은 처리 중인 화면 몇 개뿐)
+    - 디바이스 크기별 생성기를 하나씩 만들고 폰트 캐시는 전체가 공유
+    - 그라디언트 배경은 생성기(크기)별로 캐시
+    output_profile: 출력 색 프로파일 ('srgb', .icc 경로, None이면 색 관리 안 함)
+    """
+
+    def __init__(self, output_profile='srgb'):
+        self.output_profile = output_profile
+        self._images = {}
+        self._image_locks = {}
+        self._image_uses = {}  # 경로 -> 남은 작업 수 (run()이 센 입력만 놓음)
+        self._generators = {}
+        self._fonts_cache = {}
+        self._lock = threading.Lock()
+
+    def get_image(self, path):
+        """디코딩된 스크린샷 (경로별로 한 번만 디코딩)"""
+        with self._lock:
+            if path in self._images:
+                return self._images[path]
+            lock = self._image_locks.setdefault(path, threading.Lock())
+        with lock:
+            with self._lock:
+                if path in self._images:
+                    return self._images[path]
+            from PIL import Image
+            img = Image.open(path)
+            img.load()
+            # 내장 프로파일(Display P3 등)은 여기서 한 번만 출력 프로파일로 변환 (모든 크기/변형이 공유,
+            # 생성기도 같은 프로파일이므로 다시 변환하지 않음)
+            from color_profiles import convert_to_profile
+            img = convert_to_profile(img, self.output_profile)
+            with self._lock:
+                self._images[path] = img
+            return img
+
+    def retain_images(self, jobs):
+        """작업들이 쓰는 입력별 사용 횟수 기록 (release_image가 마지막 사용 뒤 디코딩 결과를 놓음)"""
+        with self._lock:
+            for job in jobs:
+                for path in job['screenshots']:
+                    self._image_uses[path] = self._image_uses.get(path, 0) + 1
+
+    def release_image(self, path):
+        """작업 하나가 입력 사용을 끝냄. 남은 작업이 없으면 캐시에서 제거"""
+        with self._lock:
+            remaining = self._image_uses.get(path)
+            if remaining is None:
+                return
+            if remaining > 1:
+                self._image_uses[path] = remaining - 1
+                return
+            del self._image_uses[path]
+            self._images.pop(path, None)
+            self._image_locks.pop(path, None)
+
+    def get_generator(self, size):
+        with self._lock:
+            generator = self._generators.get(size)
+            if generator is None:
+                from generator_advanced import AdvancedMarketingGenerator
+                generator = AdvancedMarketingGenerator(target_size=size, fonts_cache=self._fonts_cache,
+                                                       output_profile=self.output_profile)
+                self._generators[size] = generator
+            return generator
+
+    def render(self, job):
+        try:
+            return self._render(job)
+        finally:
+            for path in job['screenshots']:
+                self.release_image(path)
+
+    def _render(self, job):
+        settings = job['settings']
+        generator = self.get_generator(job['size'])
+        scale = job['size'][0] / BASE_WIDTH
+
+        text_config = None
+        if job['title'] or job['subtitle']:
+            text_config = {
+                'title': job['title'],
+                'subtitle': job['subtitle'],
+                'position': settings['text_position'],
+                'font': settings['font'],
+                'title_color': parse_color(settings['title_color']),
+                'subtitle_color': parse_color(settings['subtitle_color']),
+                'title_size': round(settings['title_size'] * scale),
+                'subtitle_size': round(settings['subtitle_size'] * scale),
+            }
+
+        gradient_colors = None
+        if settings['gradient_colors']:
+            gradient_colors = [parse_color(color) for color in settings['gradient_colors']]
+
+        os.makedirs(os.path.dirname(job['output']), exist_ok=True)
+        screenshots = [self.get_image(path) for path in job['screenshots']]
+        return generator.generate_marketing_image(
+            screenshots,
+            job['output'],
+            layout=settings['layout'],
+            background_style=settings['background'],
+            background_colors=gradient_colors,
+            text_config=text_config,
+            layout_options={'tilt': settings['tilt']} if settings['tilt'] is not None else None
+        )
+
+    def run(self, jobs, workers=4):
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from tqdm import tqdm
+
+        success_count = 0
+        failed = []
+        self.retain_images(jobs)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.render, job): job for job in jobs}
+            with tqdm(total=len(jobs), desc="캠페인 생성 중", unit="개") as pbar:
+                for future in as_completed(futures):
+                    job = futures[future]
+                    try:
+                        ok = future.result()
+                        error = None if ok else '생성 실패'
+                    except Exception as e:
+                        ok, error = False, str(e)
+                    if ok:
+                        success_count += 1
+                    else:
+                        failed.append((job, error))
+                    pbar.update(1)
+        return success_count, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='매니페스트 기반 캠페인 일괄 생성기 (화면 × 언어 × 디바이스 크기)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+예제:
+  # 매니페스트의 모든 조합 생성
+  python campaign.py campaign.json -w 8
+
+  # 생성할 목록만 확인
+  python campaign.py campaign.yaml --dry-run
+
+디바이스 크기 프리셋: ''' + ', '.join(DEVICE_SIZES)
+    )
+    parser.add_argument('manifest', help='캠페인 매니페스트 (.json/.yaml)')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 4,
+                        help='병렬 처리 워커 수 (기본값: CPU 코어 수)')
+    parser.add_argument('-o', '--output', help='출력 폴더 (매니페스트의 output 대신 사용)')
+    parser.add_argument('--output-profile', default='srgb', metavar='PROFILE',
+                        help="출력 색 프로파일: srgb, .icc 파일 경로, none (기본값 srgb, PNG에 포함)")
+    parser.add_argument('--dry-run', action='store_true', help='생성하지 않고 작업 목록만 출력')
+
+    args = parser.parse_args()
+
+    try:
+        manifest = load_manifest(args.manifest)
+        if args.output:
+            manifest['output'] = os.path.abspath(args.output)
+        jobs = plan_campaign(manifest)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"❌ 매니페스트 오류: {e}")
+        sys.exit(1)
+
+    screens = {job['screen'] for job in jobs}
+    locales = {job['locale'] for job in jobs}
+    sizes = {job['size_name'] for job in jobs}
+
+    print(f"\n{'='*60}")
+    print(f"📋 매니페스트: {args.manifest}")
+    print(f"📱 화면 {len(screens)}개 × 🌐 언어 {len(locales)}개 × 📐 크기 {len(sizes)}개 = {len(jobs)}개")
+    print(f"⚡ 워커 수: {args.workers}")
+    print(f"{'='*60}\n")
+
+    if args.dry_run:
+        for job in jobs:
+            print(f"  {job['locale']:>8} {job['size_name']:>10}  {job['screen']} → {job['output']}")
+        return
+
+    from color_profiles import SRGB, parse_output_profile
+    output_profile = parse_output_profile(args.output_profile)
+    if output_profile not in (None, SRGB) and not os.path.isfile(output_profile):
+        print(f"❌ 출력 프로파일을 찾을 수 없습니다: {output_profile}")
+        sys.exit(1)
+
+    missing = sorted({path for job in jobs for path in job['screenshots'] if not os.path.exists(path)})
+    if missing:
+        print("❌ 스크린샷 파일을 찾을 수 없습니다:")
+        for path in missing:
+            print(f"   - {path}")
+        sys.exit(1)
+
+    runner = CampaignRunner(output_profile)
+    success_count, failed = runner.run(jobs, workers=args.workers)
+
+    print(f"\n{'='*60}")
+    print(f"✅ 완료: {success_count}/{len(jobs)}개 성공")
+    if failed:
+        print(f"\n❌ 실패한 작업:")
+        for job, error in failed:
+            print(f"   - {job['locale']}/{job['size_name']}/{job['screen']}: {error}")
+    print(f"{'='*60}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Atomic Output & Checkpoint Journal
+중단되어도 반쯤 쓰인 출력 파일이 남지 않도록 원자적으로 저장하고,
+완료된 항목을 저널(JSONL)에 기록해 --resume으로 이어서 처리
+"""
+
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+
+TEMP_PREFIX = '.marketing-tmp-'
+JOURNAL_NAME = '.marketing_journal.jsonl'
+
+# 이보다 오래된 임시 파일만 중단된 실행이 남긴 것으로 보고 삭제 (같은 폴더에 쓰는 다른 실행의 파일 보호)
+STALE_TEMP_SECONDS = 3600
+
+
+
+def _create_temp_file(directory):
+    """directory에 새 임시 파일을 만들어 (fd, 경로) 반환
+
+    mkstemp(0600)와 달리 0666으로 만들어 커널이 umask를 적용하므로 일반 파일과 같은 권한이 된다
+    (프로세스 전체의 umask를 읽으려고 바꾸지 않음 — 다른 스레드가 만드는 파일에 영향).
+    """
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0)
+    while True:
+        path = os.path.join(directory, f"{TEMP_PREFIX}{secrets.token_hex(8)}.tmp")
+        try:
+            return os.open(path, flags, 0o666), path
+        except FileExistsError:
+            continue
+
+
+@contextmanager
+def atomic_open(output_path):
+    """같은 폴더의 임시 파일을 열어 주고, 블록이 정상 종료되면 rename으로 교체
+
+    rename은 원자적이므로 output_path에는 이전 파일 또는 완성된 새 파일만 존재한다.
+    교체 전에 fsync하므로 전원이 꺼져도 rename 뒤에 내용이 비어 있는 파일이 남지 않는다.
+    """
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, temp_path = _create_temp_file(directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_save(image, output_path, format='PNG', **params):
+    """이미지를 원자적으로 저장 (atomic_open 참고)"""
+    with atomic_open(output_path) as f:
+        image.save(f, format, **params)
+
+
+def remove_stale_temp_files(directory, max_age=STALE_TEMP_SECONDS):
+    """이전 실행이 중단되며 남긴 임시 파일 정리
+
+    max_age초보다 오래된 파일만 삭제 (같은 출력 폴더에 동시에 쓰는 다른 실행의 임시 파일은 남김)
+    """
+    removed = 0
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if entry.name.startswith(TEMP_PREFIX) and entry.is_file():
+            try:
+                if entry.stat().st_mtime > cutoff:
+                    continue
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def _fingerprint(input_path):
+    stat = os.stat(input_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class CheckpointJournal:
+    """완료된 항목 기록 (출력 폴더의 JSONL 파일, 한 줄 = 완료된 이미지 하나)
+
+    항목은 입력 파일 크기/수정 시각과 렌더링 설정까지 기록하므로,
+    입력이나 설정이 바뀐 항목은 --resume에서도 다시 처리된다.
+    """
+
+    def __init__(self, output_dir, settings=None, resume=False, read_only=False):
+        """read_only: 기록하지 않고 is_done()만 사용 (--plan에서 --resume이 건너뛸 항목 계산용)"""
+        self.path = os.path.join(output_dir, JOURNAL_NAME)
+        self.settings = settings or {}
+        self.completed = {}
+        self._lock = threading.Lock()
+
+        if resume or read_only:
+            self.completed = self._load()
+        self._file = None if read_only else open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _load(self):
+        completed = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 기록 중 중단된 마지막 줄
+                        continue
+                    completed[entry['input']] = entry
+        except FileNotFoundError:
+            pass
+        return completed
+
+    def is_done(self, input_path, output_path):
+        """저널에 있고, 입력/설정이 같고, 출력 파일이 남아 있으면 True"""
+        entry = self.completed.get(os.path.abspath(input_path))
+        if entry is None or entry.get('settings') != self.settings:
+            return False
+        if entry.get('output') != os.path.abspath(output_path) or not os.path.exists(output_path):
+            return False
+        try:
+            return list(_fingerprint(input_path)) == entry.get('fingerprint')
+        except OSError:
+            return False
+
+    def record(self, input_path, output_path):
+        entry = {
+            'input': os.path.abspath(input_path),
+            'output': os.path.abspath(output_path),
+            'fingerprint': list(_fingerprint(input_path)),
+            'settings': self.settings,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            # 프로세스가 죽어도 기록이 남도록 줄마다 OS로 넘김
+            self._file.flush()
+            self.completed[entry['input']] = entry
+
+    def close(self):
+        with self._lock:
+            if self._file is not None and not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Color Management
+입력에 포함된 ICC 프로파일(예: 최신 iPhone 스크린샷의 Display P3)을 출력 프로파일(기본 sRGB)로 변환하고,
+저장할 때 출력 프로파일을 PNG에 포함 (convert('RGB')만 하면 프로파일이 버려져 색이 달라짐)
+
+ImageCms 변환은 만드는 비용이 크므로 (원본 프로파일, 출력 프로파일, 모드)마다 한 번만 만들어
+프로세스 전체(배치, 웹 서버, 데몬)에서 재사용한다. 프로파일이 없는 입력은 sRGB로 보고 그대로 둔다.
+"""
+
+import hashlib
+import io
+import os
+import threading
+
+SRGB = 'srgb'
+
+_profiles = {}      # 출력 프로파일 키(_profile_key) -> (ImageCmsProfile, ICC 바이트)
+_transforms = {}    # (원본 프로파일 해시, 출력 프로파일 키, 입력 모드, 출력 모드) -> 변환
+_failed = set()     # 변환할 수 없는 원본 프로파일 (경고는 한 번만)
+_lock = threading.Lock()
+
+# 변환을 새로 만든 횟수 (캐시 확인용)
+transforms_built = 0
+
+
+def _load_output_profile(destination):
+    from PIL import ImageCms
+
+    if destination.lower() == SRGB:
+        data = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+        # 헤더의 생성 시각(24~35바이트)을 지워 실행마다 같은 바이트가 되게 함 (출력 PNG 재현성)
+        data = data[:24] + bytes(12) + data[36:]
+        return ImageCms.ImageCmsProfile(io.BytesIO(data)), data
+    # 파일 바이트를 그대로 포함 (같은 프로파일이 내장된 입력은 변환 없이 통과)
+    with open(destination, 'rb') as f:
+        data = f.read()
+    return ImageCms.ImageCmsProfile(io.BytesIO(data)), data
+
+
+def _profile_key(destination):
+    """캐시 키: 'srgb' 또는 .icc 파일의 실제 경로 (상대 경로/심볼릭 링크가 같은 파일이면 같은 키,
+    작업 폴더가 다른 경로가 섞이지 않음)"""
+    if destination.lower() == SRGB:
+        return SRGB
+    return os.path.realpath(destination)
+
+
+def output_profile(destination=SRGB):
+    """출력 프로파일 ('srgb' 또는 .icc 파일 경로) → (ImageCmsProfile, ICC 바이트)"""
+    key = _profile_key(destination)
+    with _lock:
+        cached = _profiles.get(key)
+    if cached is None:
+        cached = _load_output_profile(key)
+        with _lock:
+            cached = _profiles.setdefault(key, cached)
+    return cached
+
+
+def profile_bytes(destination=SRGB):
+    """출력 PNG에 넣을 ICC 바이트 (destination이 None이면 None)"""
+    if destination is None:
+        return None
+    return output_profile(destination)[1]
+
+
+def parse_output_profile(value, cwd=None):
+    """CLI 값 → 출력 프로파일 ('none'이면 색 관리 끔)
+
+    cwd: 상대 .icc 경로의 기준 폴더 (렌더 데몬은 클라이언트의 작업 폴더, 기본값은 현재 폴더)
+    """
+    if value is None or value.lower() == 'none':
+        return None
+    if value.lower() == SRGB:
+        return SRGB
+    return os.path.join(cwd, value) if cwd else value
+
+
+def _transform(icc, destination, in_mode, out_mode):
+    """캐시된 변환 (없으면 한 번만 생성)"""
+    global transforms_built
+    from PIL import ImageCms
+
+    key = (hashlib.sha1(icc).hexdigest(), _profile_key(destination), in_mode, out_mode)
+    with _lock:
+        transform = _transforms.get(key)
+    if transform is not None:
+        return transform
+
+    source = ImageCms.ImageCmsProfile(io.BytesIO(icc))
+    transform = ImageCms.buildTransform(source, output_profile(destination)[0], in_mode, out_mode)
+    with _lock:
+        if key not in _transforms:
+            _transforms[key] = transform
+            transforms_built += 1
+        return _transforms[key]
+
+
+def convert_to_profile(image, destination=SRGB):
+    """이미지에 ICC 프로파일이 있으면 출력 프로파일로 변환한 새 이미지 반환
+
+    프로파일이 없거나 이미 출력 프로파일이면 그대로 반환. destination이 None이면 색 관리를 하지 않음.
+    """
+    icc = image.info.get('icc_profile')
+    if destination is None or not icc:
+        return image
+    target = profile_bytes(destination)
+    if icc == target:
+        return image
+
+    in_mode = image.mode
+    if in_mode not in ('RGB', 'RGBA', 'CMYK'):
+        in_mode = 'RGBA' if 'A' in image.mode or 'transparency' in image.info else 'RGB'
+        image = image.convert(in_mode)
+    out_mode = 'RGBA' if in_mode == 'RGBA' else 'RGB'
+
+    digest = hashlib.sha1(icc).hexdigest()
+    if digest in _failed:
+        return image
+    try:
+        from PIL import ImageCms
+        converted = ImageCms.applyTransform(image, _transform(icc, destination, in_mode, out_mode))
+    except Exception as e:
+        # 손상되었거나 색 공간이 맞지 않는 프로파일은 변환 없이 사용
+        with _lock:
+            _failed.add(digest)
+        print(f"⚠️  ICC 프로파일을 적용할 수 없어 변환 없이 사용합니다 ({e})")
+        return image
+    converted.info['icc_profile'] = target
+    return converted
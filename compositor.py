@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Compositor
+작업 버퍼(RGBA) 하나에 레이어를 순서대로 제자리 합성
+
+배경을 한 번 RGBA로 받은 뒤 스크린샷, 그림자, 텍스트, 프레임, 테두리를 모두 같은 버퍼에
+alpha_composite / 마스크 paste / ImageDraw로 그리고, 마지막에 한 번만 RGB로 변환한다.
+이미지당 새로 만든 버퍼 수는 count_allocations()로 잴 수 있다 (테스트에서 상한 확인).
+
+그림자처럼 색이 한 가지인 레이어는 RGBA 이미지 대신 커버리지 마스크(알파)만 만들고
+합성할 때 한 번만 곱한다 (프리멀티플라이드 (0, 0, 0, a)와 같은 값). 레이어 자신을 마스크로
+paste하면 알파가 두 번 곱해지므로 레이어끼리는 over 연산(alpha_composite) 한 번으로 합성한다.
+검증: tests/test_compositor.py (독립적으로 계산한 참조 렌더링과 픽셀 단위 비교)
+"""
+
+import math
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFilter
+
+
+@lru_cache(maxsize=16)
+def rounded_mask(size, radius, fill=255, box=None, supersample=1):
+    """둥근 사각형 마스크 (크기/반지름별 캐시 — 공유되므로 수정하지 말 것)
+
+    box: 그릴 사각형 ((x0, y0), (x1, y1)), 기본값은 ((0, 0), size)
+    supersample: k > 1이면 네 모서리만 k배로 그린 뒤 Image.reduce(k)로 줄여 가장자리를 부드럽게
+                 (직선 구간은 1배와 같으므로 전체를 k배로 그리지 않음)
+    """
+    box = box or ((0, 0), size)
+    mask = Image.new('L', size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle(box, radius=radius, fill=fill)
+    if supersample > 1 and radius > 0:
+        _smooth_corners(mask, box, radius, fill, supersample)
+    return mask
+
+
+def _smooth_corners(mask, box, radius, fill, k):
+    """마스크의 네 모서리(radius x radius)를 k배 해상도로 다시 그려 줄인 값으로 교체"""
+    (x0, y0), (x1, y1) = box
+    patch = radius + 1
+    # 1배 좌표 (x, y)의 픽셀은 k배에서 [k*x, k*x + k - 1] → 사각형 끝 좌표는 k*(x1 + 1) - 1
+    big_box = (x0 * k, y0 * k, (x1 + 1) * k - 1, (y1 + 1) * k - 1)
+    for left, top in ((x0, y0), (x1 - radius, y0), (x0, y1 - radius), (x1 - radius, y1 - radius)):
+        corner = Image.new('L', (patch * k, patch * k), 0)
+        ImageDraw.Draw(corner).rounded_rectangle(
+            (big_box[0] - left * k, big_box[1] - top * k, big_box[2] - left * k, big_box[3] - top * k),
+            radius=radius * k, fill=fill
+        )
+        mask.paste(corner.reduce(k), (left, top))
+
+
+# 축소한 마스크에서 유지할 최소 블러 반지름 (이보다 작게 줄이면 가장자리 오차가 커짐)
+SHADOW_BLUR_MIN_SCALED = 4
+SHADOW_MAX_SCALE = 8
+# 블러가 레이어 경계에 닿지 않도록 둘레에 두는 여백 (블러 반지름의 배수, 가우시안 꼬리 포함)
+SHADOW_PAD_RADII = 3
+# 축소 블러와 전체 크기 블러의 최대 차이 (불투명도 255 기준, tests/test_compositor.py에서 확인)
+SHADOW_SCALE_TOLERANCE = 3
+
+
+def shadow_scale(blur):
+    """그림자 마스크를 줄일 배율 (흐린 그림자에는 고주파가 없으므로 블러 반지름에 비례해 줄임)"""
+    return max(1, min(SHADOW_MAX_SCALE, int(blur // SHADOW_BLUR_MIN_SCALED)))
+
+
+@lru_cache(maxsize=8)
+def shadow_mask(size, box, radius, opacity, blur, scale=None):
+    """흐린 둥근 사각형 그림자 커버리지 (모양별 캐시 — 공유되므로 수정하지 말 것)
+
+    한 채널만 흐리게 하므로 RGBA 그림자 레이어를 흐리게 하는 것보다 픽셀 연산이 1/4.
+    마스크는 둘레에 0 여백을 두고 흐린 뒤 size만큼 잘라내므로, 레이어 경계 근처도
+    경계 없이 흐린 값과 같다 (Pillow 블러의 가장자리 처리는 배율에 따라 달라지므로 쓰지 않음).
+    scale: 마스크를 1/scale로 줄여(Image.reduce) 흐리게 한 뒤 BILINEAR로 되돌림
+           (기본값 shadow_scale(blur)) → 블러 비용이 전체 크기가 아니라 1/scale²에 비례.
+           1이면 원래 크기에서 흐림. 두 결과의 차이는 최대 SHADOW_SCALE_TOLERANCE
+    """
+    if scale is None:
+        scale = shadow_scale(blur)
+    scale = max(1, scale)
+    # 여백과 전체 크기를 scale의 배수로 맞춰 reduce가 나머지 없이 나뉘게 함
+    pad = scale * math.ceil(SHADOW_PAD_RADII * blur / scale)
+    padded = (pad + scale * math.ceil((size[0] + pad) / scale),
+              pad + scale * math.ceil((size[1] + pad) / scale))
+    (x0, y0), (x1, y1) = box
+    mask = Image.new('L', padded, 0)
+    ImageDraw.Draw(mask).rounded_rectangle(((x0 + pad, y0 + pad), (x1 + pad, y1 + pad)),
+                                           radius=radius, fill=opacity)
+    return _blur_scaled(mask, blur, scale, (pad, pad), size)
+
+
+def shadow_margin(blur, scale=None):
+    """blurred_mask가 마스크 둘레에 더하는 여백 (블러가 번지는 범위, scale의 배수)"""
+    if scale is None:
+        scale = shadow_scale(blur)
+    scale = max(1, scale)
+    return scale * math.ceil(SHADOW_PAD_RADII * blur / scale)
+
+
+def blurred_mask(mask, blur, opacity=255, scale=None):
+    """임의 모양 커버리지 마스크(L, 예: 변환한 디바이스의 알파)를 흐린 그림자 마스크
+
+    shadow_mask와 같이 1/scale로 줄여(Image.reduce) 흐린 뒤 BILINEAR로 되돌리므로 블러 비용이
+    마스크 크기가 아니라 1/scale²에 비례한다. opacity는 줄인 마스크에 곱함 (블러는 선형).
+    반환: (흐린 마스크, margin) — 결과는 둘레에 margin 여백을 더한 크기이고 원래 마스크는 (margin, margin)에 놓임
+    """
+    if scale is None:
+        scale = shadow_scale(blur)
+    scale = max(1, scale)
+    margin = shadow_margin(blur, scale)
+    size = (mask.width + 2 * margin, mask.height + 2 * margin)
+    padded = Image.new('L', (scale * math.ceil(size[0] / scale), scale * math.ceil(size[1] / scale)), 0)
+    padded.paste(mask, (margin, margin))
+    return _blur_scaled(padded, blur, scale, (0, 0), size, opacity), margin
+
+
+def _blur_scaled(mask, blur, scale, origin, size, opacity=255):
+    """0 여백을 둔 마스크를 흐려 origin부터 size만큼 반환 (scale > 1이면 줄여서 흐린 뒤 되돌림,
+    mask 크기와 origin은 scale의 배수)"""
+    def apply_opacity(image):
+        return image if opacity == 255 else image.point(lambda v: v * opacity // 255)
+
+    if scale == 1:
+        blurred = apply_opacity(mask).filter(ImageFilter.GaussianBlur(blur))
+        return blurred.crop((origin[0], origin[1], origin[0] + size[0], origin[1] + size[1]))
+    small = apply_opacity(mask.reduce(scale)).filter(ImageFilter.GaussianBlur(blur / scale))
+    left, top = origin[0] / scale, origin[1] / scale
+    return small.resize(size, Image.Resampling.BILINEAR,
+                        box=(left, top, left + size[0] / scale, top + size[1] / scale))
+
+
+def phone_frame(screenshot, frame_color=(20, 20, 20), corner_radius=60, shadow_offset=40,
+                blur=20, frame_padding=10, shadow_opacity=80, supersample=1):
+    """iPhone 스타일 프레임 + 흐린 그림자를 가진 RGBA 레이어
+
+    그림자는 검정 + 커버리지 알파 그대로 두고, 프레임은 over 연산 한 번으로 올림
+    (그림자 알파는 최종 합성 때 한 번만 적용됨). supersample: 둥근 모서리 안티앨리어싱 배율
+    """
+    frame_size = (screenshot.width + frame_padding * 2, screenshot.height + frame_padding * 2)
+    total_size = (frame_size[0] + shadow_offset * 2, frame_size[1] + shadow_offset * 2)
+
+    # 그림자 레이어
+    layer = Image.new('RGBA', total_size, (0, 0, 0, 0))
+    box = ((shadow_offset, shadow_offset),
+           (frame_size[0] + shadow_offset, frame_size[1] + shadow_offset))
+    layer.putalpha(shadow_mask(total_size, box, corner_radius, shadow_opacity, blur))
+
+    # 프레임: 불투명 바탕 위에 스크린샷, 둥근 모서리
+    frame = Image.new('RGBA', frame_size, (*frame_color, 255))
+    if screenshot.mode == 'RGBA':
+        frame.alpha_composite(screenshot, (frame_padding, frame_padding))
+    else:
+        # RGB는 그대로 paste (convert는 같은 모드여도 복사본을 만듦, paste가 RGBA로 한 번만 변환)
+        frame.paste(screenshot if screenshot.mode == 'RGB' else screenshot.convert('RGB'),
+                    (frame_padding, frame_padding))
+    frame.putalpha(rounded_mask(frame_size, corner_radius, supersample=supersample))
+
+    layer.alpha_composite(frame, (shadow_offset // 2, shadow_offset // 2))
+    return layer
+
+
+class AllocationCount:
+    """count_allocations() 블록 안에서 새로 만든 이미지 버퍼 (모드, 크기) 목록"""
+
+    def __init__(self):
+        self.images = []
+
+    @property
+    def count(self):
+        return len(self.images)
+
+    def of_size(self, size):
+        """주어진 크기(예: 출력 크기)로 만든 버퍼 수"""
+        return sum(1 for _, image_size in self.images if image_size == size)
+
+
+_allocation_lock = threading.Lock()
+
+
+@contextmanager
+def count_allocations():
+    """블록 안에서 새로 만든 이미지 버퍼를 셈 (Image.Image._new를 잠시 감쌈)
+
+    new, copy, convert, resize, crop, filter, alpha_composite 등 새 이미지를 돌려주는 연산은
+    모두 _new를 거치므로 캐시된 마스크를 다시 쓰는 경우처럼 실제로 할당하지 않은 것은 세지 않는다.
+    프로세스 전체에 적용되므로 테스트나 단일 스레드 측정에만 사용할 것.
+    """
+    allocations = AllocationCount()
+    with _allocation_lock:
+        original = Image.Image._new
+
+        def _new(self, im):
+            allocations.images.append((im.mode, im.size))
+            return original(self, im)
+
+        Image.Image._new = _new
+        try:
+            yield allocations
+        finally:
+            Image.Image._new = original
+
+
+class Compositor:
+    """RGBA 작업 버퍼 하나에 레이어를 쌓는 합성기
+
+    background: 작업 버퍼로 그대로 쓸 배경 (RGBA가 아니면 한 번만 변환)
+    """
+
+    def __init__(self, background):
+        if background.mode != 'RGBA':
+            background = background.convert('RGBA')
+        self.canvas = background
+        self._draw = None
+
+    @property
+    def size(self):
+        return self.canvas.size
+
+    def over(self, layer, position=(0, 0)):
+        """RGBA 레이어를 position에 over 합성 (캔버스를 벗어난 부분은 잘라냄)"""
+        if layer.mode != 'RGBA':
+            layer = layer.convert('RGBA')
+        x, y = position
+        left, top = max(0, -x), max(0, -y)
+        right = min(layer.width, self.canvas.width - x)
+        bottom = min(layer.height, self.canvas.height - y)
+        if right <= left or bottom <= top:
+            return
+        self.canvas.alpha_composite(layer, (x + left, y + top), (left, top, right, bottom))
+
+    def fill(self, color, position, mask):
+        """단색을 마스크 모양으로 합성 (그림자 등 — 색상 레이어를 만들지 않음)"""
+        self.canvas.paste(color, (position[0], position[1],
+                                  position[0] + mask.width, position[1] + mask.height), mask)
+
+    @property
+    def draw(self):
+        """작업 버퍼에 직접 그리는 ImageDraw (블렌딩 없이 픽셀을 덮어씀)"""
+        if self._draw is None:
+            self._draw = ImageDraw.Draw(self.canvas)
+        return self._draw
+
+    def result(self):
+        """최종 RGB 이미지 (변환은 여기서 한 번만)"""
+        return self.canvas.convert('RGB')
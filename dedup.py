@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Render Deduplication
+배치에서 렌더링 결과가 같을 입력(픽셀이 같은 스크린샷 + 같은 설정)은 한 번만 렌더링하고
+나머지 출력은 첫 출력에 하드 링크(안 되면 복사)로 만든다. 로컬라이즈 실행에서 로케일 간에 똑같은 스크린샷용.
+
+키는 (설정 해시, 디코딩한 픽셀과 ICC 프로파일/투명색/팔레트의 해시)이며, 지각 해시(dHash)가 같지만 픽셀이 다른 입력은
+'거의 같은 입력'으로 보고서에만 남기고 렌더링한다 (텍스트만 조금 다른 화면 등 검토용).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from checkpoint import TEMP_PREFIX, atomic_open
+
+REPORT_NAME = 'dedup_report.json'
+
+# dHash 크기: (HASH_SIZE + 1) x HASH_SIZE 흑백 썸네일 → HASH_SIZE² 비트
+HASH_SIZE = 8
+
+
+def perceptual_hash(image):
+    """dHash (가로로 이웃한 밝기 비교) 64비트를 16진 문자열로"""
+    from PIL import Image
+
+    small = image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BOX)
+    pixels = small.tobytes()
+    bits = 0
+    for y in range(HASH_SIZE):
+        row = pixels[y * (HASH_SIZE + 1):(y + 1) * (HASH_SIZE + 1)]
+        for x in range(HASH_SIZE):
+            bits = (bits << 1) | (row[x] > row[x + 1])
+    return f"{bits:0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+
+def pixel_digest(image):
+    """디코딩한 픽셀의 해시 — 같으면 렌더링 결과도 같음
+
+    모드, 크기와 함께 픽셀 해석을 바꾸는 메타데이터(내장 ICC 프로파일, 투명색, 팔레트)도 넣는다
+    (픽셀 바이트가 같아도 프로파일 변환이나 알파 처리 결과가 다름).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode} {image.size[0]}x{image.size[1]}".encode())
+    palette = image.palette.tobytes() if image.mode in ('P', 'PA') and image.palette else b''
+    for extra in (image.info.get('icc_profile') or b'',
+                  repr(image.info.get('transparency')).encode(),
+                  palette):
+        digest.update(len(extra).to_bytes(8, 'big'))
+        digest.update(extra)
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def settings_digest(settings):
+    """렌더링 설정(dict)의 해시"""
+    encoded = json.dumps(settings, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+def link_or_copy(source, destination):
+    """destination을 source의 하드 링크로 원자적으로 교체 (링크가 안 되는 파일 시스템이면 복사)
+
+    반환: 'link' 또는 'copy'
+    """
+    directory = os.path.dirname(os.path.abspath(destination))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=TEMP_PREFIX, suffix='.tmp')
+    os.close(fd)
+    os.remove(temp_path)
+    try:
+        os.link(source, temp_path)
+        os.replace(temp_path, destination)
+        return 'link'
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+    with open(source, 'rb') as src, atomic_open(destination) as dst:
+        shutil.copyfileobj(src, dst)
+    return 'copy'
+
+
+class _Entry:
+    """키별 첫 렌더링 (중복 입력은 done을 기다렸다가 output_path를 링크)"""
+
+    def __init__(self, input_path, output_path):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.done = threading.Event()
+        self.success = False
+
+
+class DedupIndex:
+    """(설정, 픽셀 해시)별 첫 출력 기록 (여러 워커 스레드에서 공유)
+
+    워커는 register()로 키를 얻고, claim()이 True이면 렌더링한 뒤 finish()로 결과를 알린다.
+    claim()이 False이면 reuse()로 첫 출력을 기다렸다가 링크하며, 첫 렌더링이 실패했으면
+    다시 claim()해 직접 렌더링한다.
+    """
+
+    def __init__(self, settings=None):
+        self.settings_key = settings_digest(settings or {})
+        self.renders = 0
+        self.duplicates = []        # 링크/복사로 만든 출력
+        self.near_duplicates = []   # 지각 해시만 같은 입력 (렌더링함)
+        self._entries = {}
+        self._perceptual = {}       # 지각 해시 -> (픽셀 해시, 입력 경로)
+        self._lock = threading.Lock()
+
+    def register(self, image, input_path):
+        """디코딩한 입력의 키 계산 (지각 해시만 같은 입력은 보고서에 기록)"""
+        digest = pixel_digest(image)
+        phash = perceptual_hash(image)
+        with self._lock:
+            seen = self._perceptual.setdefault(phash, (digest, input_path))
+            if seen[0] != digest:
+                self.near_duplicates.append({'input': input_path, 'similar_to': seen[1],
+                                             'perceptual_hash': phash})
+        return self.settings_key, digest
+
+    def claim(self, key, input_path, output_path):
+        """이 키를 처음 본 입력이면 True (호출한 워커가 렌더링)"""
+        with self._lock:
+            if key in self._entries:
+                return False
+            self._entries[key] = _Entry(input_path, output_path)
+            return True
+
+    def finish(self, key, success):
+        """첫 렌더링 결과 알림 (실패하면 기다리던 중복 입력 중 하나가 다시 claim)"""
+        with self._lock:
+            entry = self._entries[key]
+            entry.success = success
+            if success:
+                self.renders += 1
+            else:
+                del self._entries[key]
+        entry.done.set()
+
+    def reuse(self, key, input_path, output_path):
+        """같은 키의 첫 출력을 기다려 링크/복사. 첫 렌더링이 실패했으면 False"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return False
+        entry.done.wait()
+        if not entry.success:
+            return False
+        method = link_or_copy(entry.output_path, output_path)
+        with self._lock:
+            self.duplicates.append({'input': input_path, 'output': output_path,
+                                    'source_input': entry.input_path,
+                                    'source_output': entry.output_path, 'method': method})
+        return True
+
+    def report(self):
+        return {
+            'settings': self.settings_key,
+            'renders': self.renders,
+            'duplicates': self.duplicates,
+            'near_duplicates': self.near_duplicates,
+        }
+
+    def write_report(self, output_dir):
+        """출력 폴더에 dedup_report.json 저장하고 경로 반환"""
+        path = os.path.join(output_dir, REPORT_NAME)
+        with atomic_open(path) as f:
+            f.write(json.dumps(self.report(), ensure_ascii=False, indent=2).encode('utf-8'))
+        return path
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Input Discovery
+CLI, 배치 처리, GUI가 공유하는 입력 이미지 탐색 (os.scandir 기반)
+
+- 확장자는 대소문자 구분 없이 한 번만 검사 (대소문자 무시 파일 시스템에서도 중복 없음)
+- 폴더마다 이름순 정렬 → 실행할 때마다 같은 순서
+- 하드 링크/심볼릭 링크로 같은 파일이 여러 번 보이면 한 번만 반환 (inode 기준)
+- 제너레이터로 하나씩 반환하므로 큰 폴더도 탐색이 끝나기 전에 처리를 시작할 수 있음
+"""
+
+import os
+from fnmatch import fnmatch
+
+SUPPORTED_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+def is_supported(name, extensions=SUPPORTED_EXTENSIONS):
+    return name.lower().endswith(extensions)
+
+
+def _matches(patterns, name, relpath):
+    """패턴이 파일 이름 또는 (루트 기준) 상대 경로와 일치하는지"""
+    return any(fnmatch(name, pattern) or fnmatch(relpath, pattern) for pattern in patterns)
+
+
+def _file_key(entry, device):
+    """중복 판별 키: (장치, inode). inode를 주지 않는 파일 시스템은 실제 경로로 대체"""
+    try:
+        if entry.is_symlink():
+            stat = entry.stat()
+            return stat.st_dev, stat.st_ino
+        inode = entry.inode()
+    except OSError:
+        inode = 0
+    if inode:
+        return device, inode
+    return os.path.realpath(entry.path)
+
+
+def iter_images(root, recursive=False, include=None, exclude=None,
+                extensions=SUPPORTED_EXTENSIONS):
+    """root 아래의 이미지 경로(str)를 결정적인 순서로 하나씩 반환
+
+    root가 파일이면 그 파일 하나만 반환한다.
+    include: 하나라도 일치해야 하는 glob 패턴 목록 (예: '*_en.png', 'iphone/*')
+    exclude: 일치하면 제외할 glob 패턴 목록 (폴더에 일치하면 폴더 전체 제외)
+    숨김 파일/폴더('.'으로 시작)는 건너뜀 (macOS '._*' 파일, 작업 중 임시 파일 등)
+    """
+    include = list(include or [])
+    exclude = list(exclude or [])
+
+    if not os.path.isdir(root):
+        if os.path.isfile(root):
+            yield str(root)
+        return
+
+    seen = set()
+    # 깊이 우선, 폴더마다 이름순 (스택에는 역순으로 넣음)
+    stack = [('', str(root))]
+    while stack:
+        reldir, directory = stack.pop()
+        try:
+            device = os.stat(directory).st_dev
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            relpath = f"{reldir}/{entry.name}" if reldir else entry.name
+            if exclude and _matches(exclude, entry.name, relpath):
+                continue
+
+            try:
+                # 폴더 심볼릭 링크는 따라가지 않음 (순환 방지)
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        subdirs.append((relpath, entry.path))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            if not is_supported(entry.name, extensions):
+                continue
+            if include and not _matches(include, entry.name, relpath):
+                continue
+
+            key = _file_key(entry, device)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield entry.path
+
+        stack.extend(reversed(subdirs))
+
+
+def find_images(root, recursive=False, include=None, exclude=None):
+    """iter_images 결과를 목록으로 (GUI 등 한 번에 필요한 곳에서 사용)"""
+    return list(iter_images(root, recursive, include, exclude))
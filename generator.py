@@ -4,9 +4,28 @@ iOS Marketing Image Generator
 iPhone 14 Pro 스크린샷을 1290x2796 마케팅 이미지로 변환
 """
 
-from PIL import Image, ImageDraw, ImageFont
+import copy
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from checkpoint import atomic_save
+from color_profiles import SRGB, convert_to_profile, parse_output_profile, profile_bytes
+from discovery import find_images
+
+# PIL은 생성기를 만들 때(실제 렌더링 직전) 불러옴 → --help, 인자 검증은 PIL 없이 바로 끝남
+Image = ImageDraw = ImageFont = None
+
+
+def _load_pil():
+    """PIL 모듈을 처음 필요할 때 한 번만 불러옴"""
+    global Image, ImageDraw, ImageFont
+    if Image is None:
+        from PIL import Image, ImageDraw, ImageFont
+
 
 class MarketingImageGenerator:
     # iPhone 14 Pro 스크린샷 해상도
@@ -24,41 +43,137 @@ class MarketingImageGenerator:
         'gradient_blue': None,  # 그라디언트는 별도 처리
         'app_store_gray': (242, 242, 247)
     }
+    # 'auto': 스크린샷의 대표 색으로 그라디언트 (palette.py, BACKGROUND_COLORS와 달리 입력마다 색이 다름)
+    BACKGROUND_STYLES = tuple(BACKGROUND_COLORS) + ('auto',)
+    # 배경 캐시에 둘 최대 개수 (auto는 입력마다 색이 달라 키가 계속 늘어나므로 LRU로 제한)
+    BACKGROUND_CACHE_SIZE = 8
     
-    def __init__(self, background='white'):
+    # 디바이스 프레임(그림자) 모양
+    FRAME_SHADOW_OFFSET = 20
+    FRAME_SHADOW_COLOR = (0, 0, 0, 50)
+    FRAME_SHADOW_RADIUS = 40
+    
+    def __init__(self, background='white', supersample=1, output_profile=SRGB,
+                 crop=None, clean_status_bar=False):
+        _load_pil()
         self.background_color = self.BACKGROUND_COLORS.get(background, (255, 255, 255))
+        # 둥근 모서리 마스크 슈퍼샘플링 배율 (1이면 끔, 4면 모서리만 4배로 그려 부드럽게)
+        self.supersample = supersample
+        # 출력 색 프로파일 ('srgb' 또는 .icc 경로, None이면 색 관리 안 함)
+        self.output_profile = output_profile
+        # 리사이즈 전 전처리: 세이프 에어리어 자르기 프리셋, 상태 표시줄 정리 (preprocess.py)
+        self.crop = crop
+        self.clean_status_bar = clean_status_bar
+        # 그라디언트 배경 LRU 캐시 (스타일, 크기[, 색]) -> 이미지, 적중/누락 수 (with_options 복사본과 공유)
+        self._background_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_stats = {'hits': 0, 'misses': 0}
+        # 렌더링 관찰자 (observe_stage/observe_render/observe_error 메서드를 가진 객체, 선택사항)
+        self.observer = None
+    
+    @property
+    def cache_hits(self):
+        return self._cache_stats['hits']
+    
+    @property
+    def cache_misses(self):
+        return self._cache_stats['misses']
+    
+    def with_options(self, **options):
+        """요청별 설정(supersample, output_profile, crop, clean_status_bar)을 바꾼 얕은 복사본
+        
+        배경 캐시, 락, 통계, observer는 원본과 공유하고 원본의 설정은 그대로 두므로
+        여러 스레드가 한 생성기를 공유할 때(렌더 데몬) 요청마다 이것으로 설정을 적용한다.
+        """
+        generator = copy.copy(self)
+        for name, value in options.items():
+            if not hasattr(self, name):
+                raise AttributeError(f"알 수 없는 생성기 설정: {name}")
+            setattr(generator, name, value)
+        return generator
+    
+    @contextmanager
+    def _stage(self, name):
+        """렌더링 단계 소요 시간을 observer에 보고"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.observer is not None:
+                self.observer.observe_stage(name, time.perf_counter() - start)
+    
+    def get_background(self, background_style, width, height, colors=None):
+        """배경 생성 (그라디언트는 캐시해 두고 복사본 반환)
+        
+        colors: 'auto' 스타일의 그라디언트 두 색 (palette.gradient_colors)
+        """
+        if background_style == 'auto' and colors:
+            key = (background_style, width, height, tuple(map(tuple, colors)))
+        elif background_style == 'gradient_blue':
+            key = (background_style, width, height)
+        else:
+            bg_color = self.BACKGROUND_COLORS.get(background_style, (255, 255, 255))
+            return Image.new('RGB', (width, height), bg_color)
+        
+        with self._cache_lock:
+            cached = self._background_cache.get(key)
+            if cached is None:
+                self._cache_stats['misses'] += 1
+            else:
+                self._cache_stats['hits'] += 1
+                self._background_cache.move_to_end(key)
+        if cached is None:
+            cached = self.create_gradient_background(width, height, *(colors or ()))
+            self._cache_background(key, cached)
+        return cached.copy()
+    
+    def set_background(self, background_style, image):
+        """미리 만든 배경을 캐시에 넣음 (예: 프로세스 워커가 공유 메모리의 배경을 재사용)"""
+        self._cache_background((background_style, image.width, image.height), image)
+    
+    def _cache_background(self, key, image):
+        with self._cache_lock:
+            self._background_cache[key] = image
+            self._background_cache.move_to_end(key)
+            while len(self._background_cache) > self.BACKGROUND_CACHE_SIZE:
+                self._background_cache.popitem(last=False)
+    
+    def warm_up(self, background_styles=('gradient_blue',)):
+        """자주 쓰는 배경을 미리 만들어 캐시 (서버 시작 시 호출)"""
+        for style in background_styles:
+            self.get_background(style, self.TARGET_WIDTH, self.TARGET_HEIGHT)
     
     def create_gradient_background(self, width, height, color_start=(74, 144, 226), color_end=(155, 89, 182)):
-        """그라디언트 배경 생성"""
-        base = Image.new('RGB', (width, height), color_start)
-        top = Image.new('RGB', (width, height), color_end)
-        mask = Image.new('L', (width, height))
-        mask_data = []
-        for y in range(height):
-            mask_data.extend([int(255 * (y / height))] * width)
-        mask.putdata(mask_data)
-        base.paste(top, (0, 0), mask)
+        """그라디언트 배경 생성
+        
+        한 열짜리 마스크를 만든 뒤 늘리고 두 번째 색은 단색 paste (픽셀마다 계산하지 않음, 결과는 동일 —
+        auto 배경은 입력마다 새로 만들 수 있으므로)
+        """
+        base = Image.new('RGB', (width, height), tuple(color_start))
+        strip = Image.new('L', (1, height))
+        strip.putdata([int(255 * (y / height)) for y in range(height)])
+        base.paste(tuple(color_end), (0, 0, width, height), strip.resize((width, height), Image.NEAREST))
         return base
     
     def add_device_frame(self, screenshot):
         """디바이스 프레임 추가 (선택사항)"""
         # 간단한 그림자 효과 추가
-        shadow_offset = 20
-        shadow_color = (0, 0, 0, 50)
+        shadow_offset = self.FRAME_SHADOW_OFFSET
+        shadow_color = self.FRAME_SHADOW_COLOR
         
-        # 그림자용 이미지 생성
+        from compositor import rounded_mask
+        
+        # 그림자용 이미지 생성 (검정 + 둥근 사각형 알파)
         shadow = Image.new('RGBA', 
                           (screenshot.width + shadow_offset * 2, 
                            screenshot.height + shadow_offset * 2), 
-                          (0, 0, 0, 0))
-        shadow_draw = ImageDraw.Draw(shadow)
-        shadow_draw.rounded_rectangle(
-            [shadow_offset, shadow_offset, 
-             screenshot.width + shadow_offset, 
-             screenshot.height + shadow_offset],
-            radius=40,
-            fill=shadow_color
-        )
+                          (*shadow_color[:3], 0))
+        shadow.putalpha(rounded_mask(
+            shadow.size, self.FRAME_SHADOW_RADIUS, shadow_color[3],
+            ((shadow_offset, shadow_offset),
+             (screenshot.width + shadow_offset, screenshot.height + shadow_offset)),
+            self.supersample
+        ))
         
         # 스크린샷을 RGBA로 변환
         if screenshot.mode != 'RGBA':
@@ -70,23 +185,46 @@ class MarketingImageGenerator:
         return shadow
     
     def generate_marketing_image(self, screenshot_path, output_path, add_frame=True, background_style='white'):
-        """마케팅 이미지 생성"""
+        """마케팅 이미지 생성 (screenshot_path는 경로 또는 이미 디코딩한 이미지)"""
+        render_start = time.perf_counter()
         try:
             # 스크린샷 불러오기
-            screenshot = Image.open(screenshot_path)
+            with self._stage('decode'):
+                if isinstance(screenshot_path, Image.Image):
+                    screenshot = screenshot_path
+                else:
+                    screenshot = Image.open(screenshot_path)
+                    screenshot.load()
+                # Display P3 등 내장 프로파일이 있으면 출력 프로파일로 변환
+                screenshot = convert_to_profile(screenshot, self.output_profile)
+                # P/L/LA 등은 리사이즈 전에 RGB(A)로 (P는 LANCZOS 대신 NEAREST로 줄여지고,
+                # 프로세스 모드의 공유 메모리 전달과 스레드 모드가 같은 입력을 리사이즈하도록)
+                if screenshot.mode not in ('RGB', 'RGBA'):
+                    screenshot = screenshot.convert(
+                        'RGBA' if 'A' in screenshot.mode or 'transparency' in screenshot.info else 'RGB')
             print(f"원본 이미지 크기: {screenshot.size}")
             
-            # 배경 생성
-            if background_style == 'gradient_blue':
-                background = self.create_gradient_background(self.TARGET_WIDTH, self.TARGET_HEIGHT)
-            else:
-                bg_color = self.BACKGROUND_COLORS.get(background_style, (255, 255, 255))
-                background = Image.new('RGB', (self.TARGET_WIDTH, self.TARGET_HEIGHT), bg_color)
+            # 상태 표시줄 정리 / 세이프 에어리어 자르기 (자르기는 resize의 box로만 적용)
+            box = None
+            if self.crop or self.clean_status_bar:
+                from preprocess import preprocess
+                with self._stage('preprocess'):
+                    screenshot, box = preprocess(screenshot, self.crop, self.clean_status_bar)
+            source_width, source_height = (box[2] - box[0], box[3] - box[1]) if box else screenshot.size
+            
+            # 배경 생성 (auto: 스크린샷 대표 색 그라디언트, 팔레트는 썸네일 해시로 캐시)
+            with self._stage('background'):
+                colors = None
+                if background_style == 'auto':
+                    from palette import gradient_colors
+                    colors = gradient_colors(screenshot)
+                background = self.get_background(background_style, self.TARGET_WIDTH, self.TARGET_HEIGHT,
+                                                 colors)
             
             # 스크린샷 크기 조정 (비율 유지하면서 적절한 크기로)
             # 마케팅 이미지에서 좌우 여백을 고려하여 80% 크기로 조정
             target_screenshot_width = int(self.TARGET_WIDTH * 0.8)
-            aspect_ratio = screenshot.height / screenshot.width
+            aspect_ratio = source_height / source_width
             target_screenshot_height = int(target_screenshot_width * aspect_ratio)
             
             # 높이가 너무 크면 높이 기준으로 재조정
@@ -94,18 +232,21 @@ class MarketingImageGenerator:
                 target_screenshot_height = int(self.TARGET_HEIGHT * 0.85)
                 target_screenshot_width = int(target_screenshot_height / aspect_ratio)
             
-            screenshot_resized = screenshot.resize(
-                (target_screenshot_width, target_screenshot_height),
-                Image.Resampling.LANCZOS
-            )
+            with self._stage('resize'):
+                screenshot_resized = screenshot.resize(
+                    (target_screenshot_width, target_screenshot_height),
+                    Image.Resampling.LANCZOS,
+                    box=box
+                )
             
             # 프레임/그림자 추가
-            if add_frame:
-                screenshot_with_frame = self.add_device_frame(screenshot_resized)
-            else:
-                screenshot_with_frame = screenshot_resized
-                if screenshot_with_frame.mode != 'RGBA':
-                    screenshot_with_frame = screenshot_with_frame.convert('RGBA')
+            with self._stage('frame'):
+                if add_frame:
+                    screenshot_with_frame = self.add_device_frame(screenshot_resized)
+                else:
+                    screenshot_with_frame = screenshot_resized
+                    if screenshot_with_frame.mode != 'RGBA':
+                        screenshot_with_frame = screenshot_with_frame.convert('RGBA')
             
             # 중앙에 배치
             x = (self.TARGET_WIDTH - screenshot_with_frame.width) // 2
@@ -115,19 +256,26 @@ class MarketingImageGenerator:
             y = int(y * 0.8)
             
             # 배경에 스크린샷 합성
-            background.paste(screenshot_with_frame, (x, y), screenshot_with_frame)
+            with self._stage('composite'):
+                background.paste(screenshot_with_frame, (x, y), screenshot_with_frame)
+                final_image = background.convert('RGB')
             
-            # RGB로 변환 후 저장
-            final_image = background.convert('RGB')
-            final_image.save(output_path, 'PNG', quality=95)
+            # 저장
+            with self._stage('encode'):
+                atomic_save(final_image, output_path, 'PNG', quality=95,
+                            icc_profile=profile_bytes(self.output_profile))
             
             print(f"✅ 마케팅 이미지 생성 완료: {output_path}")
             print(f"   최종 크기: {final_image.size}")
             
+            if self.observer is not None:
+                self.observer.observe_render(time.perf_counter() - render_start)
             return True
             
         except Exception as e:
             print(f"❌ 오류 발생: {e}")
+            if self.observer is not None:
+                self.observer.observe_error(e)
             return False
     
     def batch_process(self, input_dir, output_dir, add_frame=True, background_style='white'):
@@ -135,14 +283,13 @@ class MarketingImageGenerator:
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
-        supported_formats = ('.png', '.jpg', '.jpeg')
-        files = [f for f in os.listdir(input_dir) if f.lower().endswith(supported_formats)]
+        files = find_images(input_dir)
         
         print(f"총 {len(files)}개의 이미지를 처리합니다...\n")
         
         success_count = 0
-        for i, filename in enumerate(files, 1):
-            input_path = os.path.join(input_dir, filename)
+        for i, input_path in enumerate(files, 1):
+            filename = os.path.basename(input_path)
             output_filename = f"marketing_{os.path.splitext(filename)[0]}.png"
             output_path = os.path.join(output_dir, output_filename)
             
@@ -152,27 +299,59 @@ class MarketingImageGenerator:
             print()
         
         print(f"완료: {success_count}/{len(files)}개 성공")
+        return success_count == len(files)
 
 
-def main():
+def supersample_factor(value):
+    """--supersample 인자 검증 (1 이상의 정수, 1이면 끔)"""
+    import argparse
+    try:
+        factor = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"정수가 아닙니다: {value!r}")
+    if factor < 1:
+        raise argparse.ArgumentTypeError(f"1 이상이어야 합니다: {factor}")
+    return factor
+
+
+def build_parser():
+    """명령줄 인자 파서 (렌더 데몬 클라이언트와 공유)"""
     import argparse
     
     parser = argparse.ArgumentParser(description='iOS 마케팅 이미지 생성기')
     parser.add_argument('input', help='입력 스크린샷 파일 또는 디렉토리')
     parser.add_argument('-o', '--output', help='출력 파일 또는 디렉토리', default='output')
     parser.add_argument('-b', '--background', 
-                       choices=['white', 'black', 'gradient_blue', 'app_store_gray'],
+                       choices=MarketingImageGenerator.BACKGROUND_STYLES,
                        default='white',
-                       help='배경 스타일 선택')
+                       help='배경 스타일 선택 (auto: 스크린샷의 대표 색으로 그라디언트)')
     parser.add_argument('--no-frame', action='store_true', help='프레임/그림자 효과 제거')
-    
-    args = parser.parse_args()
-    
-    generator = MarketingImageGenerator()
+    parser.add_argument('--supersample', type=supersample_factor, default=1, metavar='K',
+                       help='둥근 모서리를 K배로 그려 부드럽게 (예: 4, 기본값 1 = 끔)')
+    parser.add_argument('--output-profile', default=SRGB, metavar='PROFILE',
+                       help="출력 색 프로파일: srgb, .icc 파일 경로, none (기본값 srgb, PNG에 포함)")
+    parser.add_argument('--crop', choices=['status_bar', 'safe_area'],
+                       help='리사이즈 전에 상태 표시줄(status_bar) 또는 상하단 세이프 에어리어(safe_area)를 잘라냄')
+    parser.add_argument('--clean-status-bar', action='store_true',
+                       help='상태 표시줄 영역을 바로 아래 색으로 칠해 지움')
+    return parser
+
+
+def run(args, generator=None):
+    """파싱된 인자로 생성 실행 (모두 성공하면 True)"""
+    if generator is None:
+        generator = MarketingImageGenerator()
+    # 공유 생성기(렌더 데몬)의 설정은 바꾸지 않고 이 요청용 복사본에 적용
+    generator = generator.with_options(
+        supersample=getattr(args, 'supersample', 1),
+        output_profile=parse_output_profile(getattr(args, 'output_profile', SRGB)),
+        crop=getattr(args, 'crop', None),
+        clean_status_bar=getattr(args, 'clean_status_bar', False),
+    )
     
     # 디렉토리인 경우 일괄 처리
     if os.path.isdir(args.input):
-        generator.batch_process(args.input, args.output, not args.no_frame, args.background)
+        return generator.batch_process(args.input, args.output, not args.no_frame, args.background)
     # 단일 파일인 경우
     else:
         if os.path.isdir(args.output):
@@ -180,7 +359,12 @@ def main():
         else:
             output_file = args.output
         
-        generator.generate_marketing_image(args.input, output_file, not args.no_frame, args.background)
+        return generator.generate_marketing_image(args.input, output_file, not args.no_frame, args.background)
+
+
+def main():
+    args = build_parser().parse_args()
+    run(args)
 
 
 if __name__ == '__main__':
@@ -4,9 +4,57 @@ Advanced iOS Marketing Image Generator
 프로 레벨의 앱 스토어 마케팅 이미지 생성 with 텍스트 오버레이
 """
 
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
+import copy
+import math
 import os
 import sys
+import threading
+from collections import OrderedDict
+
+from checkpoint import atomic_save
+from color_profiles import SRGB, convert_to_profile, parse_output_profile, profile_bytes
+from generator import supersample_factor
+import perspective
+from layouts import LAYOUTS, plan_layout, plan_panorama
+
+# PIL은 생성기를 만들 때(실제 렌더링 직전) 불러옴 → --help, 인자 검증은 PIL 없이 바로 끝남
+Image = ImageDraw = ImageFont = None
+
+
+def _load_pil():
+    """PIL 모듈을 처음 필요할 때 한 번만 불러옴"""
+    global Image, ImageDraw, ImageFont
+    if Image is None:
+        from PIL import Image, ImageDraw, ImageFont
+
+
+class DeviceRender:
+    """캔버스에 놓일 디바이스 하나: 프레임을 입힌 원본과 캔버스로의 변환
+    
+    rows()로 필요한 행만 리샘플할 수 있어 타일 렌더링에서도 같은 결과를 얻는다.
+    matrix가 None이면 LANCZOS 리사이즈, 아니면 affine/원근 변환 (BICUBIC)
+    """
+    
+    def __init__(self, framed, origin, size, width, matrix=None, tilt=False):
+        self.framed = framed
+        self.origin = origin
+        self.size = size
+        self.width = width
+        self.matrix = matrix
+        self.tilt = tilt
+    
+    def rows(self, start, stop):
+        """디바이스 행 [start, stop)만 그린 RGBA 이미지"""
+        size = (self.size[0], stop - start)
+        if self.matrix is None:
+            scale = self.size[1] / self.framed.height
+            return self.framed.resize(size, Image.LANCZOS,
+                                      box=(0, start / scale, self.framed.width, stop / scale))
+        coefficients = perspective.pil_coefficients(self.matrix, (self.origin[0], self.origin[1] + start))
+        if self.tilt:
+            return self.framed.transform(size, Image.PERSPECTIVE, coefficients, resample=Image.BICUBIC)
+        return self.framed.transform(size, Image.AFFINE, coefficients[:6], resample=Image.BICUBIC)
+
 
 class AdvancedMarketingGenerator:
     # 타겟 해상도
@@ -18,16 +66,58 @@ class AdvancedMarketingGenerator:
     LAYOUT_DOUBLE = 'double'           # 2개 스크린샷
     LAYOUT_TRIPLE = 'triple'           # 3개 스크린샷 (eBay 스타일)
     LAYOUT_PERSPECTIVE = 'perspective' # 원근감 있는 배치
+    LAYOUT_FAN = 'fan'                 # 부채꼴로 펼친 배치
+    LAYOUT_GRID = 'grid'               # 격자 배치
+    LAYOUT_STAGGERED = 'staggered'     # 엇갈리게 겹친 배치
+    
+    # 디바이스 프레임 (디바이스 너비 대비 비율)
+    FRAME_PADDING_RATIO = 0.012
+    CORNER_RADIUS_RATIO = 0.07
+    SHADOW_OFFSET_RATIO = 0.02
+    SHADOW_BLUR_RATIO = 0.03
+    SHADOW_OPACITY = 80
     
     # 텍스트 위치
     TEXT_TOP = 'top'
     TEXT_BOTTOM = 'bottom'
     TEXT_CENTER = 'center'
     
-    def __init__(self):
-        self.fonts_cache = {}
+    # 배경 캐시에 둘 최대 개수 (파노라마/auto/커스텀 색마다 전체 크기 이미지가 하나씩)
+    BACKGROUND_CACHE_SIZE = 8
+    
+    def __init__(self, target_size=None, fonts_cache=None, supersample=1, output_profile=SRGB,
+                 shadow_blur=None):
+        _load_pil()
+        # 다른 디바이스 크기로 렌더링할 때 인스턴스별로 타겟 해상도 변경
+        if target_size:
+            self.TARGET_WIDTH, self.TARGET_HEIGHT = target_size
+        # 여러 생성기가 폰트 캐시를 공유할 수 있음
+        self.fonts_cache = fonts_cache if fonts_cache is not None else {}
+        # 그라디언트 배경 LRU 캐시 (색, 크기, 방향) -> 이미지 (auto 배경은 입력마다 색이 달라 크기 제한)
+        self._background_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # 원근 틸트의 카메라 거리 (디바이스 높이 대비)
+        self.camera_distance = perspective.DEFAULT_CAMERA_DISTANCE
+        # 둥근 모서리 마스크 슈퍼샘플링 배율 (1이면 끔)
+        self.supersample = supersample
+        # 출력 색 프로파일 ('srgb' 또는 .icc 경로, None이면 색 관리 안 함)
+        self.output_profile = output_profile
+        # 디바이스 그림자 블러 반지름 (px, None이면 디바이스 너비 × SHADOW_BLUR_RATIO)
+        self.shadow_blur = shadow_blur
         self.setup_fonts()
     
+    def with_options(self, **options):
+        """요청별 설정(supersample, output_profile, shadow_blur)을 바꾼 얕은 복사본
+        
+        폰트/배경 캐시와 락은 원본과 공유하고 원본의 설정은 그대로 둔다 (렌더 데몬의 공유 생성기).
+        """
+        generator = copy.copy(self)
+        for name, value in options.items():
+            if not hasattr(self, name):
+                raise AttributeError(f"알 수 없는 생성기 설정: {name}")
+            setattr(generator, name, value)
+        return generator
+    
     def setup_fonts(self):
         """시스템 폰트 경로 설정"""
         self.font_paths = {
@@ -84,192 +174,245 @@ class AdvancedMarketingGenerator:
             self.fonts_cache[cache_key] = font
             return font
     
-    def create_gradient_background(self, width, height, colors=None, direction='vertical'):
-        """그라디언트 배경 생성"""
+    def create_gradient_background(self, width, height, colors=None, direction='vertical', rows=None):
+        """그라디언트 배경 생성
+        
+        rows: (시작 행, 끝 행)을 주면 전체 중 그 가로 띠만 생성 (타일 렌더링)
+        """
         if colors is None:
             colors = [(74, 144, 226), (155, 89, 182)]  # 기본 파란색-보라색
         
-        base = Image.new('RGB', (width, height), colors[0])
-        top = Image.new('RGB', (width, height), colors[1])
-        mask = Image.new('L', (width, height))
+        first_row, last_row = rows or (0, height)
+        band_height = last_row - first_row
+        base = Image.new('RGB', (width, band_height), tuple(colors[0]))
         
-        mask_data = []
+        # 한 줄짜리 마스크를 만든 뒤 늘림 (픽셀마다 계산하지 않음, 결과는 동일)
         if direction == 'vertical':
-            for y in range(height):
-                mask_data.extend([int(255 * (y / height))] * width)
+            strip = Image.new('L', (1, band_height))
+            strip.putdata([int(255 * (y / height)) for y in range(first_row, last_row)])
         else:  # horizontal
-            for y in range(height):
-                for x in range(width):
-                    mask_data.append(int(255 * (x / width)))
+            strip = Image.new('L', (width, 1))
+            strip.putdata([int(255 * (x / width)) for x in range(width)])
+        mask = strip.resize((width, band_height), Image.NEAREST)
         
-        mask.putdata(mask_data)
-        base.paste(top, (0, 0), mask)
+        # 두 번째 색은 단색 paste (전체 크기 이미지를 하나 더 만들지 않음)
+        base.paste(tuple(colors[1]), (0, 0, width, band_height), mask)
         return base
     
-    def add_phone_frame(self, screenshot, frame_color=(20, 20, 20), 
-                        corner_radius=60, shadow_strength=40):
-        """iPhone 스타일 프레임 추가"""
-        # 스크린샷 크기 + 프레임 여백
-        frame_padding = 10
-        shadow_offset = shadow_strength
-        
-        # 전체 이미지 크기 (그림자 포함)
-        total_width = screenshot.width + frame_padding * 2 + shadow_offset * 2
-        total_height = screenshot.height + frame_padding * 2 + shadow_offset * 2
-        
-        # 투명 배경 생성
-        result = Image.new('RGBA', (total_width, total_height), (0, 0, 0, 0))
-        
-        # 그림자 생성
-        shadow = Image.new('RGBA', (total_width, total_height), (0, 0, 0, 0))
-        shadow_draw = ImageDraw.Draw(shadow)
-        
-        # 그림자 그리기
-        shadow_draw.rounded_rectangle(
-            [shadow_offset, shadow_offset,
-             screenshot.width + frame_padding * 2 + shadow_offset,
-             screenshot.height + frame_padding * 2 + shadow_offset],
-            radius=corner_radius,
-            fill=(0, 0, 0, 80)
-        )
-        
-        # 그림자 블러 효과
-        shadow = shadow.filter(ImageFilter.GaussianBlur(shadow_strength // 2))
-        result.paste(shadow, (0, 0), shadow)
-        
-        # 프레임 생성
-        frame = Image.new('RGBA', 
-                         (screenshot.width + frame_padding * 2,
-                          screenshot.height + frame_padding * 2),
-                         (*frame_color, 255))
+    def get_background(self, background_style, background_colors=None, size=None, direction='vertical',
+                       rows=None):
+        """배경 생성 (기본은 타겟 크기, 그라디언트는 캐시해 두고 복사본 반환)
+        
+        rows: (시작 행, 끝 행)을 주면 그 가로 띠만 생성 (타일 렌더링, 캐시하지 않음)
+        """
+        size = size or (self.TARGET_WIDTH, self.TARGET_HEIGHT)
+        if rows is not None:
+            band_size = (size[0], rows[1] - rows[0])
+            if background_style == 'gradient':
+                if background_colors is None:
+                    background_colors = [(74, 144, 226), (155, 89, 182)]
+                return self.create_gradient_background(size[0], size[1], background_colors,
+                                                       direction, rows)
+            return self.get_background(background_style, background_colors, band_size)
+        if background_style == 'gradient':
+            if background_colors is None:
+                background_colors = [(74, 144, 226), (155, 89, 182)]
+            key = (tuple(map(tuple, background_colors[:2])), size, direction)
+            with self._cache_lock:
+                cached = self._background_cache.get(key)
+                if cached is not None:
+                    self._background_cache.move_to_end(key)
+            if cached is None:
+                cached = self.create_gradient_background(
+                    size[0], size[1], background_colors, direction
+                )
+                with self._cache_lock:
+                    self._background_cache[key] = cached
+                    while len(self._background_cache) > self.BACKGROUND_CACHE_SIZE:
+                        self._background_cache.popitem(last=False)
+            return cached.copy()
+        elif background_style == 'solid':
+            color = background_colors[0] if background_colors else (255, 255, 255)
+            return Image.new('RGB', size, tuple(color))
+        else:
+            return Image.new('RGB', size, (255, 255, 255))
+    
+    def resolve_background(self, background_style, background_colors, screenshots):
+        """'auto' 스타일이면 스크린샷 대표 색으로 그라디언트 (팔레트는 내용 해시로 캐시)"""
+        if background_style != 'auto':
+            return background_style, background_colors
+        from palette import gradient_colors
+        return 'gradient', gradient_colors(screenshots)
+    
+    def frame_device(self, screenshot, frame_color=(20, 20, 20)):
+        """스크린샷에 폰 프레임(테두리 + 둥근 모서리)을 현재 해상도 그대로 적용 (리샘플 없음)"""
+        padding = max(1, round(screenshot.width * self.FRAME_PADDING_RATIO))
+        frame = Image.new('RGBA',
+                          (screenshot.width + padding * 2, screenshot.height + padding * 2),
+                          (*frame_color, 255))
+        # over 연산 한 번 (스크린샷 자신을 마스크로 paste하면 알파 채널까지 섞여 불투명 바탕에서만 맞음)
+        if screenshot.mode == 'RGBA':
+            frame.alpha_composite(screenshot, (padding, padding))
+        else:
+            frame.paste(screenshot, (padding, padding))
         
-        # 스크린샷을 RGBA로 변환
+        from compositor import rounded_mask
+        frame.putalpha(rounded_mask(frame.size, round(frame.width * self.CORNER_RADIUS_RATIO),
+                                    supersample=self.supersample))
+        return frame
+    
+    def prepare_device(self, screenshot, placement):
+        """배치 하나의 디바이스 준비 (프레임은 스크린샷 해상도에서 입히고 변환만 계산) → DeviceRender"""
         if screenshot.mode != 'RGBA':
             screenshot = screenshot.convert('RGBA')
         
-        # 스크린샷을 프레임에 붙이기
-        frame.paste(screenshot, (frame_padding, frame_padding), screenshot)
-        
-        # 둥근 모서리 적용
-        mask = Image.new('L', frame.size, 0)
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.rounded_rectangle([0, 0, frame.width, frame.height],
-                                    radius=corner_radius, fill=255)
-        
-        # 프레임에 마스크 적용
-        frame.putalpha(mask)
-        
-        # 최종 합성
-        result.paste(frame, (shadow_offset // 2, shadow_offset // 2), frame)
-        
-        return result
+        # 크게 줄일 때는 정수배 박스 축소를 먼저 (affine 변환은 축소 시 앨리어싱이 생김)
+        factor = int(screenshot.width * (1 + 2 * self.FRAME_PADDING_RATIO) / placement.width)
+        if factor >= 2:
+            screenshot = screenshot.reduce(factor)
+        
+        framed = self.frame_device(screenshot)
+        scale = placement.width / framed.width
+        cx, cy = placement.center
+        
+        # 회전/틸트가 없으면 분리형 LANCZOS 리사이즈 (같은 1회 리샘플이지만 더 빠르고 선명)
+        if placement.angle == 0 and not placement.tilt:
+            size = (max(1, round(placement.width)), max(1, round(framed.height * scale)))
+            origin = (round(cx - size[0] / 2), round(cy - size[1] / 2))
+            return DeviceRender(framed, origin, size, placement.width)
+        
+        # 틸트(원근) → 확대/축소 → 회전 → 이동을 행렬 하나로 합쳐 변환 한 번
+        matrix = perspective.placement_transform(
+            framed.size, scale, placement.angle, placement.tilt, placement.center,
+            self.camera_distance
+        )
+        x0, y0, x1, y1 = perspective.bounding_box(matrix, framed.size)
+        # 가장자리 안티앨리어싱용 여유 1px
+        left, top = math.floor(x0) - 1, math.floor(y0) - 1
+        size = (math.ceil(x1) + 1 - left, math.ceil(y1) + 1 - top)
+        return DeviceRender(framed, (left, top), size, placement.width, matrix, bool(placement.tilt))
     
-    def add_perspective_effect(self, img, angle=15, scale=0.95):
-        """3D 원근감 효과 추가"""
-        width, height = img.size
-        
-        # 약간 회전
-        rotated = img.rotate(angle, expand=True, resample=Image.BICUBIC)
+    def render_device(self, screenshot, placement):
+        """배치 하나를 그림 → (디바이스 RGBA 이미지, 캔버스 위 좌상단 좌표)
         
-        # 크기 조정
-        new_width = int(rotated.width * scale)
-        new_height = int(rotated.height * scale)
-        scaled = rotated.resize((new_width, new_height), Image.LANCZOS)
-        
-        return scaled
+        프레임은 스크린샷 해상도에서 입히고, 확대/축소와 회전은 affine 변환 한 번으로 처리
+        """
+        device = self.prepare_device(screenshot, placement)
+        return device.rows(0, device.size[1]), device.origin
+    
+    def device_shadow_blur(self, device_width):
+        """디바이스 그림자 블러 반지름 (shadow_blur를 주지 않았으면 디바이스 너비에 비례)"""
+        if self.shadow_blur is not None:
+            return self.shadow_blur
+        return max(2, round(device_width * self.SHADOW_BLUR_RATIO))
+    
+    def add_device_shadow(self, canvas, device, position, device_width):
+        """변환된 디바이스의 알파로 그림자를 만들어 캔버스에 합성
+        
+        알파 마스크를 줄여 흐린 뒤 되돌리므로(compositor.blurred_mask) 블러 비용이 디바이스 크기에 비례하지 않음
+        """
+        from compositor import blurred_mask
+        offset = round(device_width * self.SHADOW_OFFSET_RATIO)
+        mask, margin = blurred_mask(device.getchannel('A'), self.device_shadow_blur(device_width),
+                                    self.SHADOW_OPACITY)
+        canvas.paste((0, 0, 0), (position[0] - margin + offset, position[1] - margin + offset), mask)
+    
+    def draw_device_band(self, band, device, band_top):
+        """디바이스와 그림자 중 band(캔버스의 band_top 행부터)에 걸친 부분만 그림
+        
+        그림자 블러는 밴드 위아래로 여유 행(halo)을 더 그려 계산하므로 밴드 경계에 이음매가 없다.
+        축소 격자가 디바이스 0행에 맞도록 시작 행을 축소 배율의 배수로 맞춘다 (밴드마다 같은 값).
+        """
+        from compositor import blurred_mask, shadow_margin, shadow_scale
+        blur = self.device_shadow_blur(device.width)
+        scale = shadow_scale(blur)
+        offset = round(device.width * self.SHADOW_OFFSET_RATIO)
+        halo = shadow_margin(blur, scale) + scale
+        left, top = device.origin
+        band_bottom = band_top + band.height
+        
+        # 이 밴드에 필요한 디바이스 행 (그림자는 offset만큼 아래에 있고 halo만큼 더 필요)
+        start = max(0, (band_top - top - offset - halo) // scale * scale)
+        stop = min(device.size[1], max(band_bottom - top, band_bottom - top - offset + halo))
+        if start >= stop:
+            return
+        strip = device.rows(start, stop)
+        
+        # 그림자: 이 행들의 알파만으로 마스크 조각을 만들어 블러 (add_device_shadow와 같은 모양)
+        mask, margin = blurred_mask(strip.getchannel('A'), blur, self.SHADOW_OPACITY, scale)
+        band.paste((0, 0, 0), (left - margin + offset, top + start - margin + offset - band_top), mask)
+        
+        band.paste(strip, (left, top + start - band_top), strip)
+    
+    def render_tiled(self, screenshots, output_path, layout, background_style='gradient',
+                     background_colors=None, text_config=None, layout_options=None,
+                     tile_height=512):
+        """가로 띠(밴드) 단위로 렌더링해 PNG로 바로 스트리밍
+        
+        배경, 디바이스, 그림자, 텍스트를 밴드마다 그려 인코더로 보내므로 최대 메모리는
+        출력 크기가 아니라 밴드 크기(+ 프레임을 입힌 원본 스크린샷)에 비례한다.
+        """
+        from checkpoint import atomic_open
+        from png_stream import PNGStreamWriter
+        
+        size = (self.TARGET_WIDTH, self.TARGET_HEIGHT)
+        position = text_config.get('position') if text_config else None
+        tilt = (layout_options or {}).get('tilt')
+        first = screenshots[0]
+        placements = plan_layout(layout, len(screenshots), size, position,
+                                 first.height / first.width, tilt)
+        devices = [self.prepare_device(screenshots[placement.index], placement)
+                   for placement in placements]
+        has_text = text_config and (text_config.get('title') or text_config.get('subtitle'))
+        
+        with atomic_open(output_path) as f:
+            writer = PNGStreamWriter(f, size, icc_profile=profile_bytes(self.output_profile))
+            for band_top in range(0, size[1], tile_height):
+                rows = (band_top, min(size[1], band_top + tile_height))
+                band = self.get_background(background_style, background_colors, size, rows=rows)
+                for device in devices:
+                    self.draw_device_band(band, device, band_top)
+                if has_text:
+                    self.add_text_overlay(band, text_config, origin=(0, band_top))
+                writer.write(band)
+            writer.close()
+    
+    def create_layout(self, screenshots, background, layout, text_config=None, layout_options=None):
+        """레이아웃 엔진으로 배치를 모두 계산한 뒤 디바이스를 차례로 합성
+        
+        layout_options: {'tilt': 원근 틸트 각도(도)}
+        """
+        position = text_config.get('position') if text_config else None
+        tilt = (layout_options or {}).get('tilt')
+        first = screenshots[0]
+        aspect = first.height / first.width
+        
+        placements = plan_layout(layout, len(screenshots), background.size, position, aspect, tilt)
+        return self.draw_devices(screenshots, background, placements)
+    
+    def draw_devices(self, screenshots, background, placements):
+        """계산된 배치대로 디바이스와 그림자를 캔버스에 합성"""
+        for placement in placements:
+            device, origin = self.render_device(screenshots[placement.index], placement)
+            self.add_device_shadow(background, device, origin, placement.width)
+            background.paste(device, origin, device)
+        return background
     
     def create_single_layout(self, screenshot, background, text_config=None):
         """단일 스크린샷 레이아웃"""
-        # 스크린샷 크기 조정
-        target_width = int(self.TARGET_WIDTH * 0.75)
-        aspect_ratio = screenshot.height / screenshot.width
-        target_height = int(target_width * aspect_ratio)
-        
-        if target_height > self.TARGET_HEIGHT * 0.7:
-            target_height = int(self.TARGET_HEIGHT * 0.7)
-            target_width = int(target_height / aspect_ratio)
-        
-        screenshot_resized = screenshot.resize((target_width, target_height), Image.LANCZOS)
-        
-        # 프레임 추가
-        screenshot_framed = self.add_phone_frame(screenshot_resized)
-        
-        # 중앙 배치
-        x = (self.TARGET_WIDTH - screenshot_framed.width) // 2
-        y = (self.TARGET_HEIGHT - screenshot_framed.height) // 2
-        
-        # 텍스트 위치에 따라 Y 조정
-        if text_config and text_config.get('position') == self.TEXT_TOP:
-            y = int(self.TARGET_HEIGHT * 0.35)
-        elif text_config and text_config.get('position') == self.TEXT_BOTTOM:
-            y = int(self.TARGET_HEIGHT * 0.15)
-        
-        background.paste(screenshot_framed, (x, y), screenshot_framed)
-        
-        return background
+        return self.create_layout([screenshot], background, self.LAYOUT_SINGLE, text_config)
     
     def create_triple_layout(self, screenshots, background, text_config=None):
         """3개 스크린샷 레이아웃 (eBay 스타일)"""
-        if len(screenshots) < 3:
-            screenshots = screenshots * 3  # 부족하면 반복
-        
-        screenshots = screenshots[:3]
-        
-        # 각 스크린샷 크기 조정
-        target_width = int(self.TARGET_WIDTH * 0.28)
-        
-        phone_images = []
-        for i, screenshot in enumerate(screenshots):
-            aspect_ratio = screenshot.height / screenshot.width
-            target_height = int(target_width * aspect_ratio)
-            
-            if target_height > self.TARGET_HEIGHT * 0.65:
-                target_height = int(self.TARGET_HEIGHT * 0.65)
-                target_width_adjusted = int(target_height / aspect_ratio)
-            else:
-                target_width_adjusted = target_width
-            
-            resized = screenshot.resize((target_width_adjusted, target_height), Image.LANCZOS)
-            
-            # 원근감 효과 (중앙은 각도 작게)
-            if i == 0:
-                angle = -12
-            elif i == 1:
-                angle = 0
-            else:
-                angle = 12
-            
-            if angle != 0:
-                resized = self.add_perspective_effect(resized, angle, scale=0.95)
-            
-            framed = self.add_phone_frame(resized)
-            phone_images.append(framed)
-        
-        # 배치
-        spacing = 20
-        total_width = sum(img.width for img in phone_images) + spacing * 2
-        start_x = (self.TARGET_WIDTH - total_width) // 2
-        
-        # 텍스트 공간 고려
-        if text_config and text_config.get('position') == self.TEXT_TOP:
-            start_y = int(self.TARGET_HEIGHT * 0.4)
-        elif text_config and text_config.get('position') == self.TEXT_BOTTOM:
-            start_y = int(self.TARGET_HEIGHT * 0.2)
-        else:
-            start_y = int(self.TARGET_HEIGHT * 0.3)
-        
-        x_offset = start_x
-        for i, img in enumerate(phone_images):
-            # Y 위치 약간씩 다르게 (더 자연스러운 느낌)
-            y_offset = start_y + (i % 2) * 30
-            background.paste(img, (x_offset, y_offset), img)
-            x_offset += img.width + spacing
-        
-        return background
+        return self.create_layout(screenshots, background, self.LAYOUT_TRIPLE, text_config)
     
-    def add_text_overlay(self, image, text_config):
-        """텍스트 오버레이 추가"""
+    def add_text_overlay(self, image, text_config, origin=(0, 0)):
+        """텍스트 오버레이 추가
+        
+        origin: image의 좌상단이 전체 캔버스에서 놓인 위치 (타일 렌더링에서 밴드마다 호출)
+        """
         draw = ImageDraw.Draw(image)
+        origin_x, origin_y = origin
         
         title = text_config.get('title', '')
         subtitle = text_config.get('subtitle', '')
@@ -308,11 +451,11 @@ class AdvancedMarketingGenerator:
                 
                 # 텍스트 그림자
                 shadow_offset = 4
-                draw.text((x + shadow_offset, y_offset + shadow_offset), 
+                draw.text((x + shadow_offset - origin_x, y_offset + shadow_offset - origin_y), 
                          line, font=title_font, fill=(0, 0, 0, 100))
                 
                 # 실제 텍스트
-                draw.text((x, y_offset), line, font=title_font, fill=title_color)
+                draw.text((x - origin_x, y_offset - origin_y), line, font=title_font, fill=title_color)
                 
                 y_offset += bbox[3] - bbox[1] + 20
         
@@ -326,7 +469,7 @@ class AdvancedMarketingGenerator:
                 text_width = bbox[2] - bbox[0]
                 x = (self.TARGET_WIDTH - text_width) // 2
                 
-                draw.text((x, y_offset), line, font=subtitle_font, fill=subtitle_color)
+                draw.text((x - origin_x, y_offset - origin_y), line, font=subtitle_font, fill=subtitle_color)
                 y_offset += bbox[3] - bbox[1] + 15
         
         return image
@@ -354,41 +497,108 @@ class AdvancedMarketingGenerator:
         
         return lines
     
+    def _load_screenshots(self, screenshot_paths):
+        """스크린샷 로드 (이미 디코딩된 이미지는 그대로 사용 — 캠페인 실행 시 입력 공유)
+        
+        내장 ICC 프로파일이 있으면 출력 프로파일로 변환 (이미 변환된 이미지는 그대로)
+        """
+        if isinstance(screenshot_paths, (str, Image.Image)):
+            screenshot_paths = [screenshot_paths]
+        screenshots = [
+            convert_to_profile(path if isinstance(path, Image.Image) else Image.open(path),
+                               self.output_profile)
+            for path in screenshot_paths
+        ]
+        print(f"✅ {len(screenshots)}개 스크린샷 로드 완료")
+        return screenshots
+    
+    def generate_panorama(self, screenshot_paths, output_paths, background_style='gradient',
+                          background_colors=None, text_configs=None, layout_options=None,
+                          workers=None):
+        """여러 장에 걸쳐 이어지는 파노라마 생성
+        
+        화면 수(len(output_paths))만큼 넓은 캔버스에 배경과 디바이스를 한 번만 그리고,
+        타겟 크기로 잘라 화면별 텍스트를 얹은 뒤 병렬로 인코딩/저장한다.
+        text_configs: 화면별 텍스트 설정 목록 (없거나 짧으면 해당 화면은 텍스트 없음)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        try:
+            screens = len(output_paths)
+            slice_size = (self.TARGET_WIDTH, self.TARGET_HEIGHT)
+            text_configs = list(text_configs or [])
+            text_configs += [None] * (screens - len(text_configs))
+            
+            screenshots = self._load_screenshots(screenshot_paths)
+            background_style, background_colors = self.resolve_background(
+                background_style, background_colors, screenshots)
+            
+            # 화면 전체에 이어지는 가로 그라디언트
+            canvas = self.get_background(
+                background_style, background_colors,
+                size=(self.TARGET_WIDTH * screens, self.TARGET_HEIGHT), direction='horizontal'
+            )
+            
+            # 텍스트 위치는 첫 번째 텍스트 설정 기준으로 모든 화면이 같은 높이에 디바이스 배치
+            position = next((config.get('position') for config in text_configs if config), None)
+            first = screenshots[0]
+            placements = plan_panorama(len(screenshots), screens, slice_size, position,
+                                       first.height / first.width,
+                                       (layout_options or {}).get('tilt'))
+            self.draw_devices(screenshots, canvas, placements)
+            
+            def finish(index):
+                left = index * self.TARGET_WIDTH
+                screen = canvas.crop((left, 0, left + self.TARGET_WIDTH, self.TARGET_HEIGHT))
+                config = text_configs[index]
+                if config and (config.get('title') or config.get('subtitle')):
+                    screen = self.add_text_overlay(screen, config)
+                atomic_save(screen.convert('RGB'), output_paths[index], 'PNG', quality=95,
+                            icc_profile=profile_bytes(self.output_profile))
+                return output_paths[index]
+            
+            # 자르기/텍스트/PNG 인코딩은 화면별로 독립이므로 병렬 처리 (인코딩 중에는 GIL 해제)
+            workers = workers or min(screens, os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for output_path in executor.map(finish, range(screens)):
+                    print(f"✅ 파노라마 화면 저장: {output_path}")
+            
+            return True
+            
+        except Exception as e:
+            print(f"❌ 오류 발생: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+    
     def generate_marketing_image(self, screenshot_paths, output_path, 
                                  layout='single', background_style='gradient',
-                                 background_colors=None, text_config=None):
-        """마케팅 이미지 생성 메인 함수"""
+                                 background_colors=None, text_config=None,
+                                 layout_options=None, tile_height=None):
+        """마케팅 이미지 생성 메인 함수
+        
+        layout_options: 레이아웃 세부 설정 (예: {'tilt': 20} → 디바이스를 원근감 있게 틸트)
+        tile_height: 주면 그 높이의 가로 띠 단위로 렌더링해 바로 저장 (큰 출력, 메모리 제한 워커)
+        """
         try:
-            # 스크린샷 로드
-            screenshots = []
-            if isinstance(screenshot_paths, str):
-                screenshot_paths = [screenshot_paths]
+            screenshots = self._load_screenshots(screenshot_paths)
+            background_style, background_colors = self.resolve_background(
+                background_style, background_colors, screenshots)
             
-            for path in screenshot_paths:
-                img = Image.open(path)
-                screenshots.append(img)
-            
-            print(f"✅ {len(screenshots)}개 스크린샷 로드 완료")
+            if layout not in LAYOUTS:
+                layout = self.LAYOUT_SINGLE
+            if tile_height:
+                self.render_tiled(screenshots, output_path, layout, background_style,
+                                  background_colors, text_config, layout_options, tile_height)
+                print(f"✅ 마케팅 이미지 생성 완료 (타일 {tile_height}px): {output_path}")
+                print(f"   크기: {(self.TARGET_WIDTH, self.TARGET_HEIGHT)}")
+                return True
             
             # 배경 생성
-            if background_style == 'gradient':
-                if background_colors is None:
-                    background_colors = [(74, 144, 226), (155, 89, 182)]
-                background = self.create_gradient_background(
-                    self.TARGET_WIDTH, self.TARGET_HEIGHT, 
-                    background_colors, 'vertical'
-                )
-            elif background_style == 'solid':
-                color = background_colors[0] if background_colors else (255, 255, 255)
-                background = Image.new('RGB', (self.TARGET_WIDTH, self.TARGET_HEIGHT), color)
-            else:
-                background = Image.new('RGB', (self.TARGET_WIDTH, self.TARGET_HEIGHT), (255, 255, 255))
+            background = self.get_background(background_style, background_colors)
             
-            # 레이아웃 적용
-            if layout == self.LAYOUT_TRIPLE and len(screenshots) >= 1:
-                result = self.create_triple_layout(screenshots, background, text_config)
-            else:
-                result = self.create_single_layout(screenshots[0], background, text_config)
+            # 레이아웃 적용 (알 수 없는 레이아웃은 단일 배치)
+            result = self.create_layout(screenshots, background, layout, text_config, layout_options)
             
             # 텍스트 오버레이
             if text_config and (text_config.get('title') or text_config.get('subtitle')):
@@ -396,7 +606,8 @@ class AdvancedMarketingGenerator:
             
             # 저장
             result = result.convert('RGB')
-            result.save(output_path, 'PNG', quality=95)
+            atomic_save(result, output_path, 'PNG', quality=95,
+                        icc_profile=profile_bytes(self.output_profile))
             
             print(f"✅ 마케팅 이미지 생성 완료: {output_path}")
             print(f"   크기: {result.size}")
@@ -410,7 +621,20 @@ class AdvancedMarketingGenerator:
             return False
 
 
-def main():
+def blur_radius(value):
+    """--shadow-blur 인자 검증 (0 이상의 정수, 0이면 흐리지 않음)"""
+    import argparse
+    try:
+        radius = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"정수가 아닙니다: {value!r}")
+    if radius < 0:
+        raise argparse.ArgumentTypeError(f"0 이상이어야 합니다: {radius}")
+    return radius
+
+
+def build_parser():
+    """명령줄 인자 파서 (렌더 데몬 클라이언트와 공유)"""
     import argparse
     
     parser = argparse.ArgumentParser(
@@ -426,18 +650,56 @@ def main():
   python generator_advanced.py screen1.png screen2.png screen3.png \\
     -o output.png --layout triple --title "Treat yourself"
   
+  # 5개 스크린샷 부채꼴 배치
+  python generator_advanced.py s1.png s2.png s3.png s4.png s5.png \\
+    -o output.png --layout fan --title "All your lists"
+  
+  # 원근감 배치 (가운데를 바라보도록 틸트)
+  python generator_advanced.py s1.png s2.png s3.png -o output.png --layout perspective --tilt 20
+  
+  # 파노라마 (5장에 걸쳐 이어지는 배경/디바이스, -o는 출력 폴더)
+  python generator_advanced.py s1.png s2.png s3.png s4.png -o shots/ --panorama 5 \\
+    --screen-titles "Plan" "Track" "Share" "Sync" "Relax"
+  
+  # 2x 마스터 (5592px 높이)를 512px 띠 단위로 렌더링 (메모리는 띠 크기에 비례)
+  python generator_advanced.py s1.png s2.png s3.png -o master.png --layout triple \\
+    --size 2580x5592 --tile-height 512
+  
   # 커스텀 그라디언트
   python generator_advanced.py screenshot.png -o output.png \\
     --gradient-colors "74,144,226" "155,89,182" --title "Free shipping"
+  
+  # 스크린샷의 대표 색으로 그라디언트
+  python generator_advanced.py screenshot.png -o output.png --background auto
         '''
     )
     
     parser.add_argument('screenshots', nargs='+', help='스크린샷 파일(들)')
-    parser.add_argument('-o', '--output', required=True, help='출력 파일')
-    parser.add_argument('--layout', choices=['single', 'triple'], 
-                       default='single', help='레이아웃 타입')
-    parser.add_argument('--background', choices=['gradient', 'solid', 'white'],
-                       default='gradient', help='배경 스타일')
+    parser.add_argument('-o', '--output', required=True, help='출력 파일 (--panorama는 출력 폴더)')
+    parser.add_argument('--layout', choices=LAYOUTS, 
+                       default='single',
+                       help='레이아웃 타입 (fan/grid/staggered는 스크린샷 수만큼 배치)')
+    parser.add_argument('--tilt', type=float,
+                       help='디바이스 원근 틸트 각도 (도). perspective 레이아웃 기본값 25')
+    parser.add_argument('--size', metavar='SIZE',
+                       help="출력 크기: 디바이스 프리셋(예: 6.7) 또는 WxH (예: 2580x5592). 기본값 1290x2796")
+    parser.add_argument('--tile-height', type=int, metavar='PX',
+                       help='PX 높이의 가로 띠 단위로 렌더링해 바로 저장 (큰 출력에서 메모리 절약)')
+    parser.add_argument('--supersample', type=supersample_factor, default=1, metavar='K',
+                       help='디바이스 둥근 모서리를 K배로 그려 부드럽게 (예: 4, 기본값 1 = 끔)')
+    parser.add_argument('--shadow-blur', type=blur_radius, metavar='PX',
+                       help='디바이스 그림자 블러 반지름 (px, 기본값 디바이스 너비의 3%%)')
+    parser.add_argument('--output-profile', default=SRGB, metavar='PROFILE',
+                       help="출력 색 프로파일: srgb, .icc 파일 경로, none (기본값 srgb, PNG에 포함)")
+    parser.add_argument('--panorama', type=int, metavar='N',
+                       help='N장에 걸쳐 이어지는 파노라마로 생성 (panorama_01.png ...)')
+    parser.add_argument('--screen-titles', nargs='+', metavar='TITLE',
+                       help='파노라마 화면별 제목 (없으면 --title을 첫 화면에만 사용)')
+    parser.add_argument('--screen-subtitles', nargs='+', metavar='SUBTITLE',
+                       help='파노라마 화면별 부제목')
+    parser.add_argument('--background', choices=['gradient', 'solid', 'white', 'auto'],
+                       default='gradient',
+                       help='배경 스타일 (auto: 스크린샷의 대표 색으로 그라디언트)')
     parser.add_argument('--gradient-colors', nargs=2, metavar=('COLOR1', 'COLOR2'),
                        help='그라디언트 색상 (R,G,B 형식)')
     parser.add_argument('--title', help='제목 텍스트')
@@ -449,9 +711,11 @@ def main():
                        default='helvetica', help='폰트')
     parser.add_argument('--title-color', help='제목 색상 (R,G,B)')
     parser.add_argument('--title-size', type=int, default=90, help='제목 크기')
-    
-    args = parser.parse_args()
-    
+    return parser
+
+
+def run(args, generator=None):
+    """파싱된 인자로 생성 실행 (성공하면 True)"""
     # 색상 파싱
     gradient_colors = None
     if args.gradient_colors:
@@ -465,28 +729,86 @@ def main():
         title_color = tuple(map(int, args.title_color.split(',')))
     
     # 텍스트 설정
+    text_style = {
+        'position': args.text_position,
+        'font': args.font,
+        'title_color': title_color,
+        'title_size': args.title_size,
+    }
     text_config = None
     if args.title or args.subtitle:
-        text_config = {
-            'title': args.title,
-            'subtitle': args.subtitle,
-            'position': args.text_position,
-            'font': args.font,
-            'title_color': title_color,
-            'title_size': args.title_size,
-        }
+        text_config = dict(text_style, title=args.title, subtitle=args.subtitle)
     
     # 생성
-    generator = AdvancedMarketingGenerator()
-    generator.generate_marketing_image(
+    if getattr(args, 'size', None):
+        from campaign import parse_size
+        _, target_size = parse_size(args.size)
+        fonts_cache = generator.fonts_cache if generator is not None else None
+        generator = AdvancedMarketingGenerator(target_size, fonts_cache)
+    elif generator is None:
+        generator = AdvancedMarketingGenerator()
+    # 공유 생성기(렌더 데몬)의 설정은 바꾸지 않고 이 요청용 복사본에 적용
+    generator = generator.with_options(
+        supersample=getattr(args, 'supersample', 1),
+        output_profile=parse_output_profile(getattr(args, 'output_profile', SRGB)),
+        shadow_blur=getattr(args, 'shadow_blur', None),
+    )
+    layout_options = None
+    if args.tilt is not None:
+        layout_options = {'tilt': args.tilt}
+    
+    if getattr(args, 'panorama', None):
+        return run_panorama(args, generator, gradient_colors, text_style, text_config, layout_options)
+    
+    return generator.generate_marketing_image(
         args.screenshots,
         args.output,
         layout=args.layout,
         background_style=args.background,
         background_colors=gradient_colors,
-        text_config=text_config
+        text_config=text_config,
+        layout_options=layout_options,
+        tile_height=getattr(args, 'tile_height', None)
+    )
+
+
+def run_panorama(args, generator, gradient_colors, text_style, text_config, layout_options):
+    """--panorama: 화면별 텍스트 설정을 만들어 파노라마 생성"""
+    screens = args.panorama
+    if screens < 1:
+        print("❌ --panorama는 1 이상이어야 합니다")
+        return False
+    
+    titles = list(args.screen_titles or [])
+    subtitles = list(args.screen_subtitles or [])
+    text_configs = []
+    for i in range(screens):
+        title = titles[i] if i < len(titles) else None
+        subtitle = subtitles[i] if i < len(subtitles) else None
+        if title or subtitle:
+            text_configs.append(dict(text_style, title=title, subtitle=subtitle))
+        else:
+            # 화면별 텍스트가 없으면 공통 텍스트는 첫 화면에만
+            text_configs.append(text_config if i == 0 and not (titles or subtitles) else None)
+    
+    os.makedirs(args.output, exist_ok=True)
+    output_paths = [
+        os.path.join(args.output, f"panorama_{i + 1:02d}.png") for i in range(screens)
+    ]
+    return generator.generate_panorama(
+        args.screenshots,
+        output_paths,
+        background_style=args.background,
+        background_colors=gradient_colors,
+        text_configs=text_configs,
+        layout_options=layout_options
     )
 
 
+def main():
+    args = build_parser().parse_args()
+    run(args)
+
+
 if __name__ == '__main__':
     main()
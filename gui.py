@@ -8,6 +8,8 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
 from generator import MarketingImageGenerator
+from discovery import find_images
+from probe import check_selection
 
 class MarketingImageGUI:
     def __init__(self, root):
@@ -119,7 +121,15 @@ class MarketingImageGUI:
             ]
         )
         if files:
-            self.input_files = list(files)
+            self.set_input_files(list(files))
+    
+    def set_input_files(self, files):
+        """헤더를 검사해 읽을 수 없는 파일은 빼고 선택"""
+        files, notice = check_selection(files)
+        if notice:
+            messagebox.showwarning("입력 확인", notice)
+        if files:
+            self.input_files = files
             self.file_label.config(
                 text=f"{len(files)}개 파일 선택됨",
                 fg="green"
@@ -128,18 +138,9 @@ class MarketingImageGUI:
     def select_folder(self):
         folder = filedialog.askdirectory(title="스크린샷 폴더 선택")
         if folder:
-            supported_formats = ('.png', '.jpg', '.jpeg')
-            files = [
-                os.path.join(folder, f) 
-                for f in os.listdir(folder) 
-                if f.lower().endswith(supported_formats)
-            ]
+            files = find_images(folder)
             if files:
-                self.input_files = files
-                self.file_label.config(
-                    text=f"{len(files)}개 파일 선택됨",
-                    fg="green"
-                )
+                self.set_input_files(files)
             else:
                 messagebox.showwarning("경고", "이미지 파일을 찾을 수 없습니다.")
     
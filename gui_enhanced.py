@@ -6,10 +6,18 @@ iOS Marketing Image Generator - Enhanced GUI Version
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, colorchooser
-from tkinterdnd2 import DND_FILES, TkinterDnD
+try:
+    from tkinterdnd2 import DND_FILES, TkinterDnD
+    HAS_DND = True
+except:
+    HAS_DND = False
 import os
 from PIL import Image, ImageTk
 from generator import MarketingImageGenerator
+from discovery import find_images, is_supported
+from probe import check_selection
+from compositor import Compositor, rounded_mask
+from palette import gradient_colors
 
 class EnhancedMarketingImageGUI:
     def __init__(self, root):
@@ -35,12 +43,15 @@ class EnhancedMarketingImageGUI:
         self.output_width = 1290
         self.output_height = 2796
 
-        # iPhone 17 프레임 오버레이
+        # iPhone 17 프레임 오버레이 (출력 크기에 맞춘 리사이즈 결과는 캐시)
         self.iphone_frame = None
         self.iphone_frame_path = None
+        self._frame_overlay = None
+        self._frame_overlay_key = None
 
         self.setup_ui()
-        self.setup_drag_drop()
+        if HAS_DND:
+            self.setup_drag_drop()
     
     def setup_ui(self):
         # 메인 컨테이너
@@ -164,7 +175,7 @@ class EnhancedMarketingImageGUI:
         background_combo = ttk.Combobox(
             bg_frame,
             textvariable=self.background_var,
-            values=["image", "white", "black", "gradient_blue", "app_store_gray", "custom"],
+            values=["image", "white", "black", "gradient_blue", "app_store_gray", "auto", "custom"],
             state="readonly",
             width=14
         )
@@ -250,6 +261,13 @@ class EnhancedMarketingImageGUI:
             variable=self.rounded_var
         ).pack(anchor="w", pady=2)
 
+        self.smooth_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            effect_frame,
+            text="모서리 부드럽게 (4x)",
+            variable=self.smooth_var
+        ).pack(anchor="w", pady=2)
+
         self.border_var = tk.BooleanVar(value=False)
         tk.Checkbutton(
             effect_frame,
@@ -443,18 +461,19 @@ class EnhancedMarketingImageGUI:
     def drop_files(self, event):
         """드래그 앤 드롭된 파일 처리"""
         files = self.root.tk.splitlist(event.data)
-        supported_formats = ('.png', '.jpg', '.jpeg')
         
         valid_files = []
         for file_path in files:
-            if os.path.isfile(file_path) and file_path.lower().endswith(supported_formats):
+            if os.path.isfile(file_path) and is_supported(file_path):
                 valid_files.append(file_path)
             elif os.path.isdir(file_path):
                 # 폴더인 경우 내부 이미지 파일 가져오기
-                for f in os.listdir(file_path):
-                    full_path = os.path.join(file_path, f)
-                    if f.lower().endswith(supported_formats):
-                        valid_files.append(full_path)
+                valid_files.extend(find_images(file_path))
+        
+        # 헤더 검사: 읽을 수 없는 파일은 빼고, 비율이 다른 파일은 알림
+        valid_files, notice = check_selection(valid_files)
+        if notice:
+            messagebox.showwarning("입력 확인", notice)
         
         if valid_files:
             self.input_files = valid_files
@@ -464,7 +483,7 @@ class EnhancedMarketingImageGUI:
             )
             # 배경 이미지를 유지하기 위해 show_preview 제거
             # 사용자가 미리보기 버튼을 눌러야 미리보기 업데이트
-        else:
+        elif not notice:
             messagebox.showwarning("경고", "유효한 이미지 파일이 없습니다.")
     
     def select_files(self):
@@ -477,9 +496,14 @@ class EnhancedMarketingImageGUI:
             ]
         )
         if files:
-            self.input_files = list(files)
             # 선택한 파일의 디렉토리를 저장
             self.last_input_dir = os.path.dirname(files[0])
+            files, notice = check_selection(list(files))
+            if notice:
+                messagebox.showwarning("입력 확인", notice)
+            if not files:
+                return
+            self.input_files = files
             self.file_label.config(
                 text=f"✓ {len(files)}개 파일 선택됨",
                 fg="#34C759"
@@ -495,13 +519,13 @@ class EnhancedMarketingImageGUI:
         if folder:
             # 선택한 폴더를 저장
             self.last_input_dir = folder
-            supported_formats = ('.png', '.jpg', '.jpeg')
-            files = [
-                os.path.join(folder, f)
-                for f in os.listdir(folder)
-                if f.lower().endswith(supported_formats)
-            ]
+            files = find_images(folder)
             if files:
+                files, notice = check_selection(files)
+                if notice:
+                    messagebox.showwarning("입력 확인", notice)
+                if not files:
+                    return
                 self.input_files = files
                 self.file_label.config(
                     text=f"✓ {len(files)}개 파일 선택됨",
@@ -810,20 +834,34 @@ class EnhancedMarketingImageGUI:
                 image=""
             )
 
-    def create_background(self, background_style):
-        """배경 생성 헬퍼 함수 - 항상 배경 레이어"""
+    def create_background(self, background_style, mode='RGB', screenshot=None):
+        """배경 생성 헬퍼 함수 - 항상 배경 레이어 (mode: 단색/이미지 배경 캔버스의 모드)
+
+        screenshot: 'auto' 스타일에서 그라디언트 색을 뽑을 스크린샷
+        """
         # 출력 사이즈 업데이트
         self.update_output_size()
 
         if background_style == 'gradient_blue':
-            return self.generator.create_gradient_background(
+            # 생성기 캐시에서 복사 (매번 그라디언트를 새로 그리지 않음)
+            return self.generator.get_background(
+                background_style,
                 self.output_width,
                 self.output_height
             )
+        elif background_style == 'auto' and screenshot is not None:
+            # 스크린샷 대표 색 그라디언트 (팔레트는 썸네일에서 뽑아 캐시)
+            # 생성기의 LRU 캐시를 거치므로 같은 스크린샷을 다시 미리보기하면 그라디언트를 새로 그리지 않음
+            return self.generator.get_background(
+                background_style,
+                self.output_width,
+                self.output_height,
+                gradient_colors(screenshot)
+            )
         elif background_style == 'image':
             if not self.background_image:
                 messagebox.showwarning("경고", "배경 이미지를 먼저 선택해주세요!")
-                return Image.new('RGB', (self.output_width, self.output_height), (255, 255, 255))
+                return Image.new(mode, (self.output_width, self.output_height), (255, 255, 255))
 
             # 배경 이미지를 스케일 적용하여 리사이즈 (원본 비율 유지)
             bg_img = self.background_image.copy()
@@ -842,7 +880,7 @@ class EnhancedMarketingImageGUI:
             )
 
             # 타겟 크기의 캔버스 생성 (배경)
-            canvas = Image.new('RGB', (self.output_width, self.output_height), (0, 0, 0))
+            canvas = Image.new(mode, (self.output_width, self.output_height), (0, 0, 0))
 
             # 배경 이미지가 캔버스보다 크면 중앙 기준으로 크롭
             if bg_img.width > self.output_width or bg_img.height > self.output_height:
@@ -868,62 +906,33 @@ class EnhancedMarketingImageGUI:
                 y = (self.output_height - bg_img.height) // 2
 
             canvas.paste(bg_img, (x, y))
-            return canvas.convert('RGB')
+            return canvas
         else:
             bg_color = self.generator.BACKGROUND_COLORS.get(background_style, (255, 255, 255))
             if background_style == "custom":
                 bg_color = self.custom_color
-            return Image.new('RGB', (self.output_width, self.output_height), bg_color)
-
-    def add_rounded_corners(self, img, radius=60):
-        """이미지에 둥근 모서리 추가 (iPhone 스타일)"""
-        from PIL import ImageDraw
-
-        # RGBA 모드로 변환
-        if img.mode != 'RGBA':
-            img = img.convert('RGBA')
-
-        # 둥근 모서리 마스크 생성
-        mask = Image.new('L', img.size, 0)
-        draw = ImageDraw.Draw(mask)
-
-        # 둥근 사각형 그리기
-        draw.rounded_rectangle(
-            [(0, 0), img.size],
-            radius=radius,
-            fill=255
-        )
-
-        # 결과 이미지 생성
-        result = Image.new('RGBA', img.size, (0, 0, 0, 0))
-        result.paste(img, (0, 0))
-        result.putalpha(mask)
-
-        return result
-
-    def add_border_to_image(self, img, border_width=5, border_color=(200, 200, 200)):
-        """이미지에 테두리 추가"""
-        from PIL import ImageDraw
-
-        img_with_border = img.copy()
-        draw = ImageDraw.Draw(img_with_border)
-
-        # 테두리 그리기
-        draw.rectangle(
-            [0, 0, img.width - 1, img.height - 1],
+            return Image.new(mode, (self.output_width, self.output_height), bg_color)
+
+    def add_rounded_corners(self, img, radius=60, supersample=1):
+        """이미지에 둥근 모서리 추가 (iPhone 스타일, 알파 채널만 제자리에서 교체)"""
+        img.putalpha(rounded_mask(img.size, radius, supersample=supersample))
+        return img
+
+    def draw_border(self, compositor, border_width=5, border_color=(200, 200, 200)):
+        """작업 버퍼에 테두리 그리기"""
+        width, height = compositor.size
+        compositor.draw.rectangle(
+            [0, 0, width - 1, height - 1],
             outline=border_color,
             width=border_width
         )
 
-        return img_with_border
-
-    def add_text_to_image(self, img, text, position="bottom", font_size=60):
-        """이미지에 텍스트 추가"""
-        from PIL import ImageDraw, ImageFont
+    def draw_text(self, compositor, text, position="bottom", font_size=60):
+        """작업 버퍼에 텍스트 그리기"""
+        from PIL import ImageFont
 
-        # 이미지 복사
-        img_with_text = img.copy()
-        draw = ImageDraw.Draw(img_with_text)
+        img_with_text = compositor.canvas
+        draw = compositor.draw
 
         # 폰트 설정 시도 (San Francisco 우선)
         try:
@@ -988,9 +997,9 @@ class EnhancedMarketingImageGUI:
         else:  # bottom
             start_y = img_with_text.height - total_height - 150
 
-        # 각 줄 그리기
+        # 각 줄 그리기 (버퍼에 직접 덮어쓰므로 그림자도 불투명 검정)
         text_color = self.text_color + (255,)  # RGBA 변환
-        shadow_color = (0, 0, 0, 128)
+        shadow_color = (0, 0, 0, 255)
         shadow_offset = 3
 
         for i, line in enumerate(lines):
@@ -1006,7 +1015,99 @@ class EnhancedMarketingImageGUI:
             # 텍스트 그리기 (선택된 색상)
             draw.text((x, y), line, font=font, fill=text_color)
 
-        return img_with_text
+    def get_frame_overlay(self):
+        """출력 크기의 90%로 맞춘 iPhone 프레임 (프레임/출력 크기가 바뀔 때만 다시 리사이즈)"""
+        size = (int(self.output_width * 0.9), int(self.output_height * 0.9))
+        key = (self.iphone_frame_path, size)
+        if self._frame_overlay_key != key:
+            frame = self.iphone_frame.resize(size, Image.Resampling.LANCZOS)
+            if frame.mode != 'RGBA':
+                frame = frame.convert('RGBA')
+            self._frame_overlay = frame
+            self._frame_overlay_key = key
+        return self._frame_overlay
+
+    def compose_marketing_image(self, screenshot, background_style, add_frame):
+        """배경 → 스크린샷 → 텍스트 → iPhone 프레임 → 테두리 순으로 작업 버퍼 하나에 합성해 최종 RGB 이미지 반환
+
+        이미지당 버퍼 할당 수의 상한은 tests/test_gui_enhanced.py에서 확인
+        """
+        # 모서리 부드럽게: 마스크의 모서리만 4배로 그려 줄임
+        supersample = 4 if self.smooth_var.get() else 1
+
+        # 1단계: 배경 레이어 (항상 맨 아래) — 이 버퍼가 끝까지 작업 버퍼
+        compositor = Compositor(self.create_background(background_style, mode='RGBA', screenshot=screenshot))
+
+        # 2단계: 메인 스크린샷 크기 조정 (배경 위에 올림)
+        # iPhone 17 프레임이 있으면 프레임 크기(90%)에 맞춤, 없으면 80%
+        if self.iphone_frame:
+            # 프레임 크기(90%)보다 약간 작게 (85%)
+            max_width_ratio = 0.85
+            max_height_ratio = 0.85
+        else:
+            max_width_ratio = 0.8
+            max_height_ratio = 0.85
+
+        target_screenshot_width = int(self.output_width * max_width_ratio)
+        aspect_ratio = screenshot.height / screenshot.width
+        target_screenshot_height = int(target_screenshot_width * aspect_ratio)
+
+        if target_screenshot_height > self.output_height * max_height_ratio:
+            target_screenshot_height = int(self.output_height * max_height_ratio)
+            target_screenshot_width = int(target_screenshot_height / aspect_ratio)
+
+        screenshot_resized = screenshot.resize(
+            (target_screenshot_width, target_screenshot_height),
+            Image.Resampling.LANCZOS
+        )
+        if screenshot_resized.mode != 'RGBA':
+            screenshot_resized = screenshot_resized.convert('RGBA')
+
+        # iPhone 17 프레임이 있으면 둥근 모서리 추가
+        if self.iphone_frame:
+            # 둥근 모서리 반지름 (이미지 크기에 비례) - 15%
+            corner_radius = int(min(screenshot_resized.width, screenshot_resized.height) * 0.15)
+            self.add_rounded_corners(screenshot_resized, radius=corner_radius, supersample=supersample)
+
+        # 3단계: 메인 스크린샷을 배경 위에 합성 (중앙 배치 + 14% 아래로)
+        # 그림자 효과는 add_device_frame과 같은 모양을 레이어 없이 바로 합성
+        margin = self.generator.FRAME_SHADOW_OFFSET if add_frame else 0
+        x = (self.output_width - screenshot_resized.width - margin * 2) // 2
+        y = (self.output_height - screenshot_resized.height - margin * 2) // 2
+        y = int(y * 0.8)
+        # 14% 아래로 이동 (16% - 2%)
+        y = y + int(self.output_height * 0.14)
+        x, y = x + margin, y + margin
+
+        if add_frame:
+            *shadow_color, shadow_alpha = self.generator.FRAME_SHADOW_COLOR
+            width, height = screenshot_resized.size
+            shadow_mask = rounded_mask(
+                (width + 1, height + 1), self.generator.FRAME_SHADOW_RADIUS, shadow_alpha,
+                ((0, 0), (width, height)), supersample
+            )
+            compositor.fill(tuple(shadow_color), (x, y), shadow_mask)
+        compositor.over(screenshot_resized, (x, y))
+
+        # 4단계: 텍스트 추가
+        if self.text_var.get() and self.text_entry.get().strip():
+            text = self.text_entry.get().strip()
+            position = self.text_position_var.get()
+            font_size = self.text_size_var.get()
+            self.draw_text(compositor, text, position, font_size)
+
+        # 5단계: iPhone 17 프레임 오버레이 (최상위 레이어, 중앙 배치 + 13% 아래로)
+        if self.iphone_frame:
+            frame = self.get_frame_overlay()
+            x_offset = (self.output_width - frame.width) // 2
+            y_offset = (self.output_height - frame.height) // 2 + int(self.output_height * 0.13)
+            compositor.over(frame, (x_offset, y_offset))
+
+        # 테두리 추가
+        if self.border_var.get():
+            self.draw_border(compositor, border_width=5, border_color=(150, 150, 150))
+
+        return compositor.result()
 
     def preview_marketing_image(self):
         """생성 전 마케팅 이미지 미리보기"""
@@ -1023,101 +1124,10 @@ class EnhancedMarketingImageGUI:
 
             # 첫 번째 이미지로 미리보기 생성 (메인 이미지)
             screenshot = Image.open(self.input_files[0])
-
-            # 1단계: 배경 레이어 생성 (항상 맨 아래)
-            background_style = self.background_var.get()
-            background = self.create_background(background_style)
-
-            # 2단계: 메인 스크린샷 크기 조정 (배경 위에 올림)
-            # iPhone 17 프레임이 있으면 프레임 크기(90%)에 맞춤, 없으면 80%
-            if self.iphone_frame:
-                # 프레임 크기(90%)보다 약간 작게 (85%)
-                max_width_ratio = 0.85
-                max_height_ratio = 0.85
-            else:
-                max_width_ratio = 0.8
-                max_height_ratio = 0.85
-
-            target_screenshot_width = int(self.output_width * max_width_ratio)
-            aspect_ratio = screenshot.height / screenshot.width
-            target_screenshot_height = int(target_screenshot_width * aspect_ratio)
-
-            if target_screenshot_height > self.output_height * max_height_ratio:
-                target_screenshot_height = int(self.output_height * max_height_ratio)
-                target_screenshot_width = int(target_screenshot_height / aspect_ratio)
-
-            screenshot_resized = screenshot.resize(
-                (target_screenshot_width, target_screenshot_height),
-                Image.Resampling.LANCZOS
+            final_image = self.compose_marketing_image(
+                screenshot, self.background_var.get(), self.frame_var.get()
             )
 
-            # iPhone 17 프레임이 있으면 둥근 모서리 추가
-            if self.iphone_frame:
-                # 둥근 모서리 반지름 (이미지 크기에 비례) - 15%
-                corner_radius = int(min(screenshot_resized.width, screenshot_resized.height) * 0.15)
-                screenshot_resized = self.add_rounded_corners(screenshot_resized, radius=corner_radius)
-
-            # 프레임 추가
-            if self.frame_var.get():
-                screenshot_with_frame = self.generator.add_device_frame(screenshot_resized)
-            else:
-                screenshot_with_frame = screenshot_resized
-                if screenshot_with_frame.mode != 'RGBA':
-                    screenshot_with_frame = screenshot_with_frame.convert('RGBA')
-
-            # 3단계: 메인 스크린샷을 배경 위에 합성 (중앙 배치 + 14% 아래로)
-            x = (self.output_width - screenshot_with_frame.width) // 2
-            y = (self.output_height - screenshot_with_frame.height) // 2
-            y = int(y * 0.8)
-            # 14% 아래로 이동 (16% - 2%)
-            y = y + int(self.output_height * 0.14)
-
-            print(f"[미리보기] 배경 크기: {background.size}, 모드: {background.mode}")
-            print(f"[미리보기] 메인 이미지 크기: {screenshot_with_frame.size}, 모드: {screenshot_with_frame.mode}")
-            print(f"[미리보기] 메인 이미지 위치: ({x}, {y})")
-
-            # 배경(하위 레이어) + 메인 스크린샷(상위 레이어) 합성
-            # RGBA 이미지를 마스크로 사용하여 투명도 적용
-            background.paste(screenshot_with_frame, (x, y), screenshot_with_frame)
-
-            # 4단계: 텍스트 추가 (최상위 레이어)
-            if self.text_var.get() and self.text_entry.get().strip():
-                text = self.text_entry.get().strip()
-                position = self.text_position_var.get()
-                font_size = self.text_size_var.get()
-                background = self.add_text_to_image(background, text, position, font_size)
-
-            # RGB 변환
-            final_image = background.convert('RGB')
-
-            # 5단계: iPhone 17 프레임 오버레이 (최최상위 레이어)
-            if self.iphone_frame:
-                # 프레임을 출력 사이즈의 90%로 리사이즈
-                frame_resized = self.iphone_frame.copy()
-                frame_width = int(self.output_width * 0.9)
-                frame_height = int(self.output_height * 0.9)
-                frame_resized = frame_resized.resize(
-                    (frame_width, frame_height),
-                    Image.Resampling.LANCZOS
-                )
-                # RGBA로 변환
-                if frame_resized.mode != 'RGBA':
-                    frame_resized = frame_resized.convert('RGBA')
-
-                # 중앙에 배치 + 13% 아래로 이동
-                x_offset = (self.output_width - frame_width) // 2
-                y_offset = (self.output_height - frame_height) // 2
-                y_offset = y_offset + int(self.output_height * 0.13)
-
-                # 최종 이미지를 RGBA로 변환하여 프레임 합성
-                final_image_rgba = final_image.convert('RGBA')
-                final_image_rgba.paste(frame_resized, (x_offset, y_offset), frame_resized)
-                final_image = final_image_rgba.convert('RGB')
-
-            # 테두리 추가
-            if self.border_var.get():
-                final_image = self.add_border_to_image(final_image, border_width=5, border_color=(150, 150, 150))
-
             # 미리보기 표시
             preview_img = final_image.copy()
             max_size = (400, 600)
@@ -1179,94 +1189,7 @@ class EnhancedMarketingImageGUI:
 
                 # 메인 스크린샷 열기
                 screenshot = Image.open(input_file)
-
-                # 1단계: 배경 레이어 생성 (항상 맨 아래)
-                img_background = self.create_background(background)
-
-                # 2단계: 메인 스크린샷 크기 조정 (배경 위에 올림)
-                # iPhone 17 프레임이 있으면 프레임 크기(90%)에 맞춤, 없으면 80%
-                if self.iphone_frame:
-                    # 프레임 크기(90%)보다 약간 작게 (85%)
-                    max_width_ratio = 0.85
-                    max_height_ratio = 0.85
-                else:
-                    max_width_ratio = 0.8
-                    max_height_ratio = 0.85
-
-                target_screenshot_width = int(self.output_width * max_width_ratio)
-                aspect_ratio = screenshot.height / screenshot.width
-                target_screenshot_height = int(target_screenshot_width * aspect_ratio)
-
-                if target_screenshot_height > self.output_height * max_height_ratio:
-                    target_screenshot_height = int(self.output_height * max_height_ratio)
-                    target_screenshot_width = int(target_screenshot_height / aspect_ratio)
-
-                screenshot_resized = screenshot.resize(
-                    (target_screenshot_width, target_screenshot_height),
-                    Image.Resampling.LANCZOS
-                )
-
-                # iPhone 17 프레임이 있으면 둥근 모서리 추가
-                if self.iphone_frame:
-                    # 둥근 모서리 반지름 (이미지 크기에 비례) - 15%
-                    corner_radius = int(min(screenshot_resized.width, screenshot_resized.height) * 0.15)
-                    screenshot_resized = self.add_rounded_corners(screenshot_resized, radius=corner_radius)
-
-                # 프레임 추가
-                if add_frame:
-                    screenshot_with_frame = self.generator.add_device_frame(screenshot_resized)
-                else:
-                    screenshot_with_frame = screenshot_resized
-                    if screenshot_with_frame.mode != 'RGBA':
-                        screenshot_with_frame = screenshot_with_frame.convert('RGBA')
-
-                # 3단계: 메인 스크린샷을 배경 위에 합성 (중앙 배치 + 14% 아래로)
-                x = (self.output_width - screenshot_with_frame.width) // 2
-                y = (self.output_height - screenshot_with_frame.height) // 2
-                y = int(y * 0.8)
-                # 14% 아래로 이동 (16% - 2%)
-                y = y + int(self.output_height * 0.14)
-
-                # 배경(하위 레이어) + 메인 스크린샷(상위 레이어) 합성
-                img_background.paste(screenshot_with_frame, (x, y), screenshot_with_frame)
-
-                # 4단계: 텍스트 추가 (최상위 레이어)
-                if self.text_var.get() and self.text_entry.get().strip():
-                    text = self.text_entry.get().strip()
-                    position = self.text_position_var.get()
-                    font_size = self.text_size_var.get()
-                    img_background = self.add_text_to_image(img_background, text, position, font_size)
-
-                # RGB 변환
-                final_image = img_background.convert('RGB')
-
-                # 5단계: iPhone 17 프레임 오버레이 (최최상위 레이어)
-                if self.iphone_frame:
-                    # 프레임을 출력 사이즈의 90%로 리사이즈
-                    frame_resized = self.iphone_frame.copy()
-                    frame_width = int(self.output_width * 0.9)
-                    frame_height = int(self.output_height * 0.9)
-                    frame_resized = frame_resized.resize(
-                        (frame_width, frame_height),
-                        Image.Resampling.LANCZOS
-                    )
-                    # RGBA로 변환
-                    if frame_resized.mode != 'RGBA':
-                        frame_resized = frame_resized.convert('RGBA')
-
-                    # 중앙에 배치 + 13% 아래로 이동
-                    x_offset = (self.output_width - frame_width) // 2
-                    y_offset = (self.output_height - frame_height) // 2
-                    y_offset = y_offset + int(self.output_height * 0.13)
-
-                    # 최종 이미지를 RGBA로 변환하여 프레임 합성
-                    final_image_rgba = final_image.convert('RGBA')
-                    final_image_rgba.paste(frame_resized, (x_offset, y_offset), frame_resized)
-                    final_image = final_image_rgba.convert('RGB')
-
-                # 테두리 추가
-                if self.border_var.get():
-                    final_image = self.add_border_to_image(final_image, border_width=5, border_color=(150, 150, 150))
+                final_image = self.compose_marketing_image(screenshot, background, add_frame)
 
                 # 저장
                 final_image.save(output_path, 'PNG', quality=95)
@@ -1296,6 +1219,8 @@ class EnhancedMarketingImageGUI:
 
 def main():
     try:
+        if not HAS_DND:
+            raise ImportError('tkinterdnd2')
         root = TkinterDnD.Tk()
     except:
         # tkinterdnd2가 없으면 일반 Tk 사용
@@ -9,6 +9,8 @@ from tkinter import filedialog, messagebox, ttk, colorchooser
 from PIL import Image, ImageDraw, ImageFont, ImageTk
 import os
 
+from compositor import phone_frame
+
 class InteractiveMarketingGUI:
     def __init__(self, root):
         self.root = root
@@ -68,6 +70,11 @@ class InteractiveMarketingGUI:
         self.img_label = tk.Label(img_frame, text="이미지 없음", fg="gray", bg="#f8f9fa")
         self.img_label.pack(pady=5)
         
+        tk.Label(img_frame, text="그림자 흐림:", bg="#f8f9fa").pack(anchor="w")
+        self.shadow_blur_var = tk.IntVar(value=20)
+        tk.Scale(img_frame, from_=0, to=80, orient="horizontal",
+                variable=self.shadow_blur_var, bg="#f8f9fa").pack(fill="x", pady=5)
+        
         # 2. 텍스트 추가
         text_frame = tk.LabelFrame(left_panel, text="📝 텍스트 추가", padx=10, pady=10, bg="#f8f9fa")
         text_frame.pack(fill="x", padx=10, pady=10)
@@ -282,51 +289,9 @@ class InteractiveMarketingGUI:
             x_offset += img.width + spacing
     
     def add_phone_frame(self, screenshot):
-        """iPhone 스타일 프레임"""
-        from PIL import ImageFilter
-        
-        frame_padding = 10
-        shadow_offset = 40
-        corner_radius = 60
-        
-        total_width = screenshot.width + frame_padding * 2 + shadow_offset * 2
-        total_height = screenshot.height + frame_padding * 2 + shadow_offset * 2
-        
-        result = Image.new('RGBA', (total_width, total_height), (0, 0, 0, 0))
-        
-        # 그림자
-        shadow = Image.new('RGBA', (total_width, total_height), (0, 0, 0, 0))
-        shadow_draw = ImageDraw.Draw(shadow)
-        shadow_draw.rounded_rectangle(
-            [shadow_offset, shadow_offset,
-             screenshot.width + frame_padding * 2 + shadow_offset,
-             screenshot.height + frame_padding * 2 + shadow_offset],
-            radius=corner_radius, fill=(0, 0, 0, 80)
-        )
-        shadow = shadow.filter(ImageFilter.GaussianBlur(20))
-        result.paste(shadow, (0, 0), shadow)
-        
-        # 프레임
-        frame = Image.new('RGBA', 
-                         (screenshot.width + frame_padding * 2,
-                          screenshot.height + frame_padding * 2),
-                         (20, 20, 20, 255))
-        
-        if screenshot.mode != 'RGBA':
-            screenshot = screenshot.convert('RGBA')
-        
-        frame.paste(screenshot, (frame_padding, frame_padding), screenshot)
-        
-        # 둥근 모서리
-        mask = Image.new('L', frame.size, 0)
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.rounded_rectangle([0, 0, frame.width, frame.height],
-                                    radius=corner_radius, fill=255)
-        frame.putalpha(mask)
-        
-        result.paste(frame, (shadow_offset // 2, shadow_offset // 2), frame)
-        
-        return result
+        """iPhone 스타일 프레임 (그림자 알파는 최종 합성 때 한 번만 적용, 블러는 축소한 마스크에서)"""
+        return phone_frame(screenshot, corner_radius=60, shadow_offset=40,
+                           blur=self.shadow_blur_var.get())
     
     def choose_text_color(self):
         """텍스트 색상 선택"""
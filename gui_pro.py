@@ -14,6 +14,9 @@ except:
 import os
 from PIL import Image, ImageTk
 from generator_advanced import AdvancedMarketingGenerator
+from discovery import find_images
+from layouts import DEVICE_COUNTS
+from probe import check_selection
 
 class ProMarketingGUI:
     def __init__(self, root):
@@ -108,8 +111,18 @@ class ProMarketingGUI:
         self.layout_var = tk.StringVar(value="single")
         tk.Radiobutton(layout_frame, text="단일 스크린샷", variable=self.layout_var,
                       value="single", bg="#f8f9fa").pack(anchor="w")
+        tk.Radiobutton(layout_frame, text="2개 스크린샷", 
+                      variable=self.layout_var, value="double", bg="#f8f9fa").pack(anchor="w")
         tk.Radiobutton(layout_frame, text="3개 스크린샷 (eBay 스타일)", 
                       variable=self.layout_var, value="triple", bg="#f8f9fa").pack(anchor="w")
+        tk.Radiobutton(layout_frame, text="원근감 배치 (최대 3개)", 
+                      variable=self.layout_var, value="perspective", bg="#f8f9fa").pack(anchor="w")
+        tk.Radiobutton(layout_frame, text="부채꼴 (최대 5개)", 
+                      variable=self.layout_var, value="fan", bg="#f8f9fa").pack(anchor="w")
+        tk.Radiobutton(layout_frame, text="격자 (최대 4개)", 
+                      variable=self.layout_var, value="grid", bg="#f8f9fa").pack(anchor="w")
+        tk.Radiobutton(layout_frame, text="엇갈린 배치 (최대 4개)", 
+                      variable=self.layout_var, value="staggered", bg="#f8f9fa").pack(anchor="w")
         
         # 3. 배경 설정
         bg_frame = tk.LabelFrame(scrollable_frame, text="🎨 배경", 
@@ -119,7 +132,7 @@ class ProMarketingGUI:
         tk.Label(bg_frame, text="스타일:", bg="#f8f9fa").grid(row=0, column=0, sticky="w", pady=5)
         self.bg_style_var = tk.StringVar(value="gradient")
         bg_combo = ttk.Combobox(bg_frame, textvariable=self.bg_style_var,
-                               values=["gradient", "solid", "white"],
+                               values=["gradient", "solid", "white", "auto"],
                                state="readonly", width=15)
         bg_combo.grid(row=0, column=1, sticky="w", pady=5)
         
@@ -226,8 +239,7 @@ class ProMarketingGUI:
     def select_folder(self):
         folder = filedialog.askdirectory(title="폴더 선택")
         if folder:
-            files = [os.path.join(folder, f) for f in os.listdir(folder)
-                    if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
+            files = find_images(folder)
             if files:
                 self.process_file_selection(files)
             else:
@@ -236,12 +248,15 @@ class ProMarketingGUI:
     def process_file_selection(self, files):
         """파일 선택 처리"""
         valid_files = [f for f in files if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
+        valid_files, notice = check_selection(valid_files)
+        if notice:
+            messagebox.showwarning("입력 확인", notice)
         
         if valid_files:
             self.input_files = valid_files
             self.file_label.config(text=f"✓ {len(valid_files)}개 선택됨", fg="#34C759")
             self.show_preview(valid_files[0])
-        else:
+        elif not notice:
             messagebox.showwarning("경고", "유효한 이미지가 없습니다.")
     
     def choose_gradient(self):
@@ -305,12 +320,13 @@ class ProMarketingGUI:
         
         # 레이아웃에 따라 처리
         layout = self.layout_var.get()
+        group = DEVICE_COUNTS.get(layout, 1)
         
-        if layout == 'triple':
-            # 3개씩 묶어서 처리
-            for i in range(0, len(self.input_files), 3):
-                batch = self.input_files[i:i+3]
-                output_filename = f"marketing_triple_{i//3+1}.png"
+        if group > 1:
+            # 레이아웃의 디바이스 수만큼 묶어서 처리
+            for i in range(0, len(self.input_files), group):
+                batch = self.input_files[i:i+group]
+                output_filename = f"marketing_{layout}_{i//group+1}.png"
                 output_path = os.path.join(output_dir, output_filename)
                 
                 self.status_label.config(text=f"처리 중... ({i+1}/{len(self.input_files)})")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Layout Engine
+여러 디바이스 배치(double, triple, perspective, fan, grid, staggered)의 위치/크기/각도를 미리 계산
+
+여기서는 좌표만 계산하고 픽셀은 다루지 않는다. 생성기는 계산된 배치마다
+확대/축소와 회전을 합친 변환 한 번(리샘플 1회)으로 디바이스를 그린다.
+"""
+
+import math
+
+# 레이아웃별 기본 디바이스 수 (스크린샷이 부족하면 반복 사용)
+DEVICE_COUNTS = {
+    'single': 1,
+    'double': 2,
+    'triple': 3,
+    'perspective': 3,
+    'fan': 5,
+    'grid': 4,
+    'staggered': 4,
+}
+LAYOUTS = tuple(DEVICE_COUNTS)
+
+# 가변 개수 레이아웃의 최대 디바이스 수
+MAX_DEVICES = 9
+
+# perspective 레이아웃의 기본 틸트 각도
+DEFAULT_TILT = 25.0
+
+
+class Placement:
+    """디바이스 하나의 배치
+
+    index: 사용할 스크린샷 번호
+    center: 캔버스 좌표의 중심 (x, y)
+    width: 프레임을 포함한 디바이스 너비 (캔버스 픽셀, 회전 전)
+    angle: 반시계 방향 회전 각도 (도)
+    tilt: 세로축 기준 원근 회전 각도 (도, 양수면 오른쪽 가장자리가 멀어짐)
+    z: 그리는 순서 (작은 값부터)
+    """
+
+    def __init__(self, index, center, width, angle=0.0, z=0, tilt=0.0):
+        self.index = index
+        self.center = center
+        self.width = width
+        self.angle = angle
+        self.tilt = tilt
+        self.z = z
+
+    def __repr__(self):
+        return (f"Placement(index={self.index}, center=({self.center[0]:.0f}, {self.center[1]:.0f}), "
+                f"width={self.width:.0f}, angle={self.angle:g}, tilt={self.tilt:g}, z={self.z})")
+
+
+def device_count(layout, screenshot_count):
+    """그릴 디바이스 수 (fan/grid/staggered는 스크린샷 수를 따름)"""
+    base = DEVICE_COUNTS.get(layout, 1)
+    if layout in ('fan', 'grid', 'staggered') and screenshot_count > 1:
+        return min(max(screenshot_count, 2), MAX_DEVICES)
+    if layout == 'perspective':
+        return min(max(screenshot_count, 1), base)
+    return base
+
+
+def text_band(canvas_size, text_position):
+    """디바이스를 놓을 세로 영역: (위쪽 y 또는 None(세로 중앙), 최대 높이)"""
+    _, height = canvas_size
+    if text_position == 'top':
+        return height * 0.35, height * 0.7
+    if text_position == 'bottom':
+        return height * 0.15, height * 0.7
+    return None, height * 0.7
+
+
+def _fit_width(width, aspect, max_height):
+    """너비 width인 디바이스가 max_height를 넘지 않도록 너비 조정"""
+    if width * aspect > max_height:
+        return max_height / aspect
+    return width
+
+
+def _row(canvas_size, band, aspect, widths, xs, angles, y_offsets, z):
+    """가로 한 줄 배치 공통 처리 (폭 비율, x 비율, 각도, y 오프셋 비율)"""
+    canvas_width, canvas_height = canvas_size
+    top, max_height = band
+    placements = []
+    for i, (width, x, angle, dy) in enumerate(zip(widths, xs, angles, y_offsets)):
+        width = _fit_width(width * canvas_width, aspect, max_height)
+        height = width * aspect
+        if top is None:
+            cy = canvas_height / 2
+        else:
+            cy = top + height / 2
+        placements.append(Placement(i, (x * canvas_width, cy + dy * canvas_height), width, angle, z[i]))
+    return placements
+
+
+def plan_layout(layout, screenshot_count, canvas_size, text_position=None, aspect=2556 / 1179,
+                tilt=None):
+    """레이아웃의 모든 디바이스 배치를 계산
+
+    aspect: 프레임 포함 디바이스의 세로/가로 비율
+    tilt: 원근 틸트 각도. 가운데에서 벗어난 디바이스는 가운데를 바라보도록 부호를 바꾸고,
+          여러 대 중 가운데 디바이스는 정면 유지 (perspective 레이아웃 기본값: DEFAULT_TILT)
+    반환: z 순서대로 정렬된 Placement 목록
+    """
+    count = device_count(layout, screenshot_count)
+    band = text_band(canvas_size, text_position)
+
+    if layout == 'double':
+        placements = _row(canvas_size, band, aspect,
+                          widths=(0.44, 0.44), xs=(0.30, 0.70), angles=(-6, 6),
+                          y_offsets=(0, 0.04), z=(0, 1))
+    elif layout == 'triple':
+        placements = _row(canvas_size, band, aspect,
+                          widths=(0.27, 0.28, 0.27), xs=(0.19, 0.5, 0.81), angles=(-12, 0, 12),
+                          y_offsets=(0, 0.011, 0), z=(0, 1, 0))
+    elif layout == 'perspective':
+        # 평면 회전 없이 틸트만으로 입체감 (1~3대)
+        rows = {
+            1: dict(widths=(0.7,), xs=(0.5,), y_offsets=(0,), z=(0,)),
+            2: dict(widths=(0.46, 0.46), xs=(0.29, 0.71), y_offsets=(0, 0.03), z=(0, 1)),
+            3: dict(widths=(0.32, 0.34, 0.32), xs=(0.2, 0.5, 0.8), y_offsets=(0.02, 0, 0.02), z=(0, 1, 0)),
+        }[count]
+        placements = _row(canvas_size, band, aspect, angles=[0] * count, **rows)
+        if tilt is None:
+            tilt = DEFAULT_TILT
+    elif layout == 'fan':
+        placements = _fan(count, canvas_size, band, aspect)
+    elif layout == 'grid':
+        placements = _grid(count, canvas_size, band, aspect)
+    elif layout == 'staggered':
+        width = min(0.5, 1.6 / (count + 1))
+        step = (1 - width) / max(count - 1, 1) if count > 1 else 0
+        xs = [0.5] if count == 1 else [width / 2 + step * i for i in range(count)]
+        placements = _row(canvas_size, band, aspect,
+                          widths=[width] * count, xs=xs, angles=[0] * count,
+                          y_offsets=[0.05 if i % 2 else -0.02 for i in range(count)],
+                          z=list(range(count)))
+    else:
+        placements = _row(canvas_size, band, aspect,
+                          widths=(0.75,), xs=(0.5,), angles=(0,), y_offsets=(0,), z=(0,))
+
+    if tilt:
+        _apply_tilt(placements, canvas_size[0], tilt)
+    for placement in placements:
+        placement.index %= max(screenshot_count, 1)
+    return sorted(placements, key=lambda placement: placement.z)
+
+
+def _apply_tilt(placements, canvas_width, tilt):
+    """디바이스가 가운데를 바라보도록 틸트 부호 결정 (한 대뿐이면 그대로)"""
+    if len(placements) == 1:
+        placements[0].tilt = tilt
+        return
+    middle = canvas_width / 2
+    for placement in placements:
+        offset = placement.center[0] - middle
+        if abs(offset) < canvas_width * 0.05:
+            placement.tilt = 0.0
+        else:
+            # 왼쪽 디바이스는 오른쪽 가장자리가, 오른쪽 디바이스는 왼쪽 가장자리가 멀어짐
+            placement.tilt = abs(tilt) if offset < 0 else -abs(tilt)
+
+
+def _fan(count, canvas_size, band, aspect):
+    """부채꼴: 캔버스 아래쪽 축을 중심으로 펼침 (가운데 디바이스가 맨 위)"""
+    canvas_width, canvas_height = canvas_size
+    top, max_height = band
+    width = _fit_width(canvas_width * min(0.42, 1.1 / count + 0.12), aspect, max_height)
+    height = width * aspect
+
+    if top is None:
+        top = (canvas_height - height) / 2
+    spread = min(40.0, 10.0 * (count - 1))
+    radius = height * 1.6
+    pivot = (canvas_width / 2, top + height / 2 + radius)
+
+    placements = []
+    for i in range(count):
+        angle = spread / 2 - spread * i / (count - 1) if count > 1 else 0.0
+        theta = math.radians(angle)
+        center = (pivot[0] - radius * math.sin(theta), pivot[1] - radius * math.cos(theta))
+        z = -abs(i - (count - 1) / 2)
+        placements.append(Placement(i, center, width, angle, z))
+    return placements
+
+
+def _grid(count, canvas_size, band, aspect):
+    """격자: 2열(4개 이하) 또는 3열"""
+    canvas_width, canvas_height = canvas_size
+    top, max_height = band
+    cols = 2 if count <= 4 else 3
+    rows = math.ceil(count / cols)
+    gap = canvas_width * 0.04
+
+    cell_width = (canvas_width * 0.9 - gap * (cols - 1)) / cols
+    width = _fit_width(cell_width, aspect, (max_height - gap * (rows - 1)) / rows)
+    height = width * aspect
+    grid_height = rows * height + (rows - 1) * gap
+    if top is None:
+        top = (canvas_height - grid_height) / 2
+
+    placements = []
+    for i in range(count):
+        row, col = divmod(i, cols)
+        in_row = min(cols, count - row * cols)
+        row_width = in_row * width + (in_row - 1) * gap
+        x = (canvas_width - row_width) / 2 + col * (width + gap) + width / 2
+        y = top + row * (height + gap) + height / 2
+        placements.append(Placement(i, (x, y), width, 0.0, 0))
+    return placements
+
+
+def plan_panorama(screenshot_count, screens, slice_size, text_position=None, aspect=2556 / 1179,
+                  tilt=None):
+    """파노라마: 화면 screens장 너비의 캔버스 전체에 디바이스를 고르게 배치
+
+    디바이스 수가 화면 수와 다르면 일부 디바이스가 화면 경계에 걸쳐 이어지는 느낌을 준다.
+    좌우로 번갈아 살짝 기울이고(틸트를 주면 틸트 방향도 번갈아) 높이도 엇갈리게 배치.
+    """
+    slice_width, slice_height = slice_size
+    total_width = slice_width * screens
+    count = max(screenshot_count, 1)
+    top, max_height = text_band(slice_size, text_position)
+    stagger = slice_height * 0.04
+    width = _fit_width(slice_width * 0.62, aspect, max_height - stagger)
+    height = width * aspect
+
+    placements = []
+    for i in range(count):
+        x = total_width * (i + 0.5) / count
+        y = (top + height / 2 if top is not None else slice_height / 2) + (i % 2) * stagger
+        sign = -1 if i % 2 else 1
+        placement = Placement(i, (x, y), width, angle=4.0 * sign, z=i)
+        if tilt:
+            placement.tilt = tilt * sign
+        placements.append(placement)
+    return placements
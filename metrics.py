@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Metrics
+Prometheus 텍스트 형식(0.0.4) 메트릭 (외부 의존성 없음)
+
+멀티 프로세스 모드(multiprocess_dir 지정)에서는 프로세스마다 자기 값을 공유 폴더의 <pid>.json에
+쓰고, 스크랩을 받은 프로세스가 모든 파일을 합쳐 응답한다 (prometheus_client의 multiprocess 모드와 같은 방식).
+카운터/히스토그램은 종료된 워커 값까지 더하고, 게이지는 살아 있는 워커 값만 합친다.
+"""
+
+import atexit
+import glob
+import json
+import os
+import threading
+
+from storage import process_alive
+
+# 렌더링 단계별 지연 시간 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """단조 증가 카운터 (라벨별)"""
+
+    type_name = 'counter'
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    aggregate = 'sum'
+
+    def inc(self, amount=1, **labels):
+        key = tuple((name, labels[name]) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        _changed(self)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        if not items and not self.label_names:
+            items = [((), 0)]
+        return [(self.name, key, value) for key, value in items]
+
+
+class Gauge:
+    """현재 값 게이지. 스크랩 시점에 callback을 호출해 값을 읽음
+
+    aggregate: 멀티 프로세스에서 합치는 방법 ('livesum': 살아 있는 워커 합계,
+    'max': 워커 간에 공유하는 자원처럼 어느 워커가 읽어도 같은 값)
+    """
+
+    type_name = 'gauge'
+
+    def __init__(self, name, help_text, callback, aggregate='livesum'):
+        self.name = name
+        self.help_text = help_text
+        self.callback = callback
+        self.aggregate = aggregate
+
+    def samples(self):
+        return [(self.name, (), self.callback())]
+
+
+class CallbackCounter(Gauge):
+    """다른 객체가 세고 있는 누적값을 카운터로 노출 (예: 캐시 적중 수)"""
+
+    type_name = 'counter'
+
+    def __init__(self, name, help_text, callback):
+        super().__init__(name, help_text, callback, aggregate='sum')
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (라벨별)"""
+
+    type_name = 'histogram'
+    aggregate = 'sum'
+
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._values = {}  # 라벨 -> [버킷별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple((name, labels[name]) for name in self.label_names)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+        _changed(self)
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        result = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                result.append((f'{self.name}_bucket', key + (('le', _format_value(float(bound))),), cumulative))
+            result.append((f'{self.name}_sum', key, state[-2]))
+            result.append((f'{self.name}_count', key, state[-1]))
+        return result
+
+
+class MetricsRegistry:
+    """메트릭 모음. render()로 Prometheus 텍스트 출력
+
+    multiprocess_dir를 주면 이 프로세스의 값을 flush_interval초마다(start()의 기록 스레드, 종료 시 한 번 더)
+    그 폴더에 쓰고, render()는 폴더의 모든 프로세스 값을 합친다. 카운터/히스토그램은 값이 바뀌었다는
+    표시만 하므로 렌더링 스레드가 파일 쓰기를 기다리지 않는다 (다른 워커의 스크랩에는 최대 flush_interval초 늦게 반영).
+    폴더는 서버를 시작할 때마다 비어 있어야 한다 (이전 실행의 누적값이 더해지지 않도록).
+    """
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, multiprocess_dir=None, flush_interval=5):
+        self._metrics = []
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self._flush_lock = threading.Lock()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._thread = None
+        if multiprocess_dir:
+            os.makedirs(multiprocess_dir, exist_ok=True)
+            atexit.register(self.flush)
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        if self.multiprocess_dir:
+            metric.registry = self
+        return metric
+
+    def counter(self, name, help_text, label_names=()):
+        return self.register(Counter(name, help_text, label_names))
+
+    def gauge(self, name, help_text, callback, aggregate='livesum'):
+        return self.register(Gauge(name, help_text, callback, aggregate))
+
+    def callback_counter(self, name, help_text, callback):
+        return self.register(CallbackCounter(name, help_text, callback))
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help_text, label_names, buckets))
+
+    def render(self):
+        if self.multiprocess_dir:
+            self.flush()
+            samples = self._collect()
+        else:
+            samples = {metric.name: metric.samples() for metric in self._metrics}
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help_text}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            for name, labels, value in samples.get(metric.name, ()):
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def flush(self):
+        """이 프로세스의 현재 값을 <multiprocess_dir>/<pid>.json에 원자적으로 기록"""
+        if not self.multiprocess_dir:
+            return
+        from checkpoint import atomic_open
+
+        with self._flush_lock:
+            self._dirty = False
+            snapshot = {
+                metric.name: [[name, [list(pair) for pair in labels], value]
+                              for name, labels, value in metric.samples()]
+                for metric in self._metrics
+            }
+            path = os.path.join(self.multiprocess_dir, f'{os.getpid()}.json')
+            with atomic_open(path) as f:
+                f.write(json.dumps({'pid': os.getpid(), 'metrics': snapshot}).encode('utf-8'))
+
+    def mark_dirty(self):
+        """카운터/히스토그램 값이 바뀜 (다음 주기에 기록)"""
+        self._dirty = True
+
+    def start(self):
+        """값을 주기적으로 기록하는 스레드 시작 (멀티 프로세스 모드에서만)"""
+        if not self.multiprocess_dir or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='metrics-flusher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        # 콜백 값(게이지 등)은 바뀌었는지 알 수 없으므로 콜백 메트릭이 있으면 매 주기 기록
+        has_callbacks = any(isinstance(metric, Gauge) for metric in self._metrics)
+        while not self._stop.wait(self.flush_interval):
+            if not (self._dirty or has_callbacks):
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"메트릭 기록 오류: {e}")
+
+    def _collect(self):
+        """모든 프로세스 파일을 읽어 메트릭별로 합친 샘플"""
+        aggregates = {metric.name: metric.aggregate for metric in self._metrics}
+        merged = {name: {} for name in aggregates}
+        for path in sorted(glob.glob(os.path.join(self.multiprocess_dir, '*.json'))):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            pid = data.get('pid')
+            alive = pid == os.getpid() or (isinstance(pid, int) and process_alive(pid))
+            for metric_name, samples in data.get('metrics', {}).items():
+                aggregate = aggregates.get(metric_name)
+                if aggregate is None or (aggregate != 'sum' and not alive):
+                    continue
+                target = merged[metric_name]
+                for name, labels, value in samples:
+                    key = (name, tuple(tuple(pair) for pair in labels))
+                    if aggregate == 'max':
+                        target[key] = max(target.get(key, value), value)
+                    else:
+                        target[key] = target.get(key, 0) + value
+        return {
+            metric_name: [(name, labels, value) for (name, labels), value in target.items()]
+            for metric_name, target in merged.items()
+        }
+
+
+def _changed(metric):
+    """카운터/히스토그램 값이 바뀌면 멀티 프로세스 레지스트리에 표시 (기록은 주기적으로)"""
+    registry = getattr(metric, 'registry', None)
+    if registry is not None:
+        registry.mark_dirty()
+
+
+class RenderMetrics:
+    """생성기의 observer로 연결되어 단계별 지연 시간/성공/실패를 기록"""
+
+    def __init__(self, registry):
+        self.stage_seconds = registry.histogram(
+            'marketing_render_stage_seconds',
+            'Latency of each rendering stage in seconds.',
+            ('stage',)
+        )
+        self.render_seconds = registry.histogram(
+            'marketing_render_seconds',
+            'End-to-end latency of one marketing image render in seconds.'
+        )
+        self.images_rendered = registry.counter(
+            'marketing_images_rendered_total',
+            'Number of marketing images rendered successfully.'
+        )
+        self.failures = registry.counter(
+            'marketing_render_failures_total',
+            'Number of failed renders by exception type.',
+            ('exception',)
+        )
+
+    def observe_stage(self, stage, seconds):
+        self.stage_seconds.observe(seconds, stage=stage)
+
+    def observe_render(self, seconds):
+        self.render_seconds.observe(seconds)
+        self.images_rendered.inc()
+
+    def observe_error(self, exc):
+        self.failures.inc(exception=type(exc).__name__)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Auto Palette
+스크린샷의 대표 색을 뽑아 그라디언트 배경 색으로 사용 ('auto' 배경 스타일)
+
+원본이 아니라 긴 변 THUMBNAIL_SIZE px 썸네일을 양자화하므로 이미지당 수 ms이며,
+결과는 썸네일 픽셀의 해시로 캐시해 같은 스크린샷(로컬라이즈, 여러 디바이스 크기)은 다시 계산하지 않는다.
+"""
+
+import colorsys
+import hashlib
+import threading
+from collections import OrderedDict
+
+THUMBNAIL_SIZE = 64
+PALETTE_COLORS = 8
+CACHE_SIZE = 256
+
+# 배경으로 쓰기 좋은 색: 채도가 이 값 이상이면 무채색(흰 바탕, 검은 글자)보다 우선
+MIN_SATURATION = 0.25
+# 두 번째 색이 첫 번째 색과 이만큼(RGB 거리) 이상 달라야 그라디언트가 보임
+MIN_COLOR_DISTANCE = 60
+
+_cache = OrderedDict()  # 썸네일 해시 -> [(비율, (R, G, B)), ...]
+_lock = threading.Lock()
+
+# 캐시 확인용
+cache_hits = 0
+cache_misses = 0
+
+
+def _thumbnail(image):
+    """긴 변이 THUMBNAIL_SIZE 이하가 되도록 reduce (정수 배율 박스 평균, 원본은 그대로)"""
+    factor = max(1, max(image.size) // THUMBNAIL_SIZE)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.mode or 'transparency' in image.info else 'RGB')
+    thumb = image.reduce(factor) if factor > 1 else image.copy()
+    if thumb.mode == 'RGBA':
+        # 투명한 부분은 팔레트에서 제외하도록 흰색 위에 합성
+        from PIL import Image
+        background = Image.new('RGBA', thumb.size, (255, 255, 255, 255))
+        thumb = Image.alpha_composite(background, thumb)
+    return thumb.convert('RGB')
+
+
+def extract_palette(image, colors=PALETTE_COLORS):
+    """이미지의 대표 색 목록 [(비율, (R, G, B)), ...] (많은 순, 캐시됨)"""
+    global cache_hits, cache_misses
+    from PIL import Image
+
+    thumb = _thumbnail(image)
+    key = (hashlib.sha1(thumb.tobytes()).hexdigest(), thumb.size, colors)
+    with _lock:
+        palette = _cache.get(key)
+        if palette is not None:
+            _cache.move_to_end(key)
+            cache_hits += 1
+            return palette
+        cache_misses += 1
+
+    quantized = thumb.quantize(colors, method=Image.Quantize.MEDIANCUT)
+    flat = quantized.getpalette()
+    total = thumb.width * thumb.height
+    palette = [
+        (count / total, tuple(flat[index * 3:index * 3 + 3]))
+        for count, index in sorted(quantized.getcolors(colors), reverse=True)
+    ]
+
+    with _lock:
+        _cache[key] = palette
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return palette
+
+
+def _saturation(color):
+    return colorsys.rgb_to_hsv(*(c / 255 for c in color))[1]
+
+
+def _distance(a, b):
+    return sum((x - y) ** 2 for x, y in zip(a, b)) ** 0.5
+
+
+def _shade(color):
+    """같은 색상(hue)에서 밝기만 바꾼 색 (밝은 색은 어둡게, 어두운 색은 밝게)"""
+    h, s, v = colorsys.rgb_to_hsv(*(c / 255 for c in color))
+    v = v * 0.7 if v > 0.5 else v + (1 - v) * 0.4
+    return tuple(round(c * 255) for c in colorsys.hsv_to_rgb(h, s, v))
+
+
+def gradient_colors(screenshots):
+    """스크린샷(들)의 대표 색으로 그라디언트 두 색 [(R, G, B), (R, G, B)] 선택
+
+    채도가 있는 색을 면적 순으로 우선하고, 두 번째 색은 첫 번째와 충분히 다른 색.
+    없으면 첫 번째 색을 어둡게(또는 밝게) 한 색을 사용.
+    """
+    if not isinstance(screenshots, (list, tuple)):
+        screenshots = [screenshots]
+    weights = {}
+    for screenshot in screenshots:
+        for share, color in extract_palette(screenshot):
+            weights[color] = weights.get(color, 0) + share
+
+    ranked = sorted(weights.items(), key=lambda item: -item[1])
+    vivid = [color for color, _ in ranked if _saturation(color) >= MIN_SATURATION]
+    candidates = vivid + [color for color, _ in ranked if color not in vivid]
+
+    first = candidates[0]
+    second = next((color for color in candidates[1:] if _distance(color, first) >= MIN_COLOR_DISTANCE), None)
+    if second is None:
+        second = _shade(first)
+    return [first, second]
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Perspective Transform
+디바이스를 세로축 기준으로 돌린(tilt) 원근 변환 계수 계산 (PIL 없이 순수 계산)
+
+Image.transform(PERSPECTIVE)는 출력 좌표 → 입력 좌표 방향의 계수 8개를 받는다.
+틸트 호모그래피(8x8 연립방정식)는 (크기, 각도)마다 한 번만 풀어 캐시하고,
+배치마다 달라지는 확대/축소, 회전, 이동은 3x3 행렬 곱으로 합쳐 리샘플 한 번으로 그린다.
+"""
+
+import math
+from functools import lru_cache
+
+# 카메라 거리 (디바이스 높이 대비). 작을수록 원근이 강해짐
+DEFAULT_CAMERA_DISTANCE = 2.5
+
+
+def _solve(matrix, vector):
+    """가우스 소거법 (부분 피벗)"""
+    n = len(vector)
+    rows = [list(row) + [value] for row, value in zip(matrix, vector)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        if abs(rows[col][col]) < 1e-12:
+            raise ValueError('원근 변환을 계산할 수 없습니다 (점이 한 직선 위에 있음)')
+        for r in range(col + 1, n):
+            factor = rows[r][col] / rows[col][col]
+            for c in range(col, n + 1):
+                rows[r][c] -= factor * rows[col][c]
+    result = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        result[r] = (rows[r][n] - sum(rows[r][c] * result[c] for c in range(r + 1, n))) / rows[r][r]
+    return result
+
+
+def homography(src, dst):
+    """네 점 대응 src[i] → dst[i] 를 만족하는 3x3 행렬 (행 우선 튜플 9개)"""
+    matrix, vector = [], []
+    for (x, y), (u, v) in zip(src, dst):
+        matrix.append([x, y, 1, 0, 0, 0, -u * x, -u * y])
+        vector.append(u)
+        matrix.append([0, 0, 0, x, y, 1, -v * x, -v * y])
+        vector.append(v)
+    return tuple(_solve(matrix, vector)) + (1.0,)
+
+
+def multiply(a, b):
+    return tuple(
+        sum(a[row * 3 + k] * b[k * 3 + col] for k in range(3))
+        for row in range(3) for col in range(3)
+    )
+
+
+def invert(m):
+    a, b, c, d, e, f, g, h, i = m
+    det = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+    if abs(det) < 1e-12:
+        raise ValueError('역변환이 없습니다')
+    return tuple(value / det for value in (
+        e * i - f * h, c * h - b * i, b * f - c * e,
+        f * g - d * i, a * i - c * g, c * d - a * f,
+        d * h - e * g, b * g - a * h, a * e - b * d,
+    ))
+
+
+def apply(m, point):
+    x, y = point
+    w = m[6] * x + m[7] * y + m[8]
+    return ((m[0] * x + m[1] * y + m[2]) / w, (m[3] * x + m[4] * y + m[5]) / w)
+
+
+def tilt_corners(size, tilt, camera_distance=DEFAULT_CAMERA_DISTANCE):
+    """세로축 기준으로 tilt도 돌린 직사각형의 투영 꼭짓점 (중심이 원점, 원래 크기 기준)
+
+    tilt > 0 이면 오른쪽 가장자리가 멀어짐 (화면이 왼쪽을 향함)
+    """
+    width, height = size
+    theta = math.radians(tilt)
+    distance = camera_distance * height
+    corners = []
+    for x, y in ((0, 0), (width, 0), (width, height), (0, height)):
+        dx, dy = x - width / 2, y - height / 2
+        depth = dx * math.sin(theta)
+        scale = distance / (distance + depth)
+        corners.append((dx * math.cos(theta) * scale, dy * scale))
+    return corners
+
+
+@lru_cache(maxsize=256)
+def tilt_homography(size, tilt, camera_distance=DEFAULT_CAMERA_DISTANCE):
+    """원본 좌표 → 틸트 투영 좌표(중심 원점) 호모그래피 ((크기, 각도)별로 캐시)"""
+    width, height = size
+    src = [(0, 0), (width, 0), (width, height), (0, height)]
+    return homography(src, tilt_corners(size, tilt, camera_distance))
+
+
+def similarity(scale, angle, center):
+    """확대/축소 → 반시계 회전(도) → 이동 행렬 (Image.rotate와 같은 방향)"""
+    theta = math.radians(angle)
+    cos, sin = math.cos(theta) * scale, math.sin(theta) * scale
+    return (cos, sin, center[0],
+            -sin, cos, center[1],
+            0.0, 0.0, 1.0)
+
+
+def placement_transform(size, scale, angle=0.0, tilt=0.0, center=(0.0, 0.0),
+                        camera_distance=DEFAULT_CAMERA_DISTANCE):
+    """원본 좌표 → 캔버스 좌표 전체 변환 (틸트 → 확대/축소/회전 → 이동)"""
+    return multiply(similarity(scale, angle, center), tilt_homography(tuple(size), tilt, camera_distance))
+
+
+def bounding_box(m, size):
+    """변환 후 원본 꼭짓점들의 외곽 (left, top, right, bottom)"""
+    width, height = size
+    points = [apply(m, corner) for corner in ((0, 0), (width, 0), (width, height), (0, height))]
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def pil_coefficients(m, offset=(0, 0)):
+    """캔버스 → 원본 방향 PERSPECTIVE 계수 8개 (offset: 출력 이미지의 캔버스 위 좌상단)"""
+    shifted = multiply((1.0, 0.0, -offset[0], 0.0, 1.0, -offset[1], 0.0, 0.0, 1.0), m)
+    inverse = invert(shifted)
+    return tuple(value / inverse[8] for value in inverse[:8])
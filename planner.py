@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Batch Planner
+렌더링 전에 이미지 헤더만 읽어 작업량, 메모리, 출력 용량, 예상 소요 시간을 계산
+"""
+
+import os
+import tempfile
+
+from probe import probe_image
+
+# 단계별 비용 (초 / 메가픽셀). decode/resize는 입력 크기, 나머지는 출력 크기에 비례.
+# 1179x2556 → 1290x2796 기준 개발 머신에서 측정한 값이며 --calibrate로 다시 잴 수 있음
+DEFAULT_STAGE_COSTS = {
+    'decode': 0.010,
+    'resize': 0.035,
+    'background': 0.002,
+    'frame': 0.007,
+    'composite': 0.005,
+    'encode': 0.030,
+}
+INPUT_STAGES = ('decode', 'resize')
+
+# 출력 PNG 크기 추정: 원본 RGB 바이트 대비 압축 비율
+PNG_COMPRESSION_RATIO = 0.25
+
+MODE_BYTES = {'1': 1, 'L': 1, 'P': 1, 'LA': 2, 'RGB': 3, 'RGBA': 4, 'CMYK': 4, 'I': 4, 'F': 4}
+
+
+def plan_batch(tasks, target_size, stage_costs=None, workers=4, strict=False, is_done=None):
+    """(입력 경로, 출력 경로) 목록에 대한 작업 계획
+
+    is_done: --resume 실행일 때 건너뛸 항목 판별 함수 (input_path, output_path) → bool.
+    없으면 (--resume 없는 실행은 모두 다시 렌더링하므로) 모든 입력을 예상 시간에 포함.
+
+    반환: 요약 dict (파일 수, 입력 크기 분포, 디코딩 바이트, 출력 바이트, 이미 완료된 출력 수,
+    예상 소요 시간, 거부된 입력과 경고 목록)
+    """
+    stage_costs = stage_costs or DEFAULT_STAGE_COSTS
+    output_mp = target_size[0] * target_size[1] / 1e6
+    output_bytes_each = int(target_size[0] * target_size[1] * 3 * PNG_COMPRESSION_RATIO)
+
+    plan = {
+        'files': 0,
+        'dimensions': {},
+        'decoded_bytes': 0,
+        'peak_decoded_bytes': 0,
+        'output_bytes': 0,
+        'up_to_date': [],
+        'pending': [],
+        'rejected': [],
+        'warnings': [],
+        'cpu_seconds': 0.0,
+    }
+
+    for input_path, output_path in tasks:
+        plan['files'] += 1
+        probe = probe_image(input_path, strict=strict)
+        if not probe.ok:
+            plan['rejected'].append(probe)
+            continue
+        if probe.warnings:
+            plan['warnings'].append(probe)
+        size, mode = probe.size, probe.mode
+
+        key = f"{size[0]}x{size[1]} {mode}"
+        plan['dimensions'][key] = plan['dimensions'].get(key, 0) + 1
+
+        if is_done is not None and is_done(input_path, output_path):
+            plan['up_to_date'].append(output_path)
+            continue
+
+        decoded = size[0] * size[1] * MODE_BYTES.get(mode, 4)
+        plan['decoded_bytes'] += decoded
+        plan['peak_decoded_bytes'] = max(plan['peak_decoded_bytes'], decoded)
+        plan['output_bytes'] += output_bytes_each
+        plan['pending'].append(input_path)
+
+        input_mp = size[0] * size[1] / 1e6
+        for stage, cost in stage_costs.items():
+            plan['cpu_seconds'] += cost * (input_mp if stage in INPUT_STAGES else output_mp)
+
+    parallelism = max(1, min(workers, os.cpu_count() or 1, len(plan['pending']) or 1))
+    plan['parallelism'] = parallelism
+    plan['wall_seconds'] = plan['cpu_seconds'] / parallelism
+    return plan
+
+
+class _StageRecorder:
+    """생성기 observer: 단계별 소요 시간 기록"""
+
+    def __init__(self):
+        self.stages = {}
+
+    def observe_stage(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def observe_render(self, seconds):
+        pass
+
+    def observe_error(self, exc):
+        pass
+
+
+def calibrate(sample_path, add_frame=True, background='white', runs=3):
+    """샘플 이미지를 실제로 렌더링해 단계별 비용(초/메가픽셀) 측정"""
+    from generator import MarketingImageGenerator
+
+    generator = MarketingImageGenerator()
+    recorder = _StageRecorder()
+    generator.observer = recorder
+
+    size = probe_image(sample_path).size
+    input_mp = size[0] * size[1] / 1e6
+    output_mp = generator.TARGET_WIDTH * generator.TARGET_HEIGHT / 1e6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, 'calibration.png')
+        # 첫 실행은 캐시 워밍업용으로 버림
+        generator.generate_marketing_image(sample_path, output_path, add_frame, background)
+        recorder.stages.clear()
+        for _ in range(runs):
+            if not generator.generate_marketing_image(sample_path, output_path, add_frame, background):
+                raise RuntimeError(f"보정용 렌더링 실패: {sample_path}")
+
+    return {
+        stage: seconds / runs / (input_mp if stage in INPUT_STAGES else output_mp)
+        for stage, seconds in recorder.stages.items()
+    }
+
+
+def format_bytes(num):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if num < 1024 or unit == 'GB':
+            return f"{num:.1f}{unit}" if unit != 'B' else f"{num}B"
+        num /= 1024
+
+
+def print_plan(plan, stage_costs=None):
+    """계획 요약 출력"""
+    print(f"📊 총 파일 수: {plan['files']}")
+    print(f"   - 생성 필요: {len(plan['pending'])}")
+    if plan['up_to_date']:
+        print(f"   - 이미 완료 (--resume에서 건너뜀): {len(plan['up_to_date'])}")
+    if plan['rejected']:
+        print(f"   - 거부됨: {len(plan['rejected'])}")
+    if plan['warnings']:
+        print(f"   - 경고: {len(plan['warnings'])}")
+
+    print(f"\n📐 입력 크기:")
+    for key, count in sorted(plan['dimensions'].items(), key=lambda item: -item[1]):
+        print(f"   - {key}: {count}개")
+
+    print(f"\n💾 디코딩 총량: {format_bytes(plan['decoded_bytes'])} "
+          f"(이미지당 최대 {format_bytes(plan['peak_decoded_bytes'])})")
+    print(f"💾 예상 출력 용량: {format_bytes(plan['output_bytes'])}")
+
+    if stage_costs:
+        costs = ', '.join(f"{stage} {cost * 1000:.1f}" for stage, cost in stage_costs.items())
+        print(f"\n⏱️  단계별 비용 (ms/MP): {costs}")
+    print(f"⏱️  예상 CPU 시간: {plan['cpu_seconds']:.1f}초")
+    print(f"⏱️  예상 소요 시간: {plan['wall_seconds']:.1f}초 (병렬 {plan['parallelism']})")
+
+    if plan['warnings']:
+        print(f"\n⚠️  경고:")
+        for probe in plan['warnings']:
+            print(f"   - {probe.describe()}")
+
+    if plan['rejected']:
+        print(f"\n❌ 거부된 파일:")
+        for probe in plan['rejected']:
+            print(f"   - {probe.describe()}")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Streaming PNG Writer
+가로 띠(밴드) 단위로 받은 행을 바로 압축해 쓰는 PNG 작성기 (타일 렌더링용)
+
+전체 이미지를 메모리에 두지 않고 밴드마다 Up 필터(윗행과의 차이)를 적용해 zlib 스트림으로 보낸다.
+Up 필터는 ImageChops.subtract_modulo 한 번으로 계산하므로 행 단위 파이썬 루프는 필터 바이트 삽입뿐.
+세로 그라디언트 배경처럼 위아래가 비슷한 행은 Up 필터로 대부분 0이 되어 잘 압축된다.
+"""
+
+import struct
+import zlib
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# 모드별 (PNG 색상 타입, 픽셀당 바이트)
+COLOR_TYPES = {
+    'L': (0, 1),
+    'RGB': (2, 3),
+    'RGBA': (6, 4),
+}
+
+FILTER_UP = b'\x02'
+
+
+def _chunk(f, tag, data=b''):
+    f.write(struct.pack('>I', len(data)))
+    f.write(tag)
+    f.write(data)
+    f.write(struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+
+class PNGStreamWriter:
+    """밴드를 위에서부터 차례로 받아 PNG로 기록
+
+    f: 바이너리 파일 객체 (atomic_open 등)
+    size: 전체 이미지 크기 (W, H), mode: 'L', 'RGB', 'RGBA'
+    icc_profile: 포함할 ICC 프로파일 바이트 (iCCP 청크, 선택사항)
+    """
+
+    def __init__(self, f, size, mode='RGB', compress_level=6, icc_profile=None):
+        if mode not in COLOR_TYPES:
+            raise ValueError(f"지원하지 않는 모드: {mode}")
+        self.f = f
+        self.size = size
+        self.mode = mode
+        self.rows_written = 0
+        self._previous_row = None
+        self._compressor = zlib.compressobj(compress_level)
+
+        color_type, _ = COLOR_TYPES[mode]
+        f.write(PNG_SIGNATURE)
+        _chunk(f, b'IHDR', struct.pack('>IIBBBBB', size[0], size[1], 8, color_type, 0, 0, 0))
+        if icc_profile:
+            # 프로파일 이름 + NUL + 압축 방식(0 = zlib) + 압축된 프로파일
+            _chunk(f, b'iCCP', b'ICC Profile\x00\x00' + zlib.compress(icc_profile))
+
+    def write(self, band):
+        """밴드 하나 기록 (너비는 전체 너비와 같아야 함)"""
+        from PIL import Image, ImageChops
+
+        if band.mode != self.mode:
+            band = band.convert(self.mode)
+        width, height = band.size
+        if width != self.size[0]:
+            raise ValueError(f"밴드 너비 {width}가 이미지 너비 {self.size[0]}와 다릅니다")
+        if self.rows_written + height > self.size[1]:
+            raise ValueError('이미지 높이보다 많은 행을 기록하려 합니다')
+
+        # 윗행 이미지: 이전 밴드의 마지막 행 + 이 밴드의 0..h-2행 (첫 행의 윗행은 0)
+        above = Image.new(self.mode, (width, height))
+        if self._previous_row is not None:
+            above.paste(self._previous_row, (0, 0))
+        if height > 1:
+            above.paste(band.crop((0, 0, width, height - 1)), (0, 1))
+        filtered = ImageChops.subtract_modulo(band, above).tobytes()
+        self._previous_row = band.crop((0, height - 1, width, height))
+
+        stride = width * COLOR_TYPES[self.mode][1]
+        data = b''.join(
+            FILTER_UP + filtered[offset:offset + stride]
+            for offset in range(0, len(filtered), stride)
+        )
+        self._write_idat(self._compressor.compress(data))
+        self.rows_written += height
+
+    def _write_idat(self, data):
+        if data:
+            _chunk(self.f, b'IDAT', data)
+
+    def close(self):
+        """남은 압축 데이터와 IEND 기록"""
+        if self.rows_written != self.size[1]:
+            raise ValueError(f"{self.size[1]}행 중 {self.rows_written}행만 기록되었습니다")
+        self._write_idat(self._compressor.flush())
+        _chunk(self.f, b'IEND')
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Screenshot Preprocessing
+디코딩한 스크린샷을 리사이즈하기 전에 상태 표시줄을 정리하거나 세이프 에어리어로 잘라냄
+
+자르기는 새 이미지를 만들지 않고 resize(box=...)에 넘길 영역만 계산하며,
+상태 표시줄 정리는 바로 아래 행에서 뽑은 색으로 그 영역을 칠한다 (추가 디코딩/인코딩 없음).
+"""
+
+# 스크린샷 해상도별 (상단 세이프 에어리어 = 상태 표시줄, 하단 홈 인디케이터 영역) 높이 (px)
+SAFE_AREAS = {
+    (1320, 2868): (186, 102),   # iPhone 16 Pro Max (62pt @3x)
+    (1206, 2622): (186, 102),   # iPhone 16 Pro
+    (1290, 2796): (177, 102),   # iPhone 14/15 Pro Max, 15 Plus (59pt @3x)
+    (1179, 2556): (177, 102),   # iPhone 14/15 Pro, 15, 16
+    (1284, 2778): (141, 102),   # iPhone 12/13 Pro Max, 14 Plus (47pt @3x)
+    (1170, 2532): (141, 102),   # iPhone 12/13/14
+    (1242, 2688): (132, 102),   # iPhone XS Max, 11 Pro Max (44pt @3x)
+    (1125, 2436): (132, 102),   # iPhone X, XS, 11 Pro
+    (1080, 2340): (150, 102),   # iPhone 12/13 mini (50pt @3x)
+    (828, 1792): (96, 68),      # iPhone XR, 11 (48pt @2x)
+    (1242, 2208): (60, 0),      # iPhone 6~8 Plus (20pt @3x, 홈 버튼)
+    (750, 1334): (40, 0),       # iPhone 6~8, SE (20pt @2x)
+}
+
+# 표에 없는 해상도는 iPhone 14 Pro 비율로 추정
+FALLBACK_SIZE = (1179, 2556)
+
+# 자르기 프리셋: 'status_bar'는 상단만, 'safe_area'는 상단과 하단 홈 인디케이터 영역을 잘라냄
+CROP_PRESETS = ('status_bar', 'safe_area')
+
+# 상태 표시줄 색을 뽑을 때 참고할 아래쪽 행 수
+SAMPLE_ROWS = 4
+
+
+def safe_area_insets(size):
+    """스크린샷 크기 → (상단, 하단) 세이프 에어리어 높이 (px)"""
+    if size in SAFE_AREAS:
+        return SAFE_AREAS[size]
+    top, bottom = SAFE_AREAS[FALLBACK_SIZE]
+    scale = size[1] / FALLBACK_SIZE[1]
+    return round(top * scale), round(bottom * scale)
+
+
+def crop_box(size, preset=None):
+    """자르기 프리셋에 해당하는 영역 (left, top, right, bottom). 프리셋이 없으면 None"""
+    if preset is None:
+        return None
+    if preset not in CROP_PRESETS:
+        raise ValueError(f"알 수 없는 자르기 프리셋: {preset} (사용 가능: {', '.join(CROP_PRESETS)})")
+    top, bottom = safe_area_insets(size)
+    if preset == 'status_bar':
+        bottom = 0
+    return (0, top, size[0], size[1] - bottom)
+
+
+def clean_status_bar(image):
+    """상태 표시줄 영역을 바로 아래 행들의 중앙값 색으로 칠함 (image를 제자리에서 수정해 반환)
+
+    팔레트/흑백 이미지는 먼저 RGB(A)로 변환하므로 반환값을 사용할 것
+    """
+    from PIL import ImageStat
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.mode or 'transparency' in image.info else 'RGB')
+    top, _ = safe_area_insets(image.size)
+    if top <= 0 or top + SAMPLE_ROWS > image.height:
+        return image
+    sample = image.crop((0, top, image.width, top + SAMPLE_ROWS))
+    color = tuple(int(v) for v in ImageStat.Stat(sample).median)
+    image.paste(color, (0, 0, image.width, top))
+    return image
+
+
+def preprocess(image, crop=None, clean=False):
+    """리사이즈 전 전처리: (이미지, resize에 넘길 box 또는 None) 반환
+
+    crop: CROP_PRESETS 중 하나 (잘라낸 이미지를 만들지 않고 영역만 계산)
+    clean: 상태 표시줄을 배경색으로 칠함 (상단을 잘라내면 할 필요 없음)
+    """
+    if clean and crop is None:
+        image = clean_status_bar(image)
+    return image, crop_box(image.size, crop)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Input Probe
+이미지 헤더만 읽어(픽셀 디코딩 없음) 크기, 색상 모드, ICC 프로파일, 프레임 수를 확인하고
+렌더링 전에 문제 있는 입력을 걸러냄 (배치 계획, 배치 처리, 웹 업로드, GUI에서 공통 사용)
+"""
+
+import os
+
+from generator import MarketingImageGenerator
+
+SUPPORTED_FORMATS = ('PNG', 'JPEG')
+
+# 이보다 큰 입력은 렌더링하지 않음 (디코딩만으로 메모리를 크게 차지)
+MAX_SOURCE_PIXELS = 40_000_000
+
+# 기대 비율과의 허용 오차 (상대값)
+ASPECT_TOLERANCE = 0.02
+
+ERROR = 'error'
+WARNING = 'warning'
+
+
+class ProbeResult:
+    """프로브 결과. issues는 (수준, 메시지) 목록이며 ERROR가 하나라도 있으면 ok가 False"""
+
+    def __init__(self, path):
+        self.path = path
+        self.format = None
+        self.size = None
+        self.mode = None
+        self.icc_profile = None
+        self.frames = 1
+        self.issues = []
+
+    @property
+    def ok(self):
+        return not any(level == ERROR for level, _ in self.issues)
+
+    @property
+    def errors(self):
+        return [message for level, message in self.issues if level == ERROR]
+
+    @property
+    def warnings(self):
+        return [message for level, message in self.issues if level == WARNING]
+
+    def describe(self):
+        """한 줄 요약 (예: 'shot.png: 1170x2532 RGB — 해상도가 기대값과 다름')"""
+        name = os.path.basename(self.path)
+        if self.size is None:
+            return f"{name}: {'; '.join(self.errors)}"
+        text = f"{name}: {self.size[0]}x{self.size[1]} {self.mode}"
+        if self.issues:
+            text += ' — ' + '; '.join(message for _, message in self.issues)
+        return text
+
+    def to_dict(self):
+        return {
+            'file': os.path.basename(self.path),
+            'format': self.format,
+            'size': list(self.size) if self.size else None,
+            'mode': self.mode,
+            'icc_profile': self.icc_profile is not None,
+            'frames': self.frames,
+            'errors': self.errors,
+            'warnings': self.warnings,
+        }
+
+
+def probe_image(path, expected_size=None, strict=False):
+    """헤더만 읽어 입력 이미지 검사
+
+    expected_size: 기대 원본 해상도 (기본값: iPhone 14 Pro 1179x2556)
+    strict: True면 비율/해상도 불일치도 오류로 처리
+    """
+    from PIL import Image
+
+    if expected_size is None:
+        expected_size = (MarketingImageGenerator.IPHONE_14_PRO_WIDTH,
+                         MarketingImageGenerator.IPHONE_14_PRO_HEIGHT)
+    mismatch = ERROR if strict else WARNING
+    result = ProbeResult(path)
+
+    try:
+        with Image.open(path) as img:
+            result.format = img.format
+            result.size = img.size
+            result.mode = img.mode
+            result.icc_profile = img.info.get('icc_profile')
+            result.frames = getattr(img, 'n_frames', 1)
+    except Image.DecompressionBombError:
+        result.issues.append((ERROR, '이미지가 너무 큽니다'))
+        return result
+    except Image.UnidentifiedImageError:
+        result.issues.append((ERROR, '이미지 파일이 아니거나 손상되었습니다'))
+        return result
+    except Exception as e:
+        result.issues.append((ERROR, f"이미지를 읽을 수 없습니다 ({e})"))
+        return result
+
+    width, height = result.size
+    if result.format not in SUPPORTED_FORMATS:
+        result.issues.append((ERROR, f"지원하지 않는 형식: {result.format}"))
+    if width == 0 or height == 0:
+        result.issues.append((ERROR, '크기가 0입니다'))
+        return result
+    if width * height > MAX_SOURCE_PIXELS:
+        result.issues.append((ERROR, f"이미지가 너무 큽니다 ({width * height / 1e6:.0f}MP)"))
+
+    if result.size != tuple(expected_size):
+        expected_aspect = expected_size[1] / expected_size[0]
+        aspect = height / width
+        if width > height:
+            result.issues.append((mismatch, '가로 방향 이미지'))
+        elif abs(aspect - expected_aspect) / expected_aspect > ASPECT_TOLERANCE:
+            result.issues.append((mismatch, f"비율이 기대값과 다름 (기대 {expected_size[0]}x{expected_size[1]})"))
+        else:
+            result.issues.append((mismatch, f"해상도가 기대값과 다름 (기대 {expected_size[0]}x{expected_size[1]})"))
+
+    if result.frames > 1:
+        result.issues.append((WARNING, f"애니메이션 이미지 ({result.frames}프레임) — 첫 프레임만 사용"))
+    if result.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P'):
+        result.issues.append((WARNING, f"색상 모드 {result.mode} → RGB로 변환"))
+
+    return result
+
+
+def probe_images(paths, expected_size=None, strict=False):
+    """여러 입력을 검사해 (통과한 결과 목록, 거부된 결과 목록) 반환"""
+    accepted, rejected = [], []
+    for path in paths:
+        result = probe_image(path, expected_size, strict)
+        (accepted if result.ok else rejected).append(result)
+    return accepted, rejected
+
+
+def check_selection(paths, strict=False):
+    """GUI에서 고른 파일 검사: (사용할 경로 목록, 사용자에게 보여줄 안내 문구 또는 None)"""
+    accepted, rejected = probe_images(paths, strict=strict)
+    lines = []
+    if rejected:
+        lines.append(f"다음 {len(rejected)}개 파일은 제외됩니다:")
+        lines.extend(f"  • {result.describe()}" for result in rejected)
+    warned = [result for result in accepted if result.warnings]
+    if warned:
+        if lines:
+            lines.append('')
+        lines.append(f"다음 {len(warned)}개 파일은 확인이 필요합니다:")
+        lines.extend(f"  • {result.describe()}" for result in warned)
+    return [result.path for result in accepted], '\n'.join(lines) or None
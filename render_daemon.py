@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Render Daemon
+생성기/폰트/배경 캐시를 메모리에 유지하는 상주 렌더 서버 (Unix 소켓) + 가벼운 클라이언트
+
+서버 시작:
+  python render_daemon.py serve &
+
+클라이언트 (generator.py / generator_advanced.py 와 같은 인자):
+  python render_daemon.py basic screenshot.png -o output.png -b gradient_blue
+  python render_daemon.py advanced s1.png s2.png s3.png -o out.png --layout triple --title "Save time"
+
+클라이언트는 PIL을 불러오지 않으므로 호출당 비용은 인터프리터 시작 + 실제 렌더링 시간뿐이다.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+PROTOCOL_VERSION = 1
+
+
+def default_socket_path():
+    """기본 소켓 경로 (MARKETING_RENDER_SOCKET 환경 변수로 변경 가능)"""
+    return os.environ.get(
+        'MARKETING_RENDER_SOCKET',
+        os.path.join('/tmp', f'marketing-render-{os.getuid()}.sock')
+    )
+
+
+def send_request(socket_path, request, timeout=None):
+    """요청 하나를 보내고 응답(JSON 한 줄)을 받음"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError('렌더 데몬이 응답 없이 연결을 끊었습니다.')
+    return json.loads(line)
+
+
+# ---------------------------------------------------------------------------
+# 서버
+# ---------------------------------------------------------------------------
+
+class _ArgumentError(Exception):
+    pass
+
+
+class RenderService:
+    """데몬이 들고 있는 상주 상태: 미리 만든 생성기와 CLI 파서"""
+
+    def __init__(self, workers):
+        # 무거운 모듈은 서버 쪽에서만 불러옴
+        import generator as basic_cli
+        import generator_advanced as advanced_cli
+
+        self.clis = {
+            'basic': (basic_cli, basic_cli.MarketingImageGenerator()),
+            'advanced': (advanced_cli, advanced_cli.AdvancedMarketingGenerator()),
+        }
+        self.slots = threading.BoundedSemaphore(workers)
+        self.started = time.time()
+        self.rendered = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        """자주 쓰는 배경과 폰트를 미리 준비"""
+        _, basic = self.clis['basic']
+        basic.warm_up()
+        _, advanced = self.clis['advanced']
+        advanced.get_background('gradient')
+        for size in (90, 45):
+            for font_name in advanced.font_paths:
+                advanced.get_font(font_name, size, bold=size == 90)
+
+    def parse(self, cli, argv, cwd):
+        from color_profiles import parse_output_profile
+
+        module, _ = self.clis[cli]
+        parser = module.build_parser()
+
+        def error(message):
+            raise _ArgumentError(f"{parser.prog}: {message}")
+        parser.error = error
+        parser.prog = f"render_daemon.py {cli}"
+
+        args = parser.parse_args(argv)
+
+        # 클라이언트 작업 폴더 기준 상대 경로를 절대 경로로 (출력 .icc 프로파일 포함)
+        def resolve(path):
+            return os.path.join(cwd, path)
+        args.output = resolve(args.output)
+        args.output_profile = parse_output_profile(args.output_profile, cwd)
+        if cli == 'basic':
+            args.input = resolve(args.input)
+        else:
+            args.screenshots = [resolve(path) for path in args.screenshots]
+        return args
+
+    def render(self, request):
+        cli = request.get('cli')
+        if cli not in self.clis:
+            return {'ok': False, 'error': f"알 수 없는 생성기: {cli}"}
+        argv = request.get('argv', [])
+        if '-h' in argv or '--help' in argv:
+            module, _ = self.clis[cli]
+            parser = module.build_parser()
+            parser.prog = f"render_daemon.py {cli}"
+            return {'ok': True, 'help': parser.format_help()}
+        try:
+            args = self.parse(cli, argv, request.get('cwd', os.getcwd()))
+        except _ArgumentError as e:
+            return {'ok': False, 'error': str(e)}
+
+        module, generator = self.clis[cli]
+        start = time.perf_counter()
+        with self.slots:
+            ok = bool(module.run(args, generator))
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            if ok:
+                self.rendered += 1
+            else:
+                self.failed += 1
+        return {'ok': ok, 'seconds': round(elapsed, 4), 'error': None if ok else '생성 실패 (데몬 로그 확인)'}
+
+    def stats(self):
+        return {
+            'ok': True,
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started, 1),
+            'rendered': self.rendered,
+            'failed': self.failed,
+        }
+
+
+def serve(socket_path, workers):
+    import socketserver
+
+    service = RenderService(workers)
+    print("🔥 워밍업 중 (생성기, 배경, 폰트)...")
+    service.warm_up()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                op = request.get('op')
+                if op == 'render':
+                    response = service.render(request)
+                elif op == 'ping':
+                    response = {'ok': True, 'version': PROTOCOL_VERSION}
+                elif op == 'stats':
+                    response = service.stats()
+                elif op == 'shutdown':
+                    response = {'ok': True}
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                else:
+                    response = {'ok': False, 'error': f"알 수 없는 요청: {op}"}
+            except Exception as e:
+                response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    # 이전 실행에서 남은 소켓 파일 정리 (살아있는 데몬이 있으면 중단)
+    if os.path.exists(socket_path):
+        try:
+            send_request(socket_path, {'op': 'ping'}, timeout=1)
+            print(f"❌ 이미 실행 중인 렌더 데몬이 있습니다: {socket_path}")
+            sys.exit(1)
+        except (OSError, ValueError):
+            os.remove(socket_path)
+
+    with Server(socket_path, Handler) as server:
+        os.chmod(socket_path, 0o600)
+        print(f"{'='*60}")
+        print(f"🚀 렌더 데몬 실행 중 (pid {os.getpid()})")
+        print(f"🔌 소켓: {socket_path}")
+        print(f"⚡ 동시 렌더링 수: {workers}")
+        print(f"{'='*60}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+    print("👋 렌더 데몬 종료")
+
+
+# ---------------------------------------------------------------------------
+# 클라이언트
+# ---------------------------------------------------------------------------
+
+def client(socket_path, request):
+    try:
+        response = send_request(socket_path, request)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"❌ 렌더 데몬에 연결할 수 없습니다: {socket_path}")
+        print("   먼저 'python render_daemon.py serve &' 로 데몬을 시작하세요.")
+        return 2
+
+    if not response.get('ok'):
+        print(f"❌ {response.get('error')}")
+        return 1
+
+    if 'help' in response:
+        print(response['help'], end='')
+    elif request['op'] == 'render':
+        print(f"✅ 완료 ({response['seconds']:.3f}s)")
+    elif request['op'] == 'stats':
+        print(json.dumps(response, ensure_ascii=False, indent=2))
+    else:
+        print("✅ OK")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='상주 렌더 데몬 및 클라이언트',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+예제:
+  python render_daemon.py serve -w 4 &
+  python render_daemon.py basic screenshot.png -o output.png -b gradient_blue
+  python render_daemon.py advanced screenshot.png -o output.png --title "Save time"
+  python render_daemon.py stats
+  python render_daemon.py stop
+        '''
+    )
+    parser.add_argument('--socket', default=default_socket_path(),
+                        help='Unix 소켓 경로 (기본값: $MARKETING_RENDER_SOCKET 또는 /tmp/marketing-render-<uid>.sock)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='렌더 데몬 시작')
+    serve_parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 4,
+                              help='동시 렌더링 수 (기본값: CPU 코어 수)')
+
+    for name, target in (('basic', 'generator.py'), ('advanced', 'generator_advanced.py')):
+        subparsers.add_parser(name, add_help=False,
+                              help=f'{target} 와 같은 인자로 렌더링 요청')
+
+    subparsers.add_parser('ping', help='데몬 상태 확인')
+    subparsers.add_parser('stats', help='데몬 통계')
+    subparsers.add_parser('stop', help='데몬 종료')
+
+    # basic/advanced 뒤의 인자는 (-h 포함) 그대로 데몬에 전달
+    argv = sys.argv[1:]
+    for i, token in enumerate(argv):
+        if token in ('basic', 'advanced'):
+            args = parser.parse_args(argv[:i + 1])
+            args.argv = argv[i + 1:]
+            break
+    else:
+        args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args.socket, args.workers)
+        return
+
+    if args.command in ('basic', 'advanced'):
+        request = {'op': 'render', 'cli': args.command, 'argv': args.argv, 'cwd': os.getcwd()}
+    elif args.command == 'stop':
+        request = {'op': 'shutdown'}
+    else:
+        request = {'op': args.command}
+    sys.exit(client(args.socket, request))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Shared-Memory Image Hand-off
+디코딩한 이미지를 multiprocessing.shared_memory에 한 번 써 두고 워커 프로세스에서는
+Image.frombuffer로 복사 없이 다시 감싸서 사용 (1179x2556 RGBA를 피클하면 이미지당 약 12MB 복사)
+
+부모는 share()로 공유하고 작업이 끝나면 release()로 해제하며, 워커는 call_attached()로 빌려 쓰거나
+배경처럼 계속 쓰는 자산은 attach()로 프로세스 수명 동안 붙여 둔다 (머신당 한 번만 만들어짐).
+픽셀은 Pillow 내부 배치 그대로 저장하므로 RGB는 RGBX(픽셀당 4바이트)로 매핑된다.
+"""
+
+import atexit
+import sys
+import threading
+from multiprocessing import shared_memory
+
+# 내부 배치 그대로 매핑할 수 있는 모드 → frombuffer raw 모드
+RAW_MODES = {
+    'L': 'L',
+    'RGB': 'RGBX',
+    'RGBA': 'RGBA',
+}
+
+_attached = {}  # 워커 프로세스에서 계속 붙여 둔 자산: 이름 -> (SharedMemory, Image)
+_unclosed = []  # 이미지 참조가 남아 닫지 못한 블록 (프로세스가 끝날 때 해제)
+_abandon_registered = False
+
+
+class SharedImage:
+    """공유 메모리에 있는 이미지의 핸들 (피클해도 수십 바이트)"""
+
+    def __init__(self, name, mode, size):
+        self.name = name
+        self.mode = mode
+        self.size = size
+
+    def __getstate__(self):
+        return (self.name, self.mode, self.size)
+
+    def __setstate__(self, state):
+        self.name, self.mode, self.size = state
+
+    def __repr__(self):
+        return f"SharedImage({self.name!r}, {self.mode!r}, {self.size})"
+
+
+class SharedImagePool:
+    """부모 프로세스에서 만든 공유 메모리 블록 관리 (with 블록이 끝나면 모두 해제)"""
+
+    def __init__(self):
+        self._blocks = {}
+        self._lock = threading.Lock()
+
+    def share(self, image):
+        """이미지를 공유 메모리에 복사하고 핸들 반환 (지원하지 않는 모드는 RGB(A)로 변환)"""
+        if image.mode not in RAW_MODES:
+            image = image.convert('RGBA' if 'A' in image.mode or 'transparency' in image.info else 'RGB')
+        raw_mode = RAW_MODES[image.mode]
+        byte_size = image.width * image.height * (1 if raw_mode == 'L' else 4)
+        block = shared_memory.SharedMemory(create=True, size=byte_size)
+        handle = SharedImage(block.name, image.mode, image.size)
+        if image.mode == raw_mode:
+            # 매핑한 이미지에 바로 paste (tobytes 임시 버퍼 없이 한 번만 복사)
+            target = _wrap(block, handle)
+            target.readonly = 0
+            target.paste(image)
+            del target
+        else:
+            block.buf[:byte_size] = image.tobytes('raw', raw_mode)
+        with self._lock:
+            self._blocks[block.name] = block
+        return handle
+
+    def release(self, handle):
+        """공유 메모리 블록 해제 (워커가 다 쓴 뒤 호출)"""
+        with self._lock:
+            block = self._blocks.pop(handle.name, None)
+        if block is not None:
+            block.close()
+            block.unlink()
+
+    def close(self):
+        with self._lock:
+            blocks, self._blocks = list(self._blocks.values()), {}
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _open_block(name):
+    """기존 블록 열기
+
+    3.13 미만에서는 열기만 해도 리소스 트래커에 등록되지만, 풀 워커는 부모의 트래커를 공유하므로
+    같은 이름이 한 번 더 등록될 뿐이고 해제(unlink)는 부모가 한다.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def _wrap(block, handle):
+    from PIL import Image
+    raw_mode = RAW_MODES[handle.mode]
+    return Image.frombuffer(raw_mode, handle.size, block.buf, 'raw', raw_mode, 0, 1)
+
+
+def call_attached(handle, function, *args):
+    """핸들의 이미지를 복사 없이 감싸 function(image, *args)를 호출하고 결과 반환
+
+    이미지는 읽기 전용 (수정하면 Pillow가 복사본을 만듦). function이 끝나면 매핑을 닫으므로
+    이미지를 밖에 보관하지 말 것.
+    """
+    block = _open_block(handle.name)
+    image = _wrap(block, handle)
+    try:
+        return function(image, *args)
+    finally:
+        del image
+        try:
+            block.close()
+        except BufferError:
+            # 예외 트레이스백 등에 이미지 참조가 남음 → 프로세스가 끝날 때 해제
+            _register_abandon()
+            _unclosed.append(block)
+
+
+def attach(handle):
+    """프로세스 수명 동안 붙여 둘 공유 이미지 (배경 등 정적 자산, 이름별로 한 번만 연결)"""
+    entry = _attached.get(handle.name)
+    if entry is None:
+        _register_abandon()
+        block = _open_block(handle.name)
+        entry = _attached[handle.name] = (block, _wrap(block, handle))
+    return entry[1]
+
+
+def _register_abandon():
+    global _abandon_registered
+    if not _abandon_registered:
+        atexit.register(_abandon_blocks)
+        _abandon_registered = True
+
+
+def _abandon_blocks():
+    """종료 시 아직 이미지가 쓰는 매핑은 닫지 않고 놓아 둠 (SharedMemory.__del__의 BufferError 방지,
+    매핑은 프로세스가 끝나면 운영체제가 해제)"""
+    for block in [block for block, _ in _attached.values()] + _unclosed:
+        block._buf = block._mmap = None
+    _unclosed.clear()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - Temp Storage
+작업(job)별 임시 폴더 관리: 용량 제한, 파일 TTL, LRU 제거, 백그라운드 정리
+
+마지막 접근 시각과 처리 중 표시는 디스크에 두므로 (작업 출력 폴더의 mtime, pins/ 아래 파일)
+같은 root를 쓰는 여러 WSGI 워커 프로세스가 한 저장소를 공유할 수 있다.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+
+class TempStorage:
+    """작업 단위 네임스페이스를 가진 임시 저장소
+
+    root/<area>/<job_id>/ 구조로 파일을 저장한다 (area 예: uploads, outputs).
+    - TTL: 마지막 접근 후 ttl_seconds가 지난 파일은 삭제
+    - 용량 제한: 전체 크기가 quota_bytes를 넘으면 가장 오래 접근하지 않은 작업부터 삭제
+    - 처리 중(pin)인 작업은 제거 대상에서 제외 (root/pins/<job_id>.<pid> 파일, 어느 프로세스가 걸었든)
+    """
+
+    AREAS = ('uploads', 'outputs')
+    PINS = 'pins'
+
+    def __init__(self, root=None, quota_bytes=2 * 1024 * 1024 * 1024,
+                 ttl_seconds=3600, sweep_interval=60):
+        self.root = root or tempfile.mkdtemp(prefix='marketing_')
+        self.quota_bytes = quota_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+
+        self._lock = threading.Lock()
+        self._pinned = {}  # 이 프로세스에서 job_id -> 처리 중인 요청 수 (0 → 1일 때 pin 파일 생성)
+        self._stop = threading.Event()
+        self._thread = None
+
+        for area in self.AREAS + (self.PINS,):
+            os.makedirs(os.path.join(self.root, area), exist_ok=True)
+
+    def area_path(self, area):
+        return os.path.join(self.root, area)
+
+    def job_path(self, area, job_id):
+        return os.path.join(self.root, area, job_id)
+
+    def create_job(self):
+        """새 작업 ID를 발급하고 작업 폴더 생성"""
+        job_id = uuid.uuid4().hex
+        for area in self.AREAS:
+            os.makedirs(self.job_path(area, job_id), exist_ok=True)
+        self.touch(job_id)
+        return job_id
+
+    def has_job(self, job_id):
+        return os.path.isdir(self.job_path('outputs', job_id))
+
+    def touch(self, job_id):
+        """작업 접근 기록 (출력 폴더의 mtime을 현재 시각으로)"""
+        try:
+            os.utime(self.job_path('outputs', job_id))
+        except OSError:
+            pass
+
+    def last_access(self, job_id):
+        """작업의 마지막 접근 시각 (출력 폴더가 없으면 0)"""
+        try:
+            return os.stat(self.job_path('outputs', job_id)).st_mtime
+        except OSError:
+            return 0
+
+    def pin(self, job_id):
+        """처리 중인 작업으로 표시 (모든 프로세스의 정리 대상에서 제외)"""
+        with self._lock:
+            count = self._pinned.get(job_id, 0)
+            self._pinned[job_id] = count + 1
+            if count == 0:
+                with open(self._pin_path(job_id), 'w'):
+                    pass
+
+    def unpin(self, job_id):
+        with self._lock:
+            count = self._pinned.get(job_id, 0) - 1
+            if count > 0:
+                self._pinned[job_id] = count
+            else:
+                self._pinned.pop(job_id, None)
+                try:
+                    os.remove(self._pin_path(job_id))
+                except OSError:
+                    pass
+        self.touch(job_id)
+
+    def pinned_jobs(self):
+        """어느 프로세스든 처리 중으로 표시한 작업 ID (죽은 프로세스의 pin 파일은 삭제)"""
+        pinned = set()
+        for entry in self._scan(self.area_path(self.PINS)):
+            job_id, _, pid = entry.name.rpartition('.')
+            if job_id and pid.isdigit() and process_alive(int(pid)):
+                pinned.add(job_id)
+            else:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+        return pinned
+
+    def is_pinned(self, job_id):
+        return job_id in self.pinned_jobs()
+
+    def remove_job(self, job_id):
+        """작업의 모든 파일 삭제"""
+        for area in self.AREAS:
+            shutil.rmtree(self.job_path(area, job_id), ignore_errors=True)
+
+    def find_output(self, filename):
+        """filename 출력 파일이 있는 작업 중 가장 최근 것의 ID (없으면 None)"""
+        latest, latest_mtime = None, -1
+        for job_id in self._known_jobs():
+            try:
+                mtime = os.stat(os.path.join(self.job_path('outputs', job_id), filename)).st_mtime
+            except OSError:
+                continue
+            if mtime > latest_mtime:
+                latest, latest_mtime = job_id, mtime
+        return latest
+
+    def job_usage(self, job_id):
+        """작업이 사용 중인 바이트 수 (세는 도중 다른 워커가 지운 파일은 건너뜀)"""
+        total = 0
+        for area in self.AREAS:
+            for entry in self._scan(self.job_path(area, job_id)):
+                stat = self._stat(entry)
+                if stat is not None:
+                    total += stat.st_size
+        return total
+
+    def usage(self):
+        """전체 사용 중인 바이트 수"""
+        return sum(self.job_usage(job_id) for job_id in self._known_jobs())
+
+    def sweep(self):
+        """만료 파일 삭제 후, 용량 초과 시 LRU 순서로 작업 제거. 삭제한 바이트 수 반환"""
+        now = time.time()
+        freed = 0
+
+        pinned = self.pinned_jobs()
+        last_access = {}
+
+        # 1) TTL 만료 파일 삭제
+        usage = {}
+        for job_id in self._known_jobs():
+            job_bytes = 0
+            accessed = last_access[job_id] = self.last_access(job_id)
+            for area in self.AREAS:
+                for entry in self._scan(self.job_path(area, job_id)):
+                    stat = self._stat(entry)
+                    if stat is None:
+                        continue
+                    expired = now - max(stat.st_mtime, accessed) > self.ttl_seconds
+                    if expired and job_id not in pinned:
+                        try:
+                            os.remove(entry.path)
+                            freed += stat.st_size
+                            continue
+                        except FileNotFoundError:
+                            continue  # 다른 워커가 먼저 지움
+                        except OSError:
+                            pass
+                    job_bytes += stat.st_size
+            if (job_bytes == 0 and job_id not in pinned and now - accessed > self.ttl_seconds
+                    and not self.is_pinned(job_id)):
+                self.remove_job(job_id)
+            else:
+                usage[job_id] = job_bytes
+
+        # 2) 용량 초과 시 가장 오래 접근하지 않은 작업부터 제거
+        total = sum(usage.values())
+        if total > self.quota_bytes:
+            for job_id in sorted(usage, key=lambda j: last_access.get(j, 0)):
+                if total <= self.quota_bytes:
+                    break
+                # 스냅샷 이후 다른 워커가 처리를 시작했을 수 있으므로 다시 확인
+                if job_id in pinned or self.is_pinned(job_id):
+                    continue
+                self.remove_job(job_id)
+                total -= usage[job_id]
+                freed += usage[job_id]
+
+        return freed
+
+    def start(self):
+        """백그라운드 정리 스레드 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='temp-storage-sweeper', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"임시 저장소 정리 오류: {e}")
+
+    def _pin_path(self, job_id):
+        return os.path.join(self.root, self.PINS, f"{job_id}.{os.getpid()}")
+
+    def _known_jobs(self):
+        jobs = set()
+        for area in self.AREAS:
+            for entry in self._scan(self.area_path(area), dirs=True):
+                jobs.add(entry.name)
+        return jobs
+
+    @staticmethod
+    def _scan(path, dirs=False):
+        try:
+            with os.scandir(path) as it:
+                return [e for e in it if (e.is_dir() if dirs else e.is_file())]
+        except OSError:
+            return []
+
+    @staticmethod
+    def _stat(entry):
+        """scandir 항목의 stat (스캔 이후 다른 워커의 정리나 cleanup으로 사라졌으면 None)"""
+        try:
+            return entry.stat()
+        except OSError:
+            return None
+
+
+def process_alive(pid):
+    """같은 호스트에서 pid 프로세스가 살아 있는지 (pin/메트릭 파일을 남기고 죽은 워커 판별)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,50 @@
+from PIL import Image
+
+from campaign import CampaignRunner, plan_campaign
+
+
+class _RecordingGenerator:
+    """렌더링 대신 그 시점에 캐시에 남아 있는 입력 수를 기록"""
+
+    def __init__(self, runner):
+        self.runner = runner
+        self.cached = []
+
+    def generate_marketing_image(self, screenshots, output_path, **kwargs):
+        self.cached.append(len(self.runner._images))
+        return True
+
+
+def test_inputs_are_released_after_last_job(tmp_path):
+    screens = []
+    for i in range(4):
+        Image.new('RGB', (8, 16), (i * 40, 0, 0)).save(tmp_path / f'shot{i}.png')
+        screens.append({'id': f's{i}', 'screenshots': [f'shot{i}.png']})
+    jobs = plan_campaign({'base_dir': str(tmp_path), 'sizes': ['6.7', '6.5'], 'locales': ['en', 'ko'],
+                          'defaults': {'background': 'solid'}, 'screens': screens})
+
+    runner = CampaignRunner(output_profile=None)
+    generator = _RecordingGenerator(runner)
+    runner.get_generator = lambda size: generator
+    success, failed = runner.run(jobs, workers=1)
+
+    assert success == len(jobs) and not failed
+    # 한 번에 한 작업씩이면 캐시에는 지금 화면의 입력 하나만 있음
+    assert max(generator.cached) == 1
+    assert runner._images == {} and runner._image_locks == {}
+
+
+def test_failed_job_still_releases_input(tmp_path):
+    Image.new('RGB', (8, 16)).save(tmp_path / 'shot.png')
+    jobs = plan_campaign({'base_dir': str(tmp_path), 'screens': [{'id': 's', 'screenshots': ['shot.png']}]})
+
+    runner = CampaignRunner(output_profile=None)
+
+    def broken(size):
+        raise RuntimeError('생성기 없음')
+
+    runner.get_generator = broken
+    success, failed = runner.run(jobs, workers=1)
+
+    assert success == 0 and len(failed) == 1
+    assert runner._image_uses == {} and runner._images == {}
@@ -0,0 +1,17 @@
+import os
+import stat
+
+from checkpoint import TEMP_PREFIX, atomic_open
+
+
+def test_atomic_open_follows_umask_without_changing_it(tmp_path):
+    previous = os.umask(0o027)
+    try:
+        with atomic_open(str(tmp_path / 'out.png')) as f:
+            f.write(b'data')
+        assert os.umask(0o027) == 0o027  # atomic_open이 umask를 바꾸지 않음
+    finally:
+        os.umask(previous)
+    assert stat.S_IMODE(os.stat(tmp_path / 'out.png').st_mode) == 0o640
+    assert (tmp_path / 'out.png').read_bytes() == b'data'
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(TEMP_PREFIX)]
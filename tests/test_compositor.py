@@ -0,0 +1,106 @@
+import pytest
+from PIL import Image, ImageChops, ImageDraw, ImageFilter
+
+from compositor import SHADOW_SCALE_TOLERANCE, count_allocations, phone_frame, shadow_mask
+
+
+def blurred_shadow_reference(size, box, radius, opacity, blur):
+    """전체 크기에서 흐린 그림자 (레이어 경계의 영향이 없도록 넉넉한 여백을 두고 흐린 뒤 잘라냄)"""
+    pad = 4 * blur
+    (x0, y0), (x1, y1) = box
+    mask = Image.new('L', (size[0] + 2 * pad, size[1] + 2 * pad), 0)
+    ImageDraw.Draw(mask).rounded_rectangle(((x0 + pad, y0 + pad), (x1 + pad, y1 + pad)),
+                                           radius=radius, fill=opacity)
+    return mask.filter(ImageFilter.GaussianBlur(blur)).crop((pad, pad, pad + size[0], pad + size[1]))
+
+
+@pytest.mark.parametrize('size, blur', [
+    ((200, 300), 8),
+    ((200, 300), 40),
+    ((333, 501), 12),
+    ((333, 501), 20),
+    ((517, 1033), 64),
+])
+@pytest.mark.parametrize('margin', [2, 0.5, 1])
+@pytest.mark.parametrize('opacity', [80, 255])
+def test_downscaled_shadow_within_tolerance(size, blur, margin, opacity):
+    # margin: 상자와 레이어 경계 사이 거리 (정수는 px, 실수는 블러 반지름의 배수)
+    offset = margin if isinstance(margin, int) else int(blur * margin)
+    box = ((offset, offset), (size[0] - offset - 1, size[1] - offset - 1))
+    radius = min(size) // 8
+
+    reference = blurred_shadow_reference(size, box, radius, opacity, blur)
+    shadow = shadow_mask(size, box, radius, opacity, blur)
+
+    assert shadow.size == size
+    assert ImageChops.difference(reference, shadow).getextrema()[1] <= SHADOW_SCALE_TOLERANCE
+
+
+def test_full_size_shadow_matches_reference():
+    size, box = (120, 200), ((6, 6), (113, 193))
+    reference = blurred_shadow_reference(size, box, 16, 255, 3)
+    assert ImageChops.difference(reference, shadow_mask(size, box, 16, 255, 3, 1)).getextrema()[1] <= 1
+
+
+def over(dst, src):
+    """Porter-Duff over (스트레이트 알파 RGBA 픽셀 하나, 프리멀티플라이드로 계산)"""
+    src_alpha, dst_alpha = src[3] / 255, dst[3] / 255
+    out_alpha = src_alpha + dst_alpha * (1 - src_alpha)
+    if out_alpha == 0:
+        return (0, 0, 0, 0)
+    rgb = tuple(
+        (s * src_alpha + d * dst_alpha * (1 - src_alpha)) / out_alpha
+        for s, d in zip(src[:3], dst[:3])
+    )
+    return rgb + (out_alpha * 255,)
+
+
+def test_phone_frame_matches_reference_render():
+    size, background = (40, 80), (240, 200, 120)
+    frame_color, corner_radius, shadow_offset, blur, padding, opacity = (20, 20, 20), 8, 6, 3, 2, 80
+    screenshot = Image.new('RGBA', size, (30, 160, 90, 255))
+    ImageDraw.Draw(screenshot).ellipse((4, 4, size[0] - 4, size[1] // 2), fill=(250, 250, 250, 128))
+
+    layer = phone_frame(screenshot, frame_color, corner_radius, shadow_offset, blur, padding, opacity)
+    canvas = Image.new('RGB', layer.size, background)
+    canvas.paste(layer, (0, 0), layer)
+
+    # 참조 그림자: 이전 방식대로 전체 크기 RGBA 레이어에 그림자를 그려 흐림 (경계 밖 여백 포함)
+    frame_size = (size[0] + padding * 2, size[1] + padding * 2)
+    pad = 4 * blur
+    shadow = Image.new('RGBA', (layer.width + 2 * pad, layer.height + 2 * pad), (0, 0, 0, 0))
+    ImageDraw.Draw(shadow).rounded_rectangle(
+        ((shadow_offset + pad, shadow_offset + pad),
+         (frame_size[0] + shadow_offset + pad, frame_size[1] + shadow_offset + pad)),
+        radius=corner_radius, fill=(0, 0, 0, opacity))
+    shadow = shadow.filter(ImageFilter.GaussianBlur(blur)).crop((pad, pad, pad + layer.width, pad + layer.height))
+
+    # 참조 프레임: 프레임 색 위에 스크린샷 픽셀을 over, 알파는 직접 그린 둥근 사각형
+    outline = Image.new('L', frame_size, 0)
+    ImageDraw.Draw(outline).rounded_rectangle(((0, 0), frame_size), radius=corner_radius, fill=255)
+
+    worst = 0
+    frame_left = frame_top = shadow_offset // 2
+    for y in range(layer.height):
+        for x in range(layer.width):
+            # 그림자는 검정 + 커버리지 알파 그대로 (알파는 한 번만 적용)
+            expected = over(background + (255,), (0, 0, 0, shadow.getpixel((x, y))[3]))
+            fx, fy = x - frame_left, y - frame_top
+            if 0 <= fx < frame_size[0] and 0 <= fy < frame_size[1]:
+                pixel = frame_color + (255,)
+                sx, sy = fx - padding, fy - padding
+                if 0 <= sx < size[0] and 0 <= sy < size[1]:
+                    pixel = over(pixel, screenshot.getpixel((sx, sy)))
+                expected = over(expected, pixel[:3] + (outline.getpixel((fx, fy)),))
+            actual = canvas.getpixel((x, y))
+            worst = max(worst, max(abs(a - e) for a, e in zip(actual, expected[:3])))
+    assert worst <= 2
+
+
+def test_phone_frame_does_not_copy_rgb_screenshot():
+    screenshot = Image.new('RGB', (60, 120), (10, 120, 200))
+    phone_frame(screenshot, blur=4)  # 그림자 마스크 캐시 채움
+    with count_allocations() as allocations:
+        phone_frame(screenshot, blur=4)
+    # paste가 RGBA 바탕에 맞춰 한 번 변환하는 것 외에 스크린샷 크기 복사본이 없어야 함
+    assert allocations.of_size(screenshot.size) == 1, allocations.images
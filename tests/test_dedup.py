@@ -0,0 +1,42 @@
+from PIL import Image, ImageCms
+
+from dedup import DedupIndex, pixel_digest
+
+
+def srgb_icc(marker):
+    """헤더 시각 필드만 다른 sRGB 프로파일 바이트 (내용은 같고 바이트가 다른 프로파일)"""
+    data = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+    return data[:24] + bytes([marker]) * 12 + data[36:]
+
+
+def test_same_pixels_same_key():
+    a = Image.new('RGB', (16, 16), (10, 20, 30))
+    b = Image.new('RGB', (16, 16), (10, 20, 30))
+    assert pixel_digest(a) == pixel_digest(b)
+
+
+def test_icc_profile_is_part_of_key():
+    plain = Image.new('RGB', (16, 16), (10, 20, 30))
+    tagged = plain.copy()
+    tagged.info['icc_profile'] = srgb_icc(1)
+    other = plain.copy()
+    other.info['icc_profile'] = srgb_icc(2)
+    assert len({pixel_digest(plain), pixel_digest(tagged), pixel_digest(other)}) == 3
+
+
+def test_transparency_and_palette_are_part_of_key():
+    base = Image.new('P', (16, 16), 0)
+    base.putpalette([255, 0, 0] + [0] * 765)
+    keyed = base.copy()
+    keyed.info['transparency'] = 0
+    recoloured = base.copy()
+    recoloured.putpalette([0, 0, 255] + [0] * 765)
+    assert len({pixel_digest(base), pixel_digest(keyed), pixel_digest(recoloured)}) == 3
+
+
+def test_register_separates_inputs_with_different_profiles():
+    index = DedupIndex({'background': 'white'})
+    tagged = Image.new('RGB', (16, 16), (10, 20, 30))
+    tagged.info['icc_profile'] = srgb_icc(1)
+    plain = Image.new('RGB', (16, 16), (10, 20, 30))
+    assert index.register(tagged, 'p3.png') != index.register(plain, 'plain.png')
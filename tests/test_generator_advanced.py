@@ -0,0 +1,15 @@
+from PIL import Image
+
+from generator_advanced import AdvancedMarketingGenerator
+
+
+def test_frame_device_applies_screenshot_alpha_once():
+    generator = AdvancedMarketingGenerator()
+    screenshot = Image.new('RGBA', (100, 200), (255, 255, 255, 128))
+    framed = generator.frame_device(screenshot, frame_color=(20, 20, 20))
+
+    # 불투명 프레임 위 over: 20 + (255 - 20) * 128/255 ≈ 138
+    r, g, b, a = framed.getpixel((framed.width // 2, framed.height // 2))
+    assert a == 255
+    assert abs(r - (20 + (255 - 20) * 128 / 255)) <= 1
+    assert (r, g, b) == (r, r, r)
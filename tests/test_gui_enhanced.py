@@ -0,0 +1,60 @@
+import os
+import types
+
+import pytest
+
+pytest.importorskip('tkinter')
+from PIL import Image
+
+from compositor import count_allocations
+from generator import MarketingImageGenerator
+from gui_enhanced import EnhancedMarketingImageGUI
+
+OUTPUT_SIZE = (1290, 2796)
+FRAME_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          'iPhone 17 - Sage - Portrait.png')
+
+
+def value(v):
+    """tk 변수/입력창 대신 get()만 있는 객체"""
+    return types.SimpleNamespace(get=lambda: v)
+
+
+@pytest.fixture
+def gui():
+    """창 없이 합성 경로만 쓰는 GUI (위젯은 값만 돌려주는 객체로 대체)"""
+    gui = object.__new__(EnhancedMarketingImageGUI)
+    gui.generator = MarketingImageGenerator()
+    gui.width_entry, gui.height_entry = value(str(OUTPUT_SIZE[0])), value(str(OUTPUT_SIZE[1]))
+    gui.current_size_label = types.SimpleNamespace(config=lambda **kwargs: None)
+    gui.smooth_var = value(True)
+    gui.text_var, gui.text_entry = value(True), value('Marketing')
+    gui.text_position_var, gui.text_size_var, gui.text_color = value('bottom'), value(60), (255, 255, 255)
+    gui.border_var = value(True)
+    gui.custom_color = (0, 0, 0)
+    gui.background_image = None
+    gui.iphone_frame = Image.open(FRAME_PATH)
+    gui.iphone_frame_path = FRAME_PATH
+    gui._frame_overlay = gui._frame_overlay_key = None
+    return gui
+
+
+# (배경, 스크린샷 모드, 전체 할당 상한, 출력 크기 버퍼 상한)
+# 출력 크기 버퍼: 작업 버퍼(배경) + 최종 RGB (+ 캐시된 그라디언트의 복사본)
+@pytest.mark.parametrize('background, mode, max_total, max_full_size', [
+    ('white', 'RGB', 10, 2),
+    ('white', 'RGBA', 11, 2),
+    ('gradient_blue', 'RGB', 11, 3),
+    ('gradient_blue', 'RGBA', 12, 3),
+])
+def test_compose_allocation_bound(gui, background, mode, max_total, max_full_size):
+    screenshot = Image.new(mode, (1179, 2556), (10, 120, 200))
+    # 첫 렌더링은 그라디언트/마스크/프레임 캐시를 채우므로 제외
+    gui.compose_marketing_image(screenshot, background, True)
+
+    with count_allocations() as allocations:
+        result = gui.compose_marketing_image(screenshot, background, True)
+
+    assert result.mode == 'RGB' and result.size == OUTPUT_SIZE
+    assert allocations.count <= max_total, allocations.images
+    assert allocations.of_size(OUTPUT_SIZE) <= max_full_size, allocations.images
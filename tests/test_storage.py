@@ -0,0 +1,35 @@
+import os
+
+from storage import TempStorage
+
+
+class VanishedEntry:
+    """스캔한 뒤 다른 워커가 지운 파일 (stat에서 FileNotFoundError)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+
+    def stat(self):
+        raise FileNotFoundError(self.path)
+
+
+def test_sweep_and_usage_skip_files_removed_during_scan(tmp_path, monkeypatch):
+    storage = TempStorage(root=str(tmp_path))
+    job_id = storage.create_job()
+    kept = os.path.join(storage.job_path('outputs', job_id), 'kept.png')
+    with open(kept, 'wb') as f:
+        f.write(b'x' * 10)
+
+    scan = TempStorage._scan
+
+    def scan_with_vanished(path, dirs=False):
+        entries = scan(path, dirs)
+        if not dirs:
+            entries.append(VanishedEntry(os.path.join(path, 'gone.png')))
+        return entries
+
+    monkeypatch.setattr(TempStorage, '_scan', staticmethod(scan_with_vanished))
+    assert storage.usage() == 10
+    assert storage.sweep() == 0
+    assert os.path.exists(kept)
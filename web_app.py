@@ -2,34 +2,230 @@
 """
 iOS Marketing Image Generator - Web Interface
 Flask 기반 웹 인터페이스
+
+개발 서버:    python web_app.py
+프로덕션:     STORAGE_ROOT=/var/tmp/marketing gunicorn -w 4 --threads 2 'web_app:create_app()'
 """
 
-from flask import Flask, render_template, request, send_file, jsonify, url_for
+from flask import Blueprint, Flask, Response, current_app, render_template, request, send_file, jsonify, url_for, abort, redirect, stream_with_context
 from werkzeug.utils import secure_filename
 import os
-import tempfile
-import shutil
 from datetime import datetime
 from generator import MarketingImageGenerator
-
-app = Flask(__name__)
-app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB 제한
-app.config['UPLOAD_FOLDER'] = tempfile.mkdtemp()
-app.config['OUTPUT_FOLDER'] = tempfile.mkdtemp()
+from archive_stream import iter_zip
+from storage import TempStorage
+from admission import AdmissionController, AdmissionRejected
+from metrics import MetricsRegistry, RenderMetrics
+from probe import probe_image
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
 
-generator = MarketingImageGenerator()
+bp = Blueprint('marketing', __name__)
+
+def create_app(config=None):
+    """Flask 앱 생성 (WSGI 워커마다 한 번씩 호출됨)
+    
+    워커별로 생성기/배경 캐시를 새로 만들고 자주 쓰는 배경을 미리 만들어 둔다.
+    임시 저장소는 STORAGE_ROOT 폴더를 모든 워커가 공유한다 (작업 접근 시각/처리 중 표시도 디스크에 둠).
+    렌더링은 메모리 예산(RENDER_MEMORY_BUDGET)과 동시 실행 수 (MAX_CONCURRENT_RENDERS) 안에서만
+    입장시키고, 대기열이 차면 429/503으로 거절한다.
+    """
+    app = Flask(__name__)
+    app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB 제한
+    app.config['STORAGE_QUOTA_BYTES'] = int(os.environ.get('STORAGE_QUOTA_BYTES', 2 * 1024 * 1024 * 1024))  # 2GB
+    app.config['STORAGE_TTL_SECONDS'] = int(os.environ.get('STORAGE_TTL_SECONDS', 3600))  # 1시간
+    # 여러 워커가 같은 작업을 보려면 모든 워커가 같은 폴더를 써야 함 (없으면 워커마다 새 임시 폴더)
+    app.config['STORAGE_ROOT'] = os.environ.get('STORAGE_ROOT')
+    # /metrics가 모든 워커의 값을 합쳐 응답하도록 워커 간에 공유하는 폴더 (없으면 워커별 값)
+    app.config['METRICS_DIR'] = os.environ.get('METRICS_DIR')
+    app.config['MAX_CONCURRENT_RENDERS'] = int(os.environ.get('MAX_CONCURRENT_RENDERS', os.cpu_count() or 1))
+    app.config['RENDER_MEMORY_BUDGET'] = int(os.environ.get('RENDER_MEMORY_BUDGET', 1024 * 1024 * 1024))  # 1GB
+    app.config['RENDER_QUEUE_SIZE'] = int(os.environ.get('RENDER_QUEUE_SIZE', 8))
+    app.config['RENDER_QUEUE_TIMEOUT'] = float(os.environ.get('RENDER_QUEUE_TIMEOUT', 30))  # 초
+    app.config['WARM_UP_BACKGROUNDS'] = ('gradient_blue',)
+    if config:
+        app.config.update(config)
+    
+    # 작업별 임시 저장소 (용량 제한 + TTL + LRU, 백그라운드 정리)
+    storage = TempStorage(
+        root=app.config.get('STORAGE_ROOT'),
+        quota_bytes=app.config['STORAGE_QUOTA_BYTES'],
+        ttl_seconds=app.config['STORAGE_TTL_SECONDS']
+    )
+    storage.start()
+    app.config['UPLOAD_FOLDER'] = storage.area_path('uploads')
+    app.config['OUTPUT_FOLDER'] = storage.area_path('outputs')
+    
+    # 워커별 생성기 + 배경 캐시 워밍업
+    generator = MarketingImageGenerator()
+    generator.warm_up(app.config['WARM_UP_BACKGROUNDS'])
+    
+    admission = AdmissionController(
+        memory_budget=app.config['RENDER_MEMORY_BUDGET'],
+        max_concurrent=app.config['MAX_CONCURRENT_RENDERS'],
+        max_queue=app.config['RENDER_QUEUE_SIZE'],
+        queue_timeout=app.config['RENDER_QUEUE_TIMEOUT']
+    )
+    
+    app.extensions['marketing'] = {
+        'storage': storage,
+        'generator': generator,
+        'admission': admission,
+        'metrics': create_metrics(generator, admission, storage, app.config['METRICS_DIR']),
+    }
+    
+    if not os.path.exists(os.path.join(app.root_path, app.template_folder, 'index.html')):
+        create_templates(os.path.join(app.root_path, app.template_folder))
+    
+    app.register_blueprint(bp)
+    return app
+
+def create_metrics(generator, admission, storage, multiprocess_dir=None):
+    """/metrics 로 노출할 메트릭 등록 (multiprocess_dir가 있으면 모든 워커 합계, 없으면 워커 프로세스별)"""
+    registry = MetricsRegistry(multiprocess_dir)
+    registry.start()
+    generator.observer = RenderMetrics(registry)
+    
+    registry.gauge('marketing_render_queue_depth',
+                   'Number of requests waiting for a render slot.',
+                   lambda: admission.queue_depth)
+    registry.gauge('marketing_renders_in_progress',
+                   'Number of requests currently rendering.',
+                   lambda: admission.active)
+    registry.gauge('marketing_render_memory_reserved_bytes',
+                   'Estimated render memory reserved by admitted requests.',
+                   lambda: admission.in_use)
+    registry.callback_counter('marketing_admission_admitted_total',
+                              'Number of requests admitted to render.',
+                              lambda: admission.admitted)
+    registry.callback_counter('marketing_admission_rejected_total',
+                              'Number of requests rejected with 429/503.',
+                              lambda: admission.rejected)
+    registry.gauge('marketing_temp_storage_bytes',
+                   'Bytes currently stored in upload/output temp folders.',
+                   storage.usage, aggregate='max')
+    registry.callback_counter('marketing_background_cache_hits_total',
+                              'Background cache hits.',
+                              lambda: generator.cache_hits)
+    registry.callback_counter('marketing_background_cache_misses_total',
+                              'Background cache misses.',
+                              lambda: generator.cache_misses)
+    return registry
+
+def get_storage():
+    return current_app.extensions['marketing']['storage']
+
+def get_generator():
+    return current_app.extensions['marketing']['generator']
+
+def get_admission():
+    return current_app.extensions['marketing']['admission']
+
+def rejected_response(error):
+    """입장 거부 응답 (Retry-After 포함)"""
+    response = jsonify({'error': error.message})
+    response.status_code = error.status
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def admit_render(accepted):
+    """프로브한 업로드 크기로 메모리 비용을 추정하고 렌더링 입장 티켓 확보"""
+    sizes = [probe.size for _, _, probe in accepted]
+    generator = get_generator()
+    cost = AdmissionController.estimate_render_cost(
+        sizes, (generator.TARGET_WIDTH, generator.TARGET_HEIGHT)
+    )
+    return get_admission().acquire(cost)
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-@app.route('/')
+def job_folder(job_id):
+    """작업 ID에 해당하는 출력 폴더 (유효하지 않으면 404)"""
+    storage = get_storage()
+    job_id = secure_filename(job_id)
+    if not job_id or not storage.has_job(job_id):
+        abort(404)
+    storage.touch(job_id)
+    return storage.job_path('outputs', job_id)
+
+def save_uploads(files, job_id):
+    """업로드 파일을 임시 폴더에 저장하고 (원본 이름, 저장 경로) 목록 반환"""
+    saved = []
+    for file in files:
+        if file and allowed_file(file.filename):
+            filename = secure_filename(file.filename)
+            input_path = os.path.join(get_storage().job_path('uploads', job_id), filename)
+            file.save(input_path)
+            saved.append((filename, input_path))
+    return saved
+
+def probe_uploads(saved):
+    """업로드 헤더만 읽어 검사하고 (통과한 (원본 이름, 저장 경로, 프로브) 목록, 거부 정보 목록) 반환
+
+    거부된 업로드는 렌더링 비용을 쓰기 전에 바로 삭제
+    """
+    accepted, rejected = [], []
+    for filename, input_path in saved:
+        probe = probe_image(input_path)
+        if probe.ok:
+            accepted.append((filename, input_path, probe))
+        else:
+            rejected.append(dict(probe.to_dict(), file=filename))
+            try:
+                os.remove(input_path)
+            except OSError:
+                pass
+    return accepted, rejected
+
+def probe_warnings(accepted):
+    return [dict(probe.to_dict(), file=filename) for filename, _, probe in accepted if probe.warnings]
+
+def no_valid_uploads(job_id, rejected):
+    get_storage().remove_job(job_id)
+    return jsonify({'error': '처리할 수 있는 이미지가 없습니다', 'rejected': rejected}), 400
+
+def render_uploads(saved, job_id, background, add_frame):
+    """저장된 업로드를 하나씩 렌더링하고, 완료될 때마다 (원본 이름, 출력 이름, 출력 경로)를 생성"""
+    storage = get_storage()
+    generator = get_generator()
+    output_dir = storage.job_path('outputs', job_id)
+    
+    # 렌더링 중에는 백그라운드 정리 대상에서 제외
+    storage.pin(job_id)
+    try:
+        for filename, input_path in saved:
+            # 마케팅 이미지 생성
+            output_filename = f"marketing_{os.path.splitext(filename)[0]}.png"
+            output_path = os.path.join(output_dir, output_filename)
+            
+            try:
+                if generator.generate_marketing_image(input_path, output_path, add_frame, background):
+                    yield filename, output_filename, output_path
+            except Exception as e:
+                print(f"오류: {e}")
+            finally:
+                # 업로드 원본은 렌더링 후 바로 삭제
+                try:
+                    os.remove(input_path)
+                except OSError:
+                    pass
+    finally:
+        storage.unpin(job_id)
+
+@bp.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/upload', methods=['POST'])
+@bp.route('/upload', methods=['POST'])
 def upload_files():
+    # 대기열이 가득 차 있으면 업로드 본문을 읽기 전에 바로 거절
+    admission = get_admission()
+    try:
+        admission.check_capacity()
+    except AdmissionRejected as e:
+        return rejected_response(e)
+    
     if 'files[]' not in request.files:
         return jsonify({'error': '파일이 없습니다'}), 400
     
@@ -40,68 +236,173 @@ def upload_files():
     if not files:
         return jsonify({'error': '파일을 선택해주세요'}), 400
     
+    job_id = get_storage().create_job()
+    saved = save_uploads(files, job_id)
+    # 헤더만 읽어 잘못된 입력은 렌더링 전에 거부
+    accepted, rejected = probe_uploads(saved)
+    if not accepted:
+        return no_valid_uploads(job_id, rejected)
+    try:
+        ticket = admit_render(accepted)
+    except AdmissionRejected as e:
+        get_storage().remove_job(job_id)
+        return rejected_response(e)
     output_files = []
+    saved = [(filename, input_path) for filename, input_path, _ in accepted]
     
-    for file in files:
-        if file and allowed_file(file.filename):
-            # 파일 저장
-            filename = secure_filename(file.filename)
-            input_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(input_path)
-            
-            # 마케팅 이미지 생성
-            output_filename = f"marketing_{os.path.splitext(filename)[0]}.png"
-            output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
-            
-            try:
-                if generator.generate_marketing_image(input_path, output_path, add_frame, background):
-                    output_files.append({
-                        'original': filename,
-                        'output': output_filename,
-                        'url': url_for('download_file', filename=output_filename)
-                    })
-            except Exception as e:
-                print(f"오류: {e}")
+    try:
+        for filename, output_filename, _ in render_uploads(saved, job_id, background, add_frame):
+            output_files.append({
+                'original': filename,
+                'output': output_filename,
+                'url': url_for('.download_file', job_id=job_id, filename=output_filename),
+                'preview': url_for('.preview_file', job_id=job_id, filename=output_filename)
+            })
+    finally:
+        admission.release(ticket)
     
     if output_files:
         return jsonify({
             'success': True,
+            'job_id': job_id,
             'files': output_files,
+            'archive': url_for('.download_archive', job_id=job_id),
+            'rejected': rejected,
+            'warnings': probe_warnings(accepted),
             'message': f'{len(output_files)}개의 이미지가 생성되었습니다'
         })
     else:
         return jsonify({'error': '이미지 생성에 실패했습니다'}), 500
 
-@app.route('/download/<filename>')
-def download_file(filename):
+@bp.route('/upload/archive', methods=['POST'])
+def upload_archive():
+    """업로드 후 렌더링되는 대로 결과를 ZIP으로 스트리밍"""
+    # 대기열이 가득 차 있으면 업로드 본문을 읽기 전에 바로 거절
+    admission = get_admission()
+    try:
+        admission.check_capacity()
+    except AdmissionRejected as e:
+        return rejected_response(e)
+    
+    if 'files[]' not in request.files:
+        return jsonify({'error': '파일이 없습니다'}), 400
+    
+    files = request.files.getlist('files[]')
+    background = request.form.get('background', 'white')
+    add_frame = request.form.get('add_frame', 'true') == 'true'
+    
+    if not files:
+        return jsonify({'error': '파일을 선택해주세요'}), 400
+    
+    job_id = get_storage().create_job()
+    # 요청 본문은 응답 스트리밍 중에 닫히므로 업로드는 먼저 저장해 둔다
+    saved = save_uploads(files, job_id)
+    accepted, rejected = probe_uploads(saved)
+    if not accepted:
+        return no_valid_uploads(job_id, rejected)
+    try:
+        ticket = admit_render(accepted)
+    except AdmissionRejected as e:
+        get_storage().remove_job(job_id)
+        return rejected_response(e)
+    saved = [(filename, input_path) for filename, input_path, _ in accepted]
+    entries = (
+        (output_path, output_filename)
+        for _, output_filename, output_path in render_uploads(saved, job_id, background, add_frame)
+    )
+    response = zip_response(entries, f"marketing_{job_id}.zip", job_id)
+    # ZIP에서 빠진 입력 (헤더 검사에서 거부됨)
+    if rejected:
+        response.headers['X-Rejected-Files'] = ','.join(item['file'] for item in rejected)
+    # 스트리밍이 끝나거나 클라이언트가 연결을 끊으면 입장 티켓 반납
+    response.call_on_close(lambda: admission.release(ticket))
+    return response
+
+@bp.route('/archive/<job_id>')
+def download_archive(job_id):
+    """작업의 모든 결과 이미지를 ZIP으로 스트리밍"""
+    folder = job_folder(job_id)
+    entries = (
+        (os.path.join(folder, name), name)
+        for name in sorted(os.listdir(folder))
+        if name.lower().endswith('.png')
+    )
+    return zip_response(entries, f"marketing_{job_id}.zip", job_id)
+
+def zip_response(entries, download_name, job_id):
+    """ZIP 청크 스트림 응답 (Content-Length 없이 chunked 전송)"""
+    response = Response(
+        stream_with_context(iter_zip(entries)),
+        mimetype='application/zip',
+        headers={
+            'Content-Disposition': f'attachment; filename="{download_name}"',
+            'X-Job-Id': job_id,
+        }
+    )
+    return response
+
+@bp.route('/download/<job_id>/<filename>')
+def download_file(job_id, filename):
+    folder = job_folder(job_id)
     return send_file(
-        os.path.join(app.config['OUTPUT_FOLDER'], filename),
+        os.path.join(folder, secure_filename(filename)),
         as_attachment=True,
         download_name=filename
     )
 
-@app.route('/preview/<filename>')
-def preview_file(filename):
-    return send_file(os.path.join(app.config['OUTPUT_FOLDER'], filename))
+@bp.route('/preview/<job_id>/<filename>')
+def preview_file(job_id, filename):
+    folder = job_folder(job_id)
+    return send_file(os.path.join(folder, secure_filename(filename)))
+
+def legacy_redirect(endpoint, filename):
+    """작업 ID 없는 이전 URL → 그 이름의 가장 최근 출력이 있는 작업 URL로 리다이렉트"""
+    filename = secure_filename(filename)
+    job_id = get_storage().find_output(filename) if filename else None
+    if job_id is None:
+        abort(404)
+    return redirect(url_for(endpoint, job_id=job_id, filename=filename))
+
+@bp.route('/download/<filename>')
+def legacy_download_file(filename):
+    """이전 API 호환 (/download/<filename>)"""
+    return legacy_redirect('.download_file', filename)
+
+@bp.route('/preview/<filename>')
+def legacy_preview_file(filename):
+    """이전 API 호환 (/preview/<filename>)"""
+    return legacy_redirect('.preview_file', filename)
 
-@app.route('/cleanup', methods=['POST'])
+@bp.route('/metrics')
+def metrics():
+    """Prometheus 메트릭 (텍스트 형식)"""
+    registry = current_app.extensions['marketing']['metrics']
+    return Response(registry.render(), mimetype=None, content_type=MetricsRegistry.CONTENT_TYPE)
+
+@bp.route('/cleanup', methods=['POST'])
 def cleanup():
-    """임시 파일 정리"""
+    """임시 파일 정리 (job_id가 있으면 해당 작업만, 없으면 만료/용량 초과분만)"""
+    storage = get_storage()
     try:
-        for folder in [app.config['UPLOAD_FOLDER'], app.config['OUTPUT_FOLDER']]:
-            for file in os.listdir(folder):
-                file_path = os.path.join(folder, file)
-                try:
-                    os.remove(file_path)
-                except:
-                    pass
-        return jsonify({'success': True})
-    except:
-        return jsonify({'error': '정리 실패'}), 500
+        job_id = request.values.get('job_id')
+        if job_id is None and request.is_json:
+            job_id = (request.get_json(silent=True) or {}).get('job_id')
+        
+        if job_id:
+            job_id = secure_filename(job_id)
+            if not job_id or not storage.has_job(job_id):
+                return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
+            storage.remove_job(job_id)
+            return jsonify({'success': True, 'job_id': job_id})
+        
+        freed = storage.sweep()
+        return jsonify({'success': True, 'freed_bytes': freed})
+    except OSError as e:
+        current_app.logger.exception('임시 파일 정리 실패')
+        return jsonify({'error': '정리 실패', 'detail': e.strerror or str(e)}), 500
 
-def create_templates():
+def create_templates(template_dir='templates'):
     """HTML 템플릿 생성"""
-    template_dir = 'templates'
     os.makedirs(template_dir, exist_ok=True)
     
     html_content = '''<!DOCTYPE html>
@@ -418,6 +719,9 @@ def create_templates():
             
             <div class="results" id="results">
                 <h3>✅ 생성된 이미지</h3>
+                <a id="archiveLink" href="#" download style="display: none; margin-bottom: 20px;">
+                    <button class="download-btn">📦 전체 다운로드 (ZIP)</button>
+                </a>
                 <div class="result-grid" id="resultGrid"></div>
             </div>
         </div>
@@ -431,6 +735,7 @@ def create_templates():
         const loading = document.getElementById('loading');
         const results = document.getElementById('results');
         const resultGrid = document.getElementById('resultGrid');
+        const archiveLink = document.getElementById('archiveLink');
         
         let selectedFiles = [];
         
@@ -501,10 +806,10 @@ def create_templates():
                 loading.style.display = 'none';
                 
                 if (data.success) {
-                    showStatus('success', data.message);
-                    displayResults(data.files);
+                    showStatus('success', data.message + rejectedSummary(data.rejected));
+                    displayResults(data.files, data.archive);
                 } else {
-                    showStatus('error', data.error || '이미지 생성에 실패했습니다.');
+                    showStatus('error', (data.error || '이미지 생성에 실패했습니다.') + rejectedSummary(data.rejected));
                 }
             } catch (error) {
                 loading.style.display = 'none';
@@ -515,21 +820,28 @@ def create_templates():
             }
         });
         
+        function rejectedSummary(rejected) {
+            if (!rejected || rejected.length === 0) return '';
+            return ' (제외됨: ' + rejected.map(item => `${item.file} - ${item.errors.join(', ')}`).join('; ') + ')';
+        }
+        
         function showStatus(type, message) {
             status.className = `status ${type}`;
             status.textContent = message;
             status.style.display = 'block';
         }
         
-        function displayResults(files) {
+        function displayResults(files, archiveUrl) {
             resultGrid.innerHTML = '';
             results.style.display = 'block';
+            archiveLink.href = archiveUrl;
+            archiveLink.style.display = archiveUrl ? 'block' : 'none';
             
             files.forEach(file => {
                 const item = document.createElement('div');
                 item.className = 'result-item';
                 item.innerHTML = `
-                    <img src="/preview/${file.output}" alt="${file.original}" class="result-image">
+                    <img src="${file.preview}" alt="${file.original}" class="result-image">
                     <div class="result-info">
                         <div class="result-name">${file.output}</div>
                         <a href="${file.url}" download>
@@ -549,6 +861,7 @@ def create_templates():
 
 if __name__ == '__main__':
     create_templates()
+    app = create_app()
     print("=" * 60)
     print("🚀 iOS Marketing Image Generator - Web Server")
     print("=" * 60)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+iOS Marketing Image Generator - WSGI Entry Point
+프로덕션 WSGI 서버용 진입점
+
+    gunicorn -w 4 --threads 2 -b 0.0.0.0:5000 wsgi:app
+
+--preload 없이 실행하면 워커 프로세스마다 create_app()이 호출되어
+생성기, 배경 캐시, 임시 저장소 정리 스레드가 워커별로 만들어진다.
+임시 저장소 폴더는 모든 워커가 공유해야 다른 워커가 만든 작업도 /archive, /download,
+/preview에서 찾을 수 있으므로, STORAGE_ROOT가 없으면 워커 간에 같은 기본 폴더를 쓴다.
+메트릭도 METRICS_DIR가 없으면 마스터 프로세스(워커의 부모)별 폴더를 만들어 /metrics가 모든 워커 합계를 응답한다.
+마스터가 끝난 이전 실행의 기본 메트릭 폴더는 다음 실행의 워커가 시작할 때 지운다.
+"""
+
+import glob
+import os
+import shutil
+import tempfile
+
+from storage import process_alive
+
+METRICS_DIR_PREFIX = 'marketing_metrics_'
+
+
+def remove_stale_metrics_dirs(parent):
+    """마스터 프로세스가 더 이상 없는 기본 메트릭 폴더 삭제 (이 워커의 마스터 폴더는 남김)"""
+    for path in glob.glob(os.path.join(parent, f'{METRICS_DIR_PREFIX}*')):
+        pid = os.path.basename(path)[len(METRICS_DIR_PREFIX):]
+        if pid.isdigit() and int(pid) != os.getppid() and not process_alive(int(pid)):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+os.environ.setdefault('STORAGE_ROOT', os.path.join(tempfile.gettempdir(), 'marketing_storage'))
+if 'METRICS_DIR' not in os.environ:
+    remove_stale_metrics_dirs(tempfile.gettempdir())
+    os.environ['METRICS_DIR'] = os.path.join(tempfile.gettempdir(), f'{METRICS_DIR_PREFIX}{os.getppid()}')
+
+from web_app import create_app
+
+app = create_app()